@@ -0,0 +1,237 @@
+"""Dispatch benchmarks against a stub bpy.
+
+Measures the per-call overhead of every registered tool, the Gemini command
+parser, the bridge dispatch path and the batch optimizer on a recorded session,
+then compares against stored baselines.
+
+    python benchmarks/bench_dispatch.py                    # compare with baselines
+    python benchmarks/bench_dispatch.py --update-baseline  # record new baselines
+"""
+import argparse
+import inspect
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import stub_bpy  # noqa: E402
+
+BPY = stub_bpy.install()
+stub_bpy.install_genai_stub()
+stub_bpy.install_bmesh_stub()
+
+from blender_mcp.core.engine import AtomicEngine  # noqa: E402
+from blender_mcp.core.dispatch import gather  # noqa: E402
+from blender_mcp.core.gemini import GeminiManager  # noqa: E402
+from blender_mcp.core.parser import CommandStream  # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, "baselines.json")
+SESSION_PATH = os.path.join(HERE, "sessions", "scene_build.jsonl")
+TMP_DIR = tempfile.mkdtemp(prefix="blender_mcp_bench_")
+
+# Values for required parameters, by parameter name
+REQUIRED_ARGS = {
+    "name": "Cube", "obj_name": "Cube", "target_name": "Target", "source": "Cube", "target": "Target",
+    "child_name": "Sphere", "parent_name": "Cube", "old_name": "Sphere", "new_name": "Renamed",
+    "cutter_name": "Cutter", "lattice_name": "Lattice", "curve_name": "Curve", "instance_obj_name": "Sphere",
+    "object_from": "Cube", "object_to": "Target", "target_a": "Cube", "target_b": "Target",
+    "names": ["Cube", "Sphere"], "mat_name": "Material", "group_name": "NodeTree",
+    "collection_name": "Collection", "col_name": "Collection", "action_name": "Action",
+    "brush_name": "Draw", "mod_name": "Modifier", "modifier_name": "Modifier",
+    "constraint_name": "Constraint", "node_name": "Node", "node_names": ["Node"],
+    "from_node": "Node", "to_node": "Node", "from_socket": 0, "to_socket": 0,
+    "socket_name": "Value", "property_name": "label", "data_path": "location",
+    "value": 1.0, "index": 0, "input_index": 0, "frame": 1, "frame_start": 1, "frame_end": 10,
+    "x": 640, "y": 480, "dimensions": (1.0, 1.0, 1.0), "color": (1.0, 1.0, 1.0, 1.0),
+    "points_list": [(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+    "path": os.path.join(TMP_DIR, "out.blend"), "filepath": os.path.join(TMP_DIR, "out.obj"),
+    "image_path": os.path.join(TMP_DIR, "tex.png"),
+}
+
+# Tools whose required `type` must be a real enum value
+TYPE_ARGS = {"add_modifier": "SUBSURF", "create_node": "ShaderNodeMath"}
+
+# Per-tool overrides for arguments the name table cannot guess
+TOOL_ARGS = {
+    "replay_journal": {"path": SESSION_PATH},
+    "transform_objects": {"locations": [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], "rotations": [0.0, 0.0, 45.0]},
+}
+
+# Slowdowns accepted on purpose, checked with their own ratio instead of --threshold:
+# key -> (allowed ratio vs. baseline, why). Baselines are never re-recorded to hide these.
+TOLERANCES = {
+    "tool:get_scene_info": (2.5, "field projection, filters and paging cost about 2x on the 8-object stub "
+                                 "scene; on 5000 objects the call is 9x faster"),
+    "tool:audit_scene": (2.5, "same projection and filter overhead; on 5000 objects the call is 1.5x faster"),
+    "tool:create_primitive": (2.5, "each iteration starts a new file, so it times the template mesh build "
+                                   "that later calls in the same file skip"),
+    "tool:add_icosphere": (2.5, "cold template build, as for create_primitive"),
+    "tool:add_torus": (2.5, "cold template build, as for create_primitive"),
+    "tool:add_monkey": (2.5, "cold template build, as for create_primitive"),
+    "tool:get_screenshot": (10.0, "the fallback capture creates and removes a private mkstemp file; a "
+                                  "real viewport render takes milliseconds"),
+}
+
+def build_args(tool_name, fn):
+    args = {}
+    for param in inspect.signature(fn).parameters.values():
+        if param.default is not inspect.Parameter.empty or param.kind is not param.POSITIONAL_OR_KEYWORD:
+            continue
+        if param.name == "type":
+            args["type"] = TYPE_ARGS.get(tool_name, "CUBE")
+        else:
+            args[param.name] = REQUIRED_ARGS.get(param.name, 1)
+    args.update(TOOL_ARGS.get(tool_name, {}))
+    return args
+
+def measure(fn, iterations, setup=None):
+    """Median seconds per call of fn over `iterations` runs."""
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def bench_tools(engine, iterations):
+    results = {}
+    failures = {}
+    for tool_name in sorted(engine.tools):
+        fn = engine.tools[tool_name]
+        args = build_args(tool_name, fn)
+        BPY.reset()
+        outcome = engine.execute_tool(tool_name, dict(args))
+        if isinstance(outcome, dict) and outcome.get("status") == "error":
+            failures[tool_name] = outcome.get("message")
+        results[f"tool:{tool_name}"] = measure(
+            lambda: engine.execute_tool(tool_name, dict(args)), iterations, setup=BPY.reset)
+    engine.metrics.reset()
+    return results, failures
+
+def _reply(count):
+    blocks = []
+    for i in range(count):
+        cmd = {"tool": "transform_object", "args": {"name": f"Mesh_{i}", "location": [i, 0, 0]}}
+        blocks.append(f"Moving object {i}.\n<blender_cmd>\n{json.dumps(cmd)}\n</blender_cmd>\n")
+    return "".join(blocks)
+
+def bench_parser(iterations):
+    """Whole-reply parsing, and the same reply fed in 64-byte stream chunks (2000 commands is ~250 KB)."""
+    gemini = GeminiManager.__new__(GeminiManager)
+    results = {}
+    for count in (1, 40, 2000, 5000):
+        text = _reply(count)
+        results[f"parser:extract_commands_{count}"] = measure(lambda: gemini.extract_commands(text), iterations)
+    for count in (40, 2000):
+        chunks = [text[i:i + 64] for text in [_reply(count)] for i in range(0, len(text), 64)]
+
+        def stream():
+            parser = CommandStream()
+            for chunk in chunks:
+                parser.feed(chunk)
+            parser.close()
+
+        results[f"parser:stream_{count}"] = measure(stream, iterations)
+    return results
+
+def bench_bridge(engine, iterations):
+    """Validation, one batch submission, a pump drain and result collection for a 40-command reply."""
+    commands = [json.loads(line) for line in _reply(40).split("\n") if line.startswith("{")]
+
+    def dispatch():
+        future = engine.submit_batch(commands, validate=True)
+        engine.dispatcher.drain()
+        gather([future], timeout=1.0)
+
+    return {"bridge:batch_40": measure(dispatch, iterations, setup=lambda: BPY.reset(40))}
+
+def bench_session(engine, iterations):
+    with open(SESSION_PATH) as f:
+        commands = [json.loads(line) for line in f if line.strip()]
+    results = {}
+    for optimize in (False, True):
+        label = "optimized" if optimize else "unoptimized"
+        results[f"session:scene_build_{label}"] = measure(
+            lambda: engine.execute_batch(commands, optimize=optimize), iterations, setup=BPY.reset)
+    BPY.reset()
+    plan_size = engine.execute_batch(commands)["optimizer"]["executed"]
+    print(f"Recorded session: {len(commands)} commands, {plan_size} executed after optimization")
+    return results
+
+def compare(results, baselines, threshold, min_delta):
+    regressions = []
+    for key, seconds in sorted(results.items()):
+        base = baselines.get(key)
+        if base is None:
+            continue
+        current_us, base_us = seconds * 1e6, base * 1e6
+        allowed = max(threshold, TOLERANCES.get(key, (threshold,))[0])
+        if current_us > base_us * allowed and current_us - base_us > min_delta:
+            regressions.append((key, base_us, current_us))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown ratio vs. baseline")
+    parser.add_argument("--min-delta-us", type=float, default=20.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose key contains this")
+    parser.add_argument("--show-failures", action="store_true", help="list tools that error against the stub")
+    args = parser.parse_args(argv)
+
+    BPY.reset(40)
+    engine = AtomicEngine()
+
+    results = {}
+    failures = {}
+    if "tool:" in args.filter or not args.filter:
+        tool_results, failures = bench_tools(engine, args.iterations)
+        results.update(tool_results)
+    results.update(bench_parser(max(10, args.iterations // 10)))
+    results.update(bench_bridge(engine, args.iterations))
+    results.update(bench_session(engine, max(10, args.iterations // 10)))
+    results = {k: v for k, v in results.items() if args.filter in k}
+
+    for key, seconds in sorted(results.items(), key=lambda item: -item[1])[:25]:
+        print(f"{seconds * 1e6:12.2f} us  {key}")
+    tool_times = [v for k, v in results.items() if k.startswith("tool:")]
+    if tool_times:
+        print(f"{len(tool_times)} tools, median {statistics.median(tool_times) * 1e6:.2f} us per call, "
+              f"{len(failures)} returned errors against the stub")
+    if args.show_failures:
+        for tool_name, message in sorted(failures.items()):
+            print(f"  {tool_name}: {message}")
+
+    if args.update_baseline:
+        baselines = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=1)
+        print(f"Baselines written to {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baselines stored; run with --update-baseline first")
+        return 0
+    with open(BASELINE_PATH) as f:
+        baselines = json.load(f)
+    regressions = compare(results, baselines, args.threshold, args.min_delta_us)
+    for key, base_us, current_us in regressions:
+        print(f"REGRESSION {key}: {base_us:.2f} us -> {current_us:.2f} us")
+    print("Benchmarks PASSED" if not regressions else f"{len(regressions)} regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+"""Lightweight stand-in for the parts of bpy the engine and tools touch.
+
+Unlike a MagicMock, data-block collections are real dicts (O(1) lookup by
+name, Blender-style ".001" renaming), objects carry real transform vectors
+and meshes have element counts, so tool code runs its normal path and the
+measured cost is our own overhead rather than mock bookkeeping.
+"""
+import contextlib
+import itertools
+import sys
+import types
+
+_session_uids = itertools.count(1)
+
+class Anything:
+    """Permissive attribute bag for the long tail of RNA properties."""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = Anything()
+        self.__dict__[name] = value
+        return value
+
+    def __call__(self, *args, **kwargs):
+        return Anything()
+
+    def __getitem__(self, key):
+        return Anything()
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __contains__(self, item):
+        return False
+
+    def __bool__(self):
+        return True
+
+class Vector(list):
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+    @property
+    def z(self):
+        return self[2]
+
+class IDCollection:
+    def __init__(self, factory):
+        self._factory = factory
+        self._items = {}
+
+    def _unique(self, name):
+        if name not in self._items:
+            return name
+        i = 1
+        while f"{name}.{i:03d}" in self._items:
+            i += 1
+        return f"{name}.{i:03d}"
+
+    def _rename(self, item, new_name):
+        self._items.pop(item._name, None)
+        item._name = self._unique(new_name)
+        self._items[item._name] = item
+
+    def new(self, name="", *args, **kwargs):
+        item = self._factory(*args, **kwargs)
+        item.session_uid = next(_session_uids)
+        item._owner = self
+        item._name = self._unique(name)
+        self._items[item._name] = item
+        return item
+
+    def link_existing(self, item, name):
+        item.session_uid = next(_session_uids)
+        item._owner = self
+        item._name = self._unique(name)
+        self._items[item._name] = item
+        return item
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def remove(self, item, do_unlink=True):
+        self._items.pop(item._name, None)
+        for col in getattr(item, "users_collection", ()):
+            col.objects.unlink(item)
+
+    def keys(self):
+        return self._items.keys()
+
+    def values(self):
+        return list(self._items.values())
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return list(self._items.values())[key]
+        return self._items[key]
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+class ID:
+    _owner = None
+    _name = ""
+    asset_data = None
+    use_fake_user = False
+    users = 1
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._owner is not None:
+            self._owner._rename(self, value)
+        else:
+            self._name = value
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = Anything()
+        self.__dict__[name] = value
+        return value
+
+    def copy(self):
+        owner = self._owner
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._owner = None
+        if owner is not None:
+            owner.link_existing(clone, self._name)
+        return clone
+
+class ElementList(list):
+    def foreach_get(self, attr, seq):
+        pass
+
+class Mesh(ID):
+    def __init__(self, verts=8, faces=6):
+        self.vertices = ElementList([Anything() for _ in range(verts)])
+        self.polygons = ElementList([Anything() for _ in range(faces)])
+        self.edges = ElementList([Anything() for _ in range(verts + faces - 2)])
+        self.materials = []
+
+    def copy(self):
+        clone = super().copy()
+        # Like Blender, the copy gets its own material slots
+        clone.materials = list(self.materials)
+        return clone
+
+class Material(ID):
+    def __init__(self):
+        self.use_nodes = False
+        self.node_tree = Anything()
+
+class SubCollection(list):
+    def __init__(self, kind):
+        super().__init__()
+        self._kind = kind
+
+    def new(self, name=None, type=None, **kwargs):
+        item = Anything()
+        item.name = name or type or self._kind
+        item.type = type
+        self.append(item)
+        return item
+
+    def get(self, name, default=None):
+        for item in self:
+            if item.name == name:
+                return item
+        return default
+
+    def remove(self, item):
+        if item in self:
+            list.remove(self, item)
+
+    def clear(self):
+        del self[:]
+
+class ObjectLinks:
+    def __init__(self, collection):
+        self._collection = collection
+        self._objects = {}
+
+    def link(self, obj):
+        self._objects[obj.name] = obj
+        if self._collection not in obj.users_collection:
+            obj.users_collection.append(self._collection)
+
+    def unlink(self, obj):
+        self._objects.pop(obj.name, None)
+        if self._collection in obj.users_collection:
+            obj.users_collection.remove(self._collection)
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __len__(self):
+        return len(self._objects)
+
+class Collection(ID):
+    def __init__(self):
+        self.objects = ObjectLinks(self)
+        self.children = SubCollection("COLLECTION")
+        self.children.link = self.children.append
+
+    @property
+    def children_recursive(self):
+        return [c for child in self.children for c in [child] + child.children_recursive]
+
+class Object(ID):
+    def __init__(self, object_data=None, type=None):
+        self.data = object_data
+        self.type = type or ("MESH" if isinstance(object_data, Mesh) else "EMPTY")
+        self._location = Vector((0.0, 0.0, 0.0))
+        self._rotation = Vector((0.0, 0.0, 0.0))
+        self._scale = Vector((1.0, 1.0, 1.0))
+        self.dimensions = Vector((2.0, 2.0, 2.0))
+        self.parent = None
+        self.modifiers = SubCollection("MODIFIER")
+        self.constraints = SubCollection("CONSTRAINT")
+        self.material_slots = []
+        self.users_collection = []
+        self.hide_viewport = False
+        self.hide_render = False
+        self.mode = "OBJECT"
+        self.animation_data = None
+        self._selected = False
+
+    location = property(lambda self: self._location,
+                        lambda self, v: setattr(self, "_location", Vector(v)))
+    rotation_euler = property(lambda self: self._rotation,
+                              lambda self, v: setattr(self, "_rotation", Vector(v)))
+    scale = property(lambda self: self._scale,
+                     lambda self, v: setattr(self, "_scale", Vector(v)))
+
+    # Unit cube around the origin; rotation is ignored
+    bound_box = [(-1.0, -1.0, -1.0), (-1.0, -1.0, 1.0), (-1.0, 1.0, 1.0), (-1.0, 1.0, -1.0),
+                 (1.0, -1.0, -1.0), (1.0, -1.0, 1.0), (1.0, 1.0, 1.0), (1.0, 1.0, -1.0)]
+
+    @property
+    def matrix_world(self):
+        (x, y, z), (sx, sy, sz) = self._location, self._scale
+        return [[sx, 0.0, 0.0, x], [0.0, sy, 0.0, y], [0.0, 0.0, sz, z], [0.0, 0.0, 0.0, 1.0]]
+
+    def select_set(self, state):
+        self._selected = state
+
+    def select_get(self):
+        return self._selected
+
+    def keyframe_insert(self, data_path, frame=None):
+        return True
+
+    def animation_data_clear(self):
+        self.animation_data = None
+
+class ViewLayerObjects(list):
+    active = None
+
+class ViewLayer:
+    def __init__(self):
+        self.objects = ViewLayerObjects()
+        self.use_pass_mist = False
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+class Context:
+    def __init__(self, data):
+        self._data = data
+        self.scene = Anything()
+        self.scene.collection = data.collections.new("Scene Collection")
+        self.collection = self.scene.collection
+        self.view_layer = ViewLayer()
+        self.screen = Anything()
+        self.screen.areas = []
+        self.preferences = Anything()
+        self.tool_settings = Anything()
+        self.window_manager = Anything()
+        self.window_manager.windows = []
+        self.mode = "OBJECT"
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def sculpt_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def selected_objects(self):
+        return [o for o in self._data.objects if o._selected]
+
+    @contextlib.contextmanager
+    def temp_override(self, **kwargs):
+        yield
+
+class Data:
+    KINDS = (
+        "materials", "node_groups", "curves", "worlds", "cameras", "textures",
+        "lights", "lattices", "images", "brushes", "actions", "particles",
+    )
+
+    def __init__(self):
+        self.objects = IDCollection(Object)
+        self.meshes = IDCollection(Mesh)
+        self.collections = IDCollection(Collection)
+        self.materials = IDCollection(Material)
+        for kind in self.KINDS:
+            if not hasattr(self, kind):
+                setattr(self, kind, IDCollection(lambda *a, **k: ID()))
+
+class OpsModule:
+    def __init__(self, bpy, module):
+        self._bpy = bpy
+        self._module = module
+
+    def __getattr__(self, op):
+        if self._module == "mesh" and op.startswith("primitive_") and op.endswith("_add"):
+            kind = op[len("primitive_"):-len("_add")]
+            return lambda **kwargs: self._bpy._add_primitive(kind, **kwargs)
+        return _finished
+
+def _finished(*args, **kwargs):
+    return {'FINISHED'}
+
+class Ops:
+    def __init__(self, bpy):
+        self._bpy = bpy
+
+    def __getattr__(self, module):
+        value = OpsModule(self._bpy, module)
+        self.__dict__[module] = value
+        return value
+
+class Timers:
+    def __init__(self):
+        self.registered = []
+
+    def register(self, fn, first_interval=0.0, persistent=False):
+        self.registered.append(fn)
+
+    def unregister(self, fn):
+        self.registered.remove(fn)
+
+    def is_registered(self, fn):
+        return fn in self.registered
+
+class StubBpy(types.ModuleType):
+    def __init__(self):
+        super().__init__("bpy")
+        self.reset()
+        self.ops = Ops(self)
+        self.app = types.SimpleNamespace(
+            timers=Timers(),
+            handlers=types.SimpleNamespace(depsgraph_update_post=[], load_post=[], undo_post=[], redo_post=[],
+                                         persistent=lambda fn: fn),
+            version=(4, 1, 0),
+        )
+        self.types = types.SimpleNamespace(AddonPreferences=object, Operator=object, Panel=object)
+        self.props = types.SimpleNamespace(
+            StringProperty=lambda **kwargs: None,
+            BoolProperty=lambda **kwargs: None,
+            IntProperty=lambda **kwargs: None,
+            FloatProperty=lambda **kwargs: None,
+            EnumProperty=lambda **kwargs: None,
+        )
+        self.utils = types.SimpleNamespace(register_class=_finished, unregister_class=_finished)
+
+    def reset(self, count=0):
+        """Replaces all data with an empty scene, then adds the standard fixtures."""
+        self.data = Data()
+        self.context = Context(self.data)
+        self.populate(count)
+        # Like loading a file: listeners drop whatever they cached
+        app = getattr(self, "app", None)
+        for handler in list(app.handlers.load_post) if app else ():
+            handler(None)
+
+    def _add_primitive(self, kind, location=(0, 0, 0), **kwargs):
+        mesh = self.data.meshes.new(kind.title())
+        return self._link(self.data.objects.new(kind.title(), mesh), location)
+
+    def _link(self, obj, location=(0, 0, 0)):
+        obj.location = location
+        self.context.collection.objects.link(obj)
+        self.context.view_layer.objects.append(obj)
+        self.context.view_layer.objects.active = obj
+        return {'FINISHED'}
+
+    def populate(self, count=0):
+        """Creates the named fixtures tools expect plus `count` extra meshes."""
+        for name in ("Cube", "Sphere", "Cutter", "Target"):
+            if name not in self.data.objects:
+                self._link(self.data.objects.new(name, self.data.meshes.new(name)))
+        for name, kind in (("Camera", "CAMERA"), ("Light", "LIGHT"), ("Curve", "CURVE"), ("Lattice", "LATTICE")):
+            if name not in self.data.objects:
+                self._link(self.data.objects.new(name, Anything(), type=kind))
+        if "Material" not in self.data.materials:
+            self.data.materials.new("Material")
+        if "NodeTree" not in self.data.node_groups:
+            self.data.node_groups.new("NodeTree")
+        if "Collection" not in self.data.collections:
+            self.data.collections.new("Collection")
+        for i in range(count):
+            self._link(self.data.objects.new(f"Mesh_{i}", self.data.meshes.new(f"Mesh_{i}")), (i, 0, 0))
+
+def install():
+    """Installs a fresh stub as the `bpy` module and returns it."""
+    bpy = StubBpy()
+    sys.modules["bpy"] = bpy
+    return bpy
+
+def install_bmesh_stub():
+    """Registers a bmesh whose create_* ops and to_mesh() do nothing; stub meshes already have geometry."""
+    bmesh = types.ModuleType("bmesh")
+    bmesh.new = lambda: Anything()
+    bmesh.ops = Anything()
+    sys.modules["bmesh"] = bmesh
+    return bmesh
+
+def install_genai_stub():
+    """Registers a no-network google.generativeai when the SDK is not installed.
+
+    Only the response parser is benchmarked, so nothing here talks to a model.
+    """
+    try:
+        import google.generativeai  # noqa: F401
+        return
+    except ImportError:
+        pass
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda **kwargs: Anything()
+    genai.list_models = lambda: []
+    google = sys.modules.setdefault("google", types.ModuleType("google"))
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
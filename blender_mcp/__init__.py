@@ -26,11 +26,111 @@ class BlenderMCPPreferences(bpy.types.AddonPreferences):
         description="Gemini Model ID",
         default="gemini-1.5-flash",
     )
+    history_images: bpy.props.IntProperty(
+        name="Screenshots Kept",
+        description="How many recent viewport screenshots stay in the chat history",
+        default=2,
+        min=0,
+    )
+    history_token_budget: bpy.props.IntProperty(
+        name="History Token Budget",
+        description="Oldest turns are dropped once the chat history is estimated above this many tokens",
+        default=32000,
+        min=1000,
+    )
+    screenshot_max_edge: bpy.props.IntProperty(
+        name="Screenshot Size",
+        description="Viewport screenshots are downscaled so their long edge is at most this many pixels",
+        default=1024,
+        min=128,
+    )
+    screenshot_format: bpy.props.EnumProperty(
+        name="Screenshot Format",
+        items=[
+            ('JPEG', "JPEG", "Small and widely supported"),
+            ('WEBP', "WebP", "Smaller than JPEG at the same quality"),
+            ('PNG', "PNG", "Lossless, largest"),
+        ],
+        default='JPEG',
+    )
+    screenshot_quality: bpy.props.IntProperty(
+        name="Screenshot Quality",
+        description="JPEG/WebP quality",
+        default=80,
+        min=1,
+        max=100,
+    )
+    skip_unchanged_screenshots: bpy.props.BoolProperty(
+        name="Skip Unchanged Screenshots",
+        description="Do not resend the viewport when it looks the same as the last screenshot",
+        default=True,
+    )
+    function_calling: bpy.props.BoolProperty(
+        name="Native Function Calling",
+        description="Offer tools to the model as function declarations instead of listing them in the prompt",
+        default=False,
+    )
+    request_timeout: bpy.props.FloatProperty(
+        name="Request Timeout (s)",
+        description="Seconds to wait for each model request before retrying",
+        default=60.0,
+        min=1.0,
+    )
+    request_retries: bpy.props.IntProperty(
+        name="Request Retries",
+        description="Retries after timeouts, rate limits and server errors, with jittered exponential backoff",
+        default=3,
+        min=0,
+        max=10,
+    )
+    hedge_after: bpy.props.FloatProperty(
+        name="Hedge After (s)",
+        description="Send a duplicate request when the first has not answered after this many seconds "
+                    "(0 disables; duplicates are billed)",
+        default=0.0,
+        min=0.0,
+    )
+    api_endpoint: bpy.props.StringProperty(
+        name="API Endpoint",
+        description="Call the Gemini REST API at this host instead of through the SDK (e.g. a proxy); empty uses the SDK",
+        default="",
+    )
+    response_cache: bpy.props.BoolProperty(
+        name="Cache Replies",
+        description="Replay the commands of an earlier reply when the same prompt is sent in the same scene state",
+        default=False,
+    )
+    response_cache_size: bpy.props.IntProperty(
+        name="Cached Replies",
+        description="Least recently used replies are evicted beyond this many",
+        default=256,
+        min=1,
+    )
+    response_cache_ttl_hours: bpy.props.IntProperty(
+        name="Cache Lifetime (hours)",
+        description="Cached replies older than this are requested again",
+        default=168,
+        min=1,
+    )
 
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "api_key")
         layout.prop(self, "model_name")
+        layout.prop(self, "function_calling")
+        layout.prop(self, "history_images")
+        layout.prop(self, "history_token_budget")
+        layout.prop(self, "screenshot_max_edge")
+        layout.prop(self, "screenshot_format")
+        layout.prop(self, "screenshot_quality")
+        layout.prop(self, "skip_unchanged_screenshots")
+        layout.prop(self, "request_timeout")
+        layout.prop(self, "request_retries")
+        layout.prop(self, "hedge_after")
+        layout.prop(self, "api_endpoint")
+        layout.prop(self, "response_cache")
+        layout.prop(self, "response_cache_size")
+        layout.prop(self, "response_cache_ttl_hours")
         layout.operator("blender_mcp.install_deps")
 
 class BLENDER_MCP_OT_InstallDeps(bpy.types.Operator):
@@ -79,6 +179,9 @@ def register():
         bpy.utils.register_class(cls)
 
 def unregister():
+    from .core.primitives import factory
+    # Template meshes must not outlive the add-on in the user's file
+    factory.release()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
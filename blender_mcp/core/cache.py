@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_SPACE_RE = re.compile(r"\s+")
+
+def normalize_prompt(text):
+    """Folds case, width and whitespace so retyped macros map to the same key."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _SPACE_RE.sub(" ", text).strip().rstrip(".!?").strip()
+
+class ResponseCache:
+    """LRU cache of model replies keyed by prompt, scene fingerprint and model.
+
+    Entries are {"text", "commands", "time"} and expire after `ttl` seconds;
+    beyond `max_entries` the least recently used entry is evicted. With a
+    `path` the cache is a JSON file, rewritten atomically when entries are
+    added or cleared and on flush(), so it survives restarts; without one it
+    lives in memory only. Lookups only reorder entries in memory.
+    """
+
+    def __init__(self, path=None, max_entries=256, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Lookups reordered or expired entries since the file was written
+        self._unsaved = False
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def key(model_name, prompt, fingerprint, mode="text"):
+        raw = json.dumps([model_name, mode, normalize_prompt(prompt), fingerprint])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry["time"] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+                self._unsaved = True
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._unsaved = True
+            return {"text": entry["text"], "commands": json.loads(json.dumps(entry["commands"]))}
+
+    def put(self, key, text, commands):
+        with self._lock:
+            self._entries[key] = {"text": text, "commands": commands, "time": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def flush(self):
+        """Writes out the recency order and expiries left by lookups since the last write."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable response cache {self.path}: {e}")
+            return
+        # Stored least recently used first
+        for key, entry in entries:
+            self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        self._unsaved = False
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(list(self._entries.items()), f, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write response cache {self.path}: {e}")
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+
+# Families that accept images; older text-only and non-chat models do not
+_VISION_RE = re.compile(r"^gemini-(1\.5|2|3|exp|pro-vision|1\.0-pro-vision)")
+_NO_TOOLS_RE = re.compile(r"vision|embedding|aqa|tts|image-generation|imagen|learnlm")
+_PREVIEW_RE = re.compile(r"exp|preview|experimental")
+
+def capabilities(entry):
+    """Adds vision, function_calling and context_size flags to a model entry."""
+    name = entry["name"]
+    methods = entry.get("methods", [])
+    chat = "generateContent" in methods
+    entry = dict(entry)
+    entry["vision"] = chat and bool(_VISION_RE.match(name))
+    entry["function_calling"] = chat and name.startswith("gemini-") and not _NO_TOOLS_RE.search(name)
+    entry["context_size"] = entry.get("input_token_limit") or 0
+    entry["preview"] = bool(_PREVIEW_RE.search(name))
+    return entry
+
+def list_models_sdk(api_key):
+    """Chat-capable models as plain dicts, listed through the SDK."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return [
+        {
+            "name": m.name.split('/')[-1],
+            "display_name": m.display_name,
+            "input_token_limit": getattr(m, "input_token_limit", 0),
+            "output_token_limit": getattr(m, "output_token_limit", 0),
+            "methods": list(m.supported_generation_methods),
+        }
+        for m in genai.list_models()
+    ]
+
+def list_models_rest(api_key, endpoint, timeout=10.0):
+    """Same as list_models_sdk over the REST API at `endpoint`."""
+    base = (endpoint if "://" in endpoint else "https://" + endpoint).rstrip("/")
+    models = []
+    page = ""
+    while True:
+        request = urllib.request.Request(
+            f"{base}/v1beta/models?pageSize=1000" + (f"&pageToken={page}" if page else ""),
+            headers={"x-goog-api-key": api_key},
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read())
+        for m in payload.get("models", []):
+            models.append({
+                "name": m["name"].split('/')[-1],
+                "display_name": m.get("displayName", ""),
+                "input_token_limit": m.get("inputTokenLimit", 0),
+                "output_token_limit": m.get("outputTokenLimit", 0),
+                "methods": m.get("supportedGenerationMethods", []),
+            })
+        page = payload.get("nextPageToken")
+        if not page:
+            return models
+
+class ModelCatalog:
+    """Model list cached on disk and refreshed in the background.
+
+    `models()` answers from the cache at once, even offline, and starts a
+    refresh on a daemon thread when the cache is older than `ttl` or was
+    fetched with another API key. Only with nothing cached does it wait, up
+    to `wait` seconds, for the first listing.
+    """
+
+    def __init__(self, path=None, ttl=24 * 3600, fetch=None):
+        self.path = path
+        self.ttl = ttl
+        self.fetch = fetch or list_models_sdk
+        self._lock = threading.Lock()
+        self._refreshing = None
+        self._data = {"fetched_at": 0, "key": None, "models": []}
+        self.last_error = None
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable model catalog {path}: {e}")
+
+    def models(self, api_key, wait=0.0):
+        """Chat-capable models with capability flags, newest listing first available."""
+        key = _key_hash(api_key)
+        stale = self._data["key"] != key or time.time() - self._data["fetched_at"] > self.ttl
+        if stale:
+            thread = self.refresh_async(api_key)
+            if wait and not self._data["models"]:
+                thread.join(wait)
+        return [m for m in self._data["models"] if "generateContent" in m.get("methods", [])]
+
+    def refresh_async(self, api_key):
+        with self._lock:
+            if self._refreshing is None or not self._refreshing.is_alive():
+                self._refreshing = threading.Thread(target=self.refresh, args=(api_key,), daemon=True,
+                                                    name="model-catalog")
+                self._refreshing.start()
+            return self._refreshing
+
+    def refresh(self, api_key):
+        """Fetches the listing now; on failure the previous listing is kept."""
+        try:
+            models = [capabilities(m) for m in self.fetch(api_key)]
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Error listing models: {e}")
+            return False
+        self.last_error = None
+        self._data = {"fetched_at": time.time(), "key": _key_hash(api_key), "models": models}
+        self._save()
+        return True
+
+    def get(self, name):
+        return next((m for m in self._data["models"] if m["name"] == name), None)
+
+    def pick(self, vision=True, function_calling=False, prefer="flash"):
+        """Best listed model with the required capabilities, or None.
+
+        Stable models come before previews, then names containing `prefer`,
+        then the largest context.
+        """
+        candidates = [
+            m for m in self._data["models"]
+            if "generateContent" in m.get("methods", [])
+            and (m.get("vision") or not vision)
+            and (m.get("function_calling") or not function_calling)
+        ]
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda m: (not m.get("preview"), prefer in m["name"], m.get("context_size", 0)))
+        return best["name"]
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write model catalog {self.path}: {e}")
+
+def _key_hash(api_key):
+    # The key itself is never written to disk
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
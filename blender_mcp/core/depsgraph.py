@@ -0,0 +1,214 @@
+import bpy
+import threading
+
+class DepsgraphHub:
+    """One depsgraph_update_post handler fanned out to any number of listeners.
+
+    Listeners are called as listener(scene, depsgraph) on the main thread after
+    every depsgraph evaluation; a failing listener is reported and skipped so
+    it cannot break the others or Blender's own handlers. File loads, undo and
+    redo replace the whole scene and are passed on with depsgraph=None.
+    """
+
+    # Handlers after which every datablock may have changed
+    RELOAD_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+    def __init__(self):
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._handler = None
+        self._reload_handler = None
+
+    def add_listener(self, listener):
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def start(self):
+        with self._lock:
+            if self._handler is not None:
+                return
+
+            @bpy.app.handlers.persistent
+            def handler(scene, depsgraph=None):
+                self.notify(scene, depsgraph)
+
+            @bpy.app.handlers.persistent
+            def reload_handler(*args):
+                self.notify(None, None)
+
+            self._handler = handler
+            self._reload_handler = reload_handler
+        bpy.app.handlers.depsgraph_update_post.append(handler)
+        for name in self.RELOAD_HANDLERS:
+            getattr(bpy.app.handlers, name).append(reload_handler)
+
+    def stop(self):
+        with self._lock:
+            handler, self._handler = self._handler, None
+            reload_handler, self._reload_handler = self._reload_handler, None
+        if handler is not None and handler in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(handler)
+        for name in self.RELOAD_HANDLERS:
+            handlers = getattr(bpy.app.handlers, name)
+            if reload_handler is not None and reload_handler in handlers:
+                handlers.remove(reload_handler)
+
+    @property
+    def running(self):
+        return self._handler is not None
+
+    def notify(self, scene, depsgraph):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(scene, depsgraph)
+            except Exception as e:
+                print(f"Depsgraph listener {getattr(listener, '__name__', listener)} failed: {e}")
+
+def _rounded(values, precision):
+    return [round(v, precision) for v in values]
+
+def object_record(obj, precision=4):
+    return {
+        "name": obj.name,
+        "type": obj.type,
+        "location": _rounded(obj.location, precision),
+        "rotation": _rounded(obj.rotation_euler, precision),
+        "scale": _rounded(obj.scale, precision),
+        "parent": obj.parent.name if obj.parent else None,
+        "materials": [slot.material.name if slot.material else None for slot in obj.material_slots],
+        "modifiers": [mod.name for mod in obj.modifiers],
+    }
+
+def material_record(mat, precision=4):
+    record = {"name": mat.name, "color": _rounded(mat.diffuse_color, precision)}
+    if mat.use_nodes and mat.node_tree:
+        bsdf = mat.node_tree.nodes.get("Principled BSDF")
+        if bsdf is not None:
+            record["color"] = _rounded(bsdf.inputs["Base Color"].default_value, precision)
+            record["metallic"] = round(bsdf.inputs["Metallic"].default_value, precision)
+            record["roughness"] = round(bsdf.inputs["Roughness"].default_value, precision)
+    return record
+
+class SceneTracker:
+    """Tracks what changed in the scene since the model last looked.
+
+    Objects and materials are keyed by session_uid, so renames are reported as
+    renames rather than a removal plus an addition. As a depsgraph listener
+    only the datablocks named in each update are re-read; when objects are
+    linked or unlinked, or the handler was not running, the delta falls back
+    to a full rescan.
+    """
+
+    def __init__(self, precision=4):
+        self.precision = precision
+        self._objects = None
+        self._materials = None
+        # session_uid -> name at the time of the update
+        self._dirty_objects = {}
+        self._dirty_materials = {}
+        self._membership_dirty = True
+        self._lock = threading.Lock()
+
+    def on_update(self, scene, depsgraph):
+        """depsgraph_update_post listener: remembers which datablocks to re-read."""
+        if depsgraph is None:
+            self._membership_dirty = True
+            return
+        with self._lock:
+            for update in depsgraph.updates:
+                original = getattr(update.id, "original", update.id)
+                id_type = getattr(original, "id_type", None)
+                if id_type == 'OBJECT':
+                    self._dirty_objects[original.session_uid] = original.name
+                elif id_type == 'MATERIAL':
+                    self._dirty_materials[original.session_uid] = original.name
+                elif id_type in ('SCENE', 'COLLECTION'):
+                    # Objects linked or unlinked; also sent on renames
+                    self._membership_dirty = True
+
+    def reset(self):
+        """Forgets the baseline, so the next delta is a full snapshot."""
+        with self._lock:
+            self._objects = None
+            self._materials = None
+
+    def snapshot(self):
+        """Full scene state; it becomes the baseline for the next delta."""
+        with self._lock:
+            self._objects = {obj.session_uid: object_record(obj, self.precision) for obj in bpy.data.objects}
+            self._materials = {mat.session_uid: material_record(mat, self.precision) for mat in bpy.data.materials}
+            self._clear_dirty()
+            return {
+                "objects": list(self._objects.values()),
+                "materials": list(self._materials.values()),
+            }
+
+    def delta(self, rescan=False):
+        """Changes since the last snapshot or delta; None when there is no baseline yet.
+
+        Pass rescan when the listener was not receiving updates.
+        """
+        with self._lock:
+            if self._objects is None:
+                return None
+            rescan = rescan or self._membership_dirty
+            objects = _diff(
+                self._objects, bpy.data.objects, self._dirty_objects,
+                rescan, lambda o: object_record(o, self.precision),
+            )
+            materials = _diff(
+                self._materials, bpy.data.materials, self._dirty_materials,
+                rescan, lambda m: material_record(m, self.precision),
+            )
+            self._clear_dirty()
+        return {"objects": objects, "materials": materials}
+
+    def _clear_dirty(self):
+        self._dirty_objects = {}
+        self._dirty_materials = {}
+        self._membership_dirty = False
+
+def _diff(baseline, collection, dirty, rescan, make_record):
+    """Updates baseline (session_uid -> record) in place and returns what changed."""
+    added, removed, renamed, changed = [], [], [], []
+    candidates = {}
+    if not rescan:
+        # Only the datablocks the handler saw, looked up by name
+        for uid, name in dirty.items():
+            item = collection.get(name)
+            if item is None or item.session_uid != uid:
+                rescan = True
+                break
+            candidates[uid] = item
+    if rescan:
+        candidates = {item.session_uid: item for item in collection}
+        for uid in list(baseline):
+            if uid not in candidates:
+                removed.append(baseline.pop(uid)["name"])
+
+    for uid, item in candidates.items():
+        record = make_record(item)
+        before = baseline.get(uid)
+        baseline[uid] = record
+        if before is None:
+            added.append(record)
+            continue
+        if before["name"] != record["name"]:
+            renamed.append({"from": before["name"], "to": record["name"]})
+        fields = {key: value for key, value in record.items() if key != "name" and before.get(key) != value}
+        if fields:
+            changed.append(dict(name=record["name"], **fields))
+
+    delta = {}
+    for key, items in (("added", added), ("removed", removed), ("renamed", renamed), ("changed", changed)):
+        if items:
+            delta[key] = items
+    return delta
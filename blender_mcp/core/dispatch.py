@@ -0,0 +1,152 @@
+import bpy
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+class MainThreadDispatcher:
+    """Single long-lived bpy timer that drains queued work on Blender's main thread.
+
+    Work is executed in submission order. Each timer tick runs jobs until the
+    time budget is used up, then yields back to Blender so the UI keeps redrawing.
+    Every submission returns a Future resolved with the job's return value.
+    """
+
+    def __init__(self, budget=0.008, busy_interval=0.001, idle_interval=0.05):
+        self.budget = budget
+        self.busy_interval = busy_interval
+        self.idle_interval = idle_interval
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._registered = False
+        self._ticks = 0
+        self._total_drained = 0
+        self._max_depth = 0
+        self._last_tick = {"drained": 0, "elapsed": 0.0, "remaining": 0}
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            self._queue.append((future, fn, args, kwargs))
+            depth = len(self._queue)
+            if depth > self._max_depth:
+                self._max_depth = depth
+        self._wakeup.set()
+        self.start()
+        return future
+
+    def call(self, fn, *args, timeout=None, **kwargs):
+        """Runs fn on the main thread and blocks for its result.
+
+        Called from the main thread itself the job runs inline, since waiting on
+        the pump from there would deadlock. A job that times out is cancelled so
+        it does not run after the caller has given up on it.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return fn(*args, **kwargs)
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def start(self):
+        with self._lock:
+            if self._registered:
+                return
+            self._registered = True
+        bpy.app.timers.register(self._pump, first_interval=0.0, persistent=True)
+
+    def stop(self):
+        with self._lock:
+            if not self._registered:
+                return
+            self._registered = False
+        if bpy.app.timers.is_registered(self._pump):
+            bpy.app.timers.unregister(self._pump)
+
+    def depth(self):
+        return len(self._queue)
+
+    def drain(self, budget=None):
+        """Runs queued jobs until the queue is empty or the budget is spent.
+
+        At least one job runs per call so a single slow tool cannot stall the queue.
+        """
+        budget = self.budget if budget is None else budget
+        start = time.perf_counter()
+        drained = 0
+        while True:
+            with self._lock:
+                if not self._queue:
+                    break
+                future, fn, args, kwargs = self._queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                print(f"Main thread job failed: {e}")
+                future.set_exception(e)
+            drained += 1
+            if time.perf_counter() - start >= budget:
+                break
+
+        self._ticks += 1
+        self._total_drained += drained
+        self._last_tick = {
+            "drained": drained,
+            "elapsed": time.perf_counter() - start,
+            "remaining": len(self._queue),
+        }
+        return drained
+
+    def run_forever(self, stop_event, idle_interval=None):
+        """Pumps the queue from the calling thread until stop_event is set.
+
+        Used under `blender --background`, where no event loop runs timers.
+        Must be called from Blender's main thread.
+        """
+        idle_interval = self.idle_interval if idle_interval is None else idle_interval
+        while not stop_event.is_set():
+            self._wakeup.clear()
+            if self._queue:
+                self.drain()
+            else:
+                self._wakeup.wait(idle_interval)
+
+    def _pump(self):
+        if not self._registered:
+            return None
+        self.drain()
+        return self.busy_interval if self._queue else self.idle_interval
+
+    def get_stats(self):
+        return {
+            "depth": len(self._queue),
+            "max_depth": self._max_depth,
+            "ticks": self._ticks,
+            "total_drained": self._total_drained,
+            "last_tick": dict(self._last_tick),
+        }
+
+def gather(futures, timeout=None):
+    """Waits for futures in order and returns their results.
+
+    The timeout applies to the whole group. Jobs that fail or do not finish in
+    time are reported as error dicts, matching the tool result format.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for future in futures:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            results.append(future.result(timeout=remaining))
+        except FutureTimeoutError:
+            future.cancel()
+            results.append({"status": "error", "message": "Timed out waiting for the main thread"})
+        except Exception as e:
+            results.append({"status": "error", "message": str(e)})
+    return results
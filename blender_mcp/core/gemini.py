@@ -1,10 +1,284 @@
 import google.generativeai as genai
+import asyncio
+import base64
+import functools
 import json
-import re
+import random
+import threading
+import types
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from .catalog import list_models_sdk
+from .history import ChatHistory
+from .parser import extract_commands
+from .schema import ToolSchemas
+
+FUNCTION_CALLING_INSTRUCTION = """
+You are an expert Blender Assistant. Your goal is to help users build, control, and setup 3D scenes in Blender.
+Act on the scene by calling the provided functions; you may call several in one reply to build step by step.
+Rotations are in degrees, locations and scales are [x, y, z].
+
+Important:
+- Always provide a brief explanation of what you are doing.
+- If you need to verify your work immediately, call request_feedback(message) to get a fresh screenshot.
+- You have VISION capabilities. You receive a screenshot of the viewport with every message. Use it to verify your work.
+- The results of your function calls arrive with the next message.
+- Call get_scene_delta() to see what changed since you last looked; get_scene_info() lists everything.
+"""
+
+# HTTP statuses worth retrying: rate limits, overload and gateway timeouts
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+class GeminiError(Exception):
+    def __init__(self, message, status=None, retry_after=None, retryable=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.retryable = status in RETRYABLE_STATUS if retryable is None else retryable
+
+class RequestCancelled(GeminiError):
+    def __init__(self, message="Request cancelled"):
+        super().__init__(message, retryable=False)
+
+def is_retryable(exc):
+    if isinstance(exc, GeminiError):
+        return exc.retryable
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # google.api_core exceptions carry the HTTP status as `code`
+    return getattr(exc, "code", None) in RETRYABLE_STATUS
+
+class AsyncGeminiClient:
+    """Runs blocking model calls under an asyncio loop on its own thread.
+
+    Each request gets `timeout` seconds per attempt and up to `retries`
+    retries on retryable errors, sleeping a fully jittered exponential
+    backoff (or the server's Retry-After) in between. With `hedge_after`
+    set, a duplicate request is started when the first has not answered
+    within that many seconds and whichever finishes first wins; duplicates
+    are billed, so hedging is off by default. `cancel()` aborts the requests
+    in flight from any thread. Calls already inside the SDK cannot be
+    interrupted; their late results are discarded.
+    """
+
+    def __init__(self, timeout=60.0, retries=3, backoff=0.5, max_backoff=8.0, hedge_after=None, max_workers=8):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._loop = None
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self._cancelled = threading.Event()
+        self._stats = {"requests": 0, "attempts": 0, "retries": 0, "timeouts": 0,
+                       "hedges": 0, "hedge_wins": 0, "cancelled": 0, "failures": 0}
+
+    def call(self, fn, *args, hedge=True, **kwargs):
+        """Blocking entry point for worker threads; returns fn(*args, **kwargs)."""
+        self._cancelled.clear()
+        future = asyncio.run_coroutine_threadsafe(self.request(fn, *args, hedge=hedge, **kwargs), self._ensure_loop())
+        return future.result()
+
+    async def request(self, fn, *args, hedge=True, **kwargs):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        self._stats["requests"] += 1
+        attempt = 0
+        try:
+            if self._cancelled.is_set():
+                # cancel() arrived between call() and this task starting
+                raise asyncio.CancelledError()
+            while True:
+                self._stats["attempts"] += 1
+                try:
+                    return await asyncio.wait_for(self._attempt(functools.partial(fn, *args, **kwargs), hedge), self.timeout)
+                except asyncio.TimeoutError:
+                    self._stats["timeouts"] += 1
+                    error = GeminiError(f"No reply within {self.timeout:g}s", retryable=True)
+                except Exception as e:
+                    error = e
+                if attempt >= self.retries or not is_retryable(error):
+                    self._stats["failures"] += 1
+                    raise error
+                delay = getattr(error, "retry_after", None) or random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                attempt += 1
+                self._stats["retries"] += 1
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            raise RequestCancelled() from None
+        finally:
+            self._tasks.discard(task)
+
+    async def _attempt(self, call, hedge):
+        loop = asyncio.get_running_loop()
+        first = self._submit(loop, call)
+        if not hedge or not self.hedge_after:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        if done:
+            return first.result()
+        self._stats["hedges"] += 1
+        second = self._submit(loop, call)
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is second:
+                            self._stats["hedge_wins"] += 1
+                        return future.result()
+                    error = future.exception()
+            raise error
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _submit(self, loop, call):
+        future = loop.run_in_executor(self._executor, call)
+        # Abandoned attempts may fail later; retrieve their errors so they are not logged
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
+
+    def cancel(self):
+        """Cancels every request in flight; returns how many were cancelled."""
+        self._cancelled.set()
+        loop = self._loop
+        tasks = list(self._tasks)
+        if loop is not None:
+            for task in tasks:
+                loop.call_soon_threadsafe(task.cancel)
+        return len(tasks)
+
+    @property
+    def cancelled(self):
+        """True once cancel() was called during the current request, e.g. to stop reading a stream."""
+        return self._cancelled.is_set()
+
+    def stats(self):
+        return dict(self._stats)
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        self._executor.shutdown(wait=False)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="gemini-client", daemon=True).start()
+            return self._loop
+
+class RestModel:
+    """generate_content over the Gemini REST API with the standard library.
+
+    Used when an API endpoint is configured (a proxy, a regional endpoint or a
+    local stand-in); responses mimic the SDK's text, candidates and
+    usage_metadata attributes.
+    """
+
+    def __init__(self, api_key, model_name, system_instruction, endpoint, timeout=60.0):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.endpoint = (endpoint if "://" in endpoint else "https://" + endpoint).rstrip("/")
+        self.timeout = timeout
+
+    def generate_content(self, contents, tools=None, stream=False):
+        body = {"contents": [{"role": turn["role"], "parts": [_rest_part(p) for p in turn["parts"]]} for turn in contents]}
+        if self.system_instruction:
+            body["system_instruction"] = {"parts": [{"text": self.system_instruction}]}
+        if tools:
+            body["tools"] = tools
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        request = urllib.request.Request(
+            f"{self.endpoint}/v1beta/models/{self.model_name}:{method}",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+        )
+        try:
+            http = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After")
+            detail = e.read()[:300].decode("utf-8", "replace")
+            raise GeminiError(f"HTTP {e.code}: {detail}", status=e.code,
+                              retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None) from None
+        except urllib.error.URLError as e:
+            raise GeminiError(f"Cannot reach {self.endpoint}: {e.reason}", retryable=True) from None
+        if stream:
+            return self._events(http)
+        with http:
+            return _RestResponse(json.loads(http.read()))
+
+    def _events(self, http):
+        with http:
+            for line in http:
+                line = line.strip()
+                if line.startswith(b"data:"):
+                    yield _RestResponse(json.loads(line[5:]))
+
+def _rest_part(part):
+    if isinstance(part, str):
+        return {"text": part}
+    if "mime_type" in part:
+        return {"inline_data": {"mime_type": part["mime_type"], "data": base64.b64encode(part["data"]).decode("ascii")}}
+    return part
+
+class _RestResponse:
+    def __init__(self, payload):
+        self.candidates = []
+        for candidate in payload.get("candidates", []):
+            parts = []
+            for part in candidate.get("content", {}).get("parts", []):
+                call = part.get("functionCall") or part.get("function_call")
+                parts.append(types.SimpleNamespace(
+                    text=part.get("text", ""),
+                    function_call=types.SimpleNamespace(name=call["name"], args=call.get("args", {})) if call else None,
+                ))
+            self.candidates.append(types.SimpleNamespace(content=types.SimpleNamespace(parts=parts)))
+        usage = payload.get("usageMetadata") or {}
+        self.usage_metadata = types.SimpleNamespace(
+            prompt_token_count=usage.get("promptTokenCount"),
+            candidates_token_count=usage.get("candidatesTokenCount"),
+        )
+
+    @property
+    def text(self):
+        parts = [p.text for c in self.candidates[:1] for p in c.content.parts if p.text]
+        if not parts:
+            # Same as the SDK for replies without text (function calls or a finish chunk)
+            raise ValueError("Response has no text parts")
+        return "".join(parts)
 
 class GeminiManager:
-    def __init__(self, api_key, model_name):
+    """Chat session with the model.
+
+    Given a tool registry, the model uses native function calling instead of
+    <blender_cmd> text blocks and is offered a routed subset of tools per turn.
+    The conversation lives in a ChatHistory that is compacted before every
+    request; `last_usage` reports what the latest request sent. With a
+    ResponseCache, replies can be replayed for a prompt already answered in
+    the same scene state without calling the model. Requests go through an
+    AsyncGeminiClient for timeouts, retries and cancellation; with an
+    api_endpoint the REST API is called directly instead of through the SDK.
+    """
+
+    def __init__(self, api_key, model_name, tools=None, history=None, cache=None, client=None, api_endpoint=None):
         genai.configure(api_key=api_key)
+        self.client = client or AsyncGeminiClient()
+        self.model_name = model_name
+        self.schemas = ToolSchemas(tools) if tools is not None else None
+        self.history = history or ChatHistory()
+        self.cache = cache
+        self.last_usage = {}
 
         self.system_instruction = """
 You are an expert Blender Assistant. Your goal is to help users build, control, and setup 3D scenes in Blender.
@@ -12,8 +286,10 @@ You communicate using natural language but when you need to perform actions, you
 Wrap your tool calls inside <blender_cmd> tags.
 
 Available Tools (50+):
-- create_primitive(type, location, scale, name): [CUBE, SPHERE, PLANE, CYLINDER]
+- create_primitive(type, location, scale, name): [CUBE, SPHERE, PLANE, CYLINDER, CONE, ICOSPHERE, TORUS, MONKEY]
+- create_primitives(type, count, names, locations, rotations, scales, shared, collection): many at once, sharing one mesh by default
 - transform_object(name, location, rotation, scale): rotation in degrees
+- transform_objects(names, locations, rotations, scales, matrices, mode): many objects at once; one row for all or one per name, mode ABSOLUTE or RELATIVE
 - delete_object(name), duplicate_object(name, location), rename_object(old_name, new_name)
 - set_parent(child, parent), clear_parent(name), hide_object(name, hide)
 - move_to_collection(name, collection), apply_transform(name, loc, rot, scale), clear_transform(name, loc, rot, scale)
@@ -71,7 +347,10 @@ Available Tools (50+):
 - add_constraint(obj, type, target), import_obj(path), export_obj(path)
 - list_assets(), import_asset(name), setup_pbr_material(name, base, norm, rough, met)
 - setup_fluid_domain(name), setup_fluid_flow(name), setup_smoke_domain(name), setup_smoke_flow(name), setup_soft_body(name)
-- audit_scene(), get_scene_info(), get_screenshot(), request_feedback(message)
+- audit_scene(fields, type, collection, name, cursor), get_scene_info(fields, type, collection, name, cursor), get_scene_delta(full), get_screenshot(), request_feedback(message)
+- find_objects(type, collection, material, parent, data, shared_data)
+- find_nearby(point, radius, type), find_nearest(point, count, type, exclude), ray_cast(origin, direction, max_distance)
+- find_in_box(box_min, box_max, type), find_free_space(size, near, padding, max_distance, exclude)
 
 Example:
 "I'll build a physics scene with a cloth and a wind force."
@@ -96,51 +375,212 @@ Important:
 - After performing actions, you can suggest next steps.
 - If you need to verify your work immediately, use request_feedback(message). This will trigger an automatic screenshot and a new request to you with the visual result.
 - You have VISION capabilities. You receive a screenshot of the viewport with every message. Use it to verify your work.
-- If you need a fresh screenshot or more scene data, you can ask the user or use get_scene_info().
+- If you need a fresh screenshot or more scene data, you can ask the user or use get_scene_delta() to see what changed since you last looked (get_scene_info() lists everything).
 - Always provide a brief explanation of what you are doing.
 """
-        self.model = genai.GenerativeModel(
-            model_name=model_name,
-            system_instruction=self.system_instruction
-        )
-        self.chat = self.model.start_chat(history=[])
+        if self.function_calling:
+            self.system_instruction = FUNCTION_CALLING_INSTRUCTION
+        if api_endpoint:
+            self.model = RestModel(api_key, model_name, self.system_instruction, api_endpoint, timeout=self.client.timeout)
+        else:
+            self.model = genai.GenerativeModel(
+                model_name=model_name,
+                system_instruction=self.system_instruction
+            )
+
+    @property
+    def function_calling(self):
+        return getattr(self, "schemas", None) is not None
 
-    def send_message(self, message, image_data=None):
+    def build_content(self, message, image_data=None, tool_results=None):
         content = []
-        if image_data:
-            import base64
-            # image_data is expected to be base64 string from get_base64_viewport
+        if tool_results and self.function_calling:
+            # Answers the previous turn's function calls, which must come first
+            content.extend(self.format_function_responses(tool_results))
+        if isinstance(image_data, dict):
+            # Encoded frame from a ViewportEncoder: raw bytes, or no data when unchanged
+            if image_data.get("data"):
+                content.append({"mime_type": image_data["mime_type"], "data": image_data["data"]})
+            elif image_data.get("unchanged"):
+                content.append("[Viewport unchanged since the previous screenshot]")
+        elif image_data:
+            # A base64 PNG string
             image_bytes = base64.b64decode(image_data)
             content.append({"mime_type": "image/png", "data": image_bytes})
+        if tool_results and not self.function_calling:
+            content.append(self.format_tool_results(tool_results))
         content.append(message)
+        return content
+
+    def _begin_turn(self, message, image_data, tool_results, summary):
+        self.history.add_user(self.build_content(message, image_data, tool_results), summary=summary)
+        contents = self.history.contents()
+        self.last_usage = self.history.stats()
+        return contents
+
+    def _end_turn(self, parts, response):
+        self.history.add_model(parts or ["[no reply]"])
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.last_usage["prompt_tokens"] = getattr(usage, "prompt_token_count", None)
+            self.last_usage["reply_tokens"] = getattr(usage, "candidates_token_count", None)
+
+    def _generate(self, contents, **kwargs):
+        try:
+            # A stream cannot be hedged: its chunks are consumed as they arrive
+            return self.client.call(self.model.generate_content, contents, hedge=not kwargs.get("stream"), **kwargs)
+        except Exception:
+            # A failed request must not leave a dangling user turn behind
+            self.history.pop()
+            raise
+
+    def send_message(self, message, image_data=None, tool_results=None, summary=None):
+        """Sends a turn and returns the reply text.
 
-        response = self.chat.send_message(content)
-        return response.text
+        summary is a short text description of the scene; it stands in for
+        the screenshot once the history prunes it.
+        """
+        response = self._generate(self._begin_turn(message, image_data, tool_results, summary))
+        text = response.text
+        self._end_turn([text] if text else [], response)
+        return text
+
+    def send_message_with_tools(self, message, image_data=None, tool_results=None, summary=None):
+        """Sends a turn offering the tools routed for it; returns (text, commands)."""
+        declarations = self.schemas.declarations(self.schemas.route(message))
+        response = self._generate(
+            self._begin_turn(message, image_data, tool_results, summary),
+            tools=[{"function_declarations": declarations}],
+        )
+        text, commands = self.parse_function_calls(response)
+        self._end_turn(self._model_parts(text, commands), response)
+        return text, commands
+
+    def _model_parts(self, text, commands):
+        parts = [text] if text else []
+        if self.function_calling:
+            parts.extend({"function_call": {"name": cmd["tool"], "args": cmd["args"]}} for cmd in commands)
+        return parts
+
+    def _cache_key(self, message, fingerprint):
+        if self.cache is None or not fingerprint:
+            return None
+        return self.cache.key(self.model_name, message, fingerprint, "functions" if self.function_calling else "text")
+
+    def cached_reply(self, message, fingerprint, image_data=None, tool_results=None, summary=None):
+        """Returns {"text", "commands"} for a prompt already answered in this scene state, or None.
+
+        A hit is recorded in the history as if the model had replied, so the
+        conversation stays consistent for the next live turn.
+        """
+        key = self._cache_key(message, fingerprint)
+        entry = self.cache.get(key) if key else None
+        if entry is None:
+            return None
+        self.history.add_user(self.build_content(message, image_data, tool_results), summary=summary)
+        self.history.add_model(self._model_parts(entry["text"], entry["commands"]) or ["[no reply]"])
+        self.last_usage = self.history.stats()
+        self.last_usage["cache"] = self.cache.stats()
+        self.last_usage["cached"] = True
+        return entry
+
+    def cache_reply(self, message, fingerprint, text, commands):
+        """Stores a live reply and the commands parsed from it for later replay."""
+        key = self._cache_key(message, fingerprint)
+        if key is None:
+            return
+        self.cache.put(key, text, commands)
+        self.last_usage["cache"] = self.cache.stats()
+
+    def parse_function_calls(self, response):
+        """Splits a response into its text and {"tool", "args"} commands."""
+        texts = []
+        commands = []
+        for candidate in response.candidates[:1]:
+            for part in candidate.content.parts:
+                call = getattr(part, "function_call", None)
+                if call is not None and call.name:
+                    commands.append({"tool": call.name, "args": _plain(call.args)})
+                elif getattr(part, "text", ""):
+                    texts.append(part.text)
+        return "".join(texts), commands
+
+    def send_message_stream(self, message, image_data=None, tool_results=None, summary=None):
+        """Yields the reply text chunk by chunk as the model generates it."""
+        response = self._generate(self._begin_turn(message, image_data, tool_results, summary), stream=True)
+        texts = []
+        try:
+            for chunk in response:
+                if self.client.cancelled:
+                    # Keep what arrived; commands from it may already be running
+                    self.last_usage["cancelled"] = True
+                    break
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. finish or safety metadata)
+                    continue
+                if text:
+                    texts.append(text)
+                    yield text
+        except Exception:
+            self.history.pop()
+            raise
+        self._end_turn(["".join(texts)] if texts else [], response)
+
+    def cancel(self):
+        """Cancels the request in flight; safe to call from any thread."""
+        return self.client.cancel()
+
+    def close(self):
+        self.client.close()
+        if self.cache is not None:
+            self.cache.flush()
+
+    def format_tool_results(self, tool_results):
+        """Summarises executed commands so the model sees their outcome without asking."""
+        lines = ["Results of your previous commands:"]
+        for entry in tool_results:
+            result = entry["result"]
+            if isinstance(result, dict) and "image_data" in result:
+                # Screenshots already travel as the attached image
+                result = {k: v for k, v in result.items() if k != "image_data"}
+            lines.append(json.dumps({"tool": entry["tool"], "result": result}, default=str))
+        return "\n".join(lines)
+
+    def format_function_responses(self, tool_results):
+        parts = []
+        for entry in tool_results:
+            result = entry["result"]
+            if isinstance(result, dict) and "image_data" in result:
+                result = {k: v for k, v in result.items() if k != "image_data"}
+            # Responses must be JSON objects
+            result = json.loads(json.dumps(result if isinstance(result, dict) else {"result": result}, default=str))
+            parts.append({"function_response": {"name": entry["tool"], "response": result}})
+        return parts
 
     def extract_commands(self, text):
-        pattern = r"<blender_cmd>(.*?)</blender_cmd>"
-        commands = re.findall(pattern, text, re.DOTALL)
-        parsed_commands = []
-        for cmd_str in commands:
-            try:
-                parsed_commands.append(json.loads(cmd_str.strip()))
-            except json.JSONDecodeError:
-                print(f"Failed to parse command: {cmd_str}")
-        return parsed_commands
+        """Returns the commands in a complete reply; parser.extract_commands also returns the errors."""
+        return extract_commands(text)[0]
 
     @staticmethod
     def list_available_models(api_key):
+        """Lists chat models over the network; ModelCatalog caches this for the UI."""
         try:
-            genai.configure(api_key=api_key)
-            models = genai.list_models()
-            available = []
-            for m in models:
-                if 'generateContent' in m.supported_generation_methods:
-                    available.append({
-                        "name": m.name.split('/')[-1],
-                        "display_name": m.display_name
-                    })
-            return available
+            return [
+                {"name": m["name"], "display_name": m["display_name"]}
+                for m in list_models_sdk(api_key) if 'generateContent' in m["methods"]
+            ]
         except Exception as e:
             print(f"Error listing models: {e}")
             return []
+
+def _plain(value):
+    """Converts function-call arguments (proto maps and lists) to plain Python values."""
+    if hasattr(value, "items"):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (str, bytes)):
+        return value
+    if hasattr(value, "__iter__"):
+        return [_plain(item) for item in value]
+    return value
@@ -0,0 +1,157 @@
+import json
+import re
+
+# Rough token costs used to enforce the budget before the API counts for us
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 258
+
+RESULTS_HEADER = "Results of your previous commands:"
+
+_CMD_BLOCK_RE = re.compile(r"\s*<blender_cmd>(.*?)(?:</blender_cmd>|$)", re.DOTALL)
+_TOOL_RE = re.compile(r"""["']tool["']\s*:\s*["']([A-Za-z0-9_]+)""")
+
+def _is_image(part):
+    return isinstance(part, dict) and "mime_type" in part
+
+def _part_tokens(part):
+    if isinstance(part, str):
+        return len(part) // CHARS_PER_TOKEN + 1
+    if _is_image(part):
+        return IMAGE_TOKENS
+    if isinstance(part, dict) and "text" in part:
+        return len(part["text"]) // CHARS_PER_TOKEN + 1
+    return len(json.dumps(part, default=str)) // CHARS_PER_TOKEN + 1
+
+def _part_bytes(part):
+    if isinstance(part, str):
+        return len(part.encode("utf-8"))
+    if _is_image(part):
+        return len(part["data"])
+    return len(json.dumps(part, default=str).encode("utf-8"))
+
+def _count_tools(names):
+    counts = {}
+    for name in names:
+        counts[name] = counts.get(name, 0) + 1
+    return ", ".join(f"{name} x{n}" if n > 1 else name for name, n in counts.items())
+
+def _collapse_text(text):
+    """Shortens old model text and tool-result chatter to one line each."""
+    if text.startswith(RESULTS_HEADER):
+        results = [json.loads(line) for line in text.split("\n")[1:] if line.startswith("{")]
+        errors = sum(1 for r in results if isinstance(r.get("result"), dict) and r["result"].get("status") == "error")
+        return f"[{len(results)} earlier command results, {errors} errors]"
+    tools = [m.group(1) for block in _CMD_BLOCK_RE.finditer(text) for m in [_TOOL_RE.search(block.group(1))] if m]
+    if not tools and "<blender_cmd>" not in text:
+        return text
+    prose = _CMD_BLOCK_RE.sub("", text).strip()
+    return f"{prose}\n[ran: {_count_tools(tools)}]" if prose else f"[ran: {_count_tools(tools)}]"
+
+class ChatHistory:
+    """Conversation kept as a list of {"role", "parts"} turns and sent whole each turn.
+
+    Before each send the history is compacted in place: only the newest
+    `max_images` screenshots are kept (older ones become their text summary),
+    turns older than `keep_turns` exchanges have their command blocks and
+    tool results collapsed to one-line notes, and the oldest exchanges are
+    dropped while the estimate exceeds `token_budget`.
+    """
+
+    def __init__(self, max_images=2, keep_turns=4, token_budget=32000):
+        self.max_images = max_images
+        self.keep_turns = keep_turns
+        self.token_budget = token_budget
+        self.turns = []
+        self.dropped = 0
+
+    def add_user(self, parts, summary=None):
+        self.turns.append({"role": "user", "parts": list(parts), "summary": summary})
+
+    def add_model(self, parts):
+        self.turns.append({"role": "model", "parts": list(parts)})
+
+    def pop(self):
+        """Removes the last turn, e.g. a user turn whose request failed."""
+        return self.turns.pop() if self.turns else None
+
+    def contents(self):
+        """Compacts, then returns the turns in the form generate_content takes."""
+        self.compact()
+        return [{"role": turn["role"], "parts": turn["parts"]} for turn in self.turns]
+
+    def estimate_tokens(self):
+        return sum(_part_tokens(part) for turn in self.turns for part in turn["parts"])
+
+    def stats(self):
+        parts = [part for turn in self.turns for part in turn["parts"]]
+        return {
+            "turns": len(self.turns),
+            "images": sum(1 for part in parts if _is_image(part)),
+            "bytes": sum(_part_bytes(part) for part in parts),
+            "tokens_estimate": sum(_part_tokens(part) for part in parts),
+            "dropped_turns": self.dropped,
+        }
+
+    def compact(self):
+        self._prune_images()
+        self._collapse_old_turns()
+        while self.estimate_tokens() > self.token_budget and len(self.turns) > 2:
+            # Drop a whole exchange so the history still starts with a user turn
+            del self.turns[:2]
+            self.dropped += 2
+        self._unpair_orphans()
+
+    def _prune_images(self):
+        seen = 0
+        for turn in reversed(self.turns):
+            for i, part in enumerate(turn["parts"]):
+                if not _is_image(part):
+                    continue
+                seen += 1
+                if seen > self.max_images:
+                    summary = turn.get("summary") or "no summary"
+                    turn["parts"][i] = f"[Earlier screenshot omitted. Scene then: {summary}]"
+
+    def _collapse_old_turns(self):
+        cutoff = len(self.turns) - 2 * self.keep_turns
+        for turn in self.turns[:max(cutoff, 0)]:
+            if turn.get("collapsed"):
+                continue
+            parts = []
+            calls = []
+            responses = []
+            for part in turn["parts"]:
+                if isinstance(part, str):
+                    parts.append(_collapse_text(part))
+                elif isinstance(part, dict) and "text" in part:
+                    parts.append(_collapse_text(part["text"]))
+                elif isinstance(part, dict) and "function_call" in part:
+                    calls.append(part["function_call"]["name"])
+                elif isinstance(part, dict) and "function_response" in part:
+                    responses.append(part["function_response"])
+                else:
+                    parts.append(part)
+            if calls:
+                parts.append(f"[called: {_count_tools(calls)}]")
+            if responses:
+                parts.insert(0, _responses_note(responses))
+            turn["parts"] = parts or ["[empty]"]
+            turn["collapsed"] = True
+
+    def _unpair_orphans(self):
+        # Function responses must answer calls in the turn right before them
+        for i, turn in enumerate(self.turns):
+            if turn["role"] != "user":
+                continue
+            responses = [p["function_response"] for p in turn["parts"] if isinstance(p, dict) and "function_response" in p]
+            if not responses:
+                continue
+            previous = self.turns[i - 1]["parts"] if i > 0 else []
+            if any(isinstance(p, dict) and "function_call" in p for p in previous):
+                continue
+            parts = [p for p in turn["parts"] if not (isinstance(p, dict) and "function_response" in p)]
+            turn["parts"] = [_responses_note(responses)] + parts
+
+def _responses_note(responses):
+    errors = sum(1 for r in responses if isinstance(r.get("response"), dict) and r["response"].get("status") == "error")
+    return f"[{len(responses)} earlier function results, {errors} errors]"
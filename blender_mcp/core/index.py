@@ -0,0 +1,249 @@
+import bpy
+import threading
+
+# Object data types whose updates are mapped back to the objects using them
+DATA_ID_TYPES = {'MESH', 'CURVE', 'CURVES', 'LIGHT', 'CAMERA', 'LATTICE', 'ARMATURE', 'META', 'FONT',
+                 'GREASEPENCIL', 'POINTCLOUD', 'VOLUME'}
+
+# Below this many objects a stale index is not rebuilt for one query; a scan is cheaper
+REBUILD_MIN_OBJECTS = 256
+
+_active = None
+
+def active_index():
+    """The SceneIndex of the running engine, or None; tools fall back to scanning without one."""
+    return _active
+
+def set_active_index(index):
+    global _active
+    _active = index
+
+class SceneIndex:
+    """Object names indexed by type, collection, material, parent and object data.
+
+    Fed by the depsgraph hub: each update re-indexes only the objects it
+    names (or the objects using an updated mesh, light, ...). Linking and
+    unlinking are reconciled by session_uid and by re-reading the updated
+    collections; undo and file loads mark the index stale and it is rebuilt
+    on the next query. Lookups intersect the smallest sets first, so a query
+    costs about as much as its result rather than the scene.
+
+    `flush`, when set, is called before every query so that edits Blender
+    has not evaluated yet reach on_update first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stale = True
+        self._records = {}
+        # session_uid -> name, to follow renames
+        self._names = {}
+        self.by_type = {}
+        self.by_collection = {}
+        self.by_material = {}
+        self.by_parent = {}
+        self.by_data = {}
+        # Linked or unlinked objects, and the collections whose members changed
+        self._reconcile = False
+        self._collections = {}
+        self.flush = None
+        self.rebuilds = 0
+
+    def _add(self, bucket, key, name):
+        if key is not None:
+            bucket.setdefault(key, set()).add(name)
+
+    def _discard(self, bucket, key, name):
+        names = bucket.get(key)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del bucket[key]
+
+    def _insert(self, obj):
+        record = {
+            "type": obj.type,
+            "collections": [c.name for c in obj.users_collection],
+            "materials": sorted({slot.material.name for slot in obj.material_slots if slot.material}),
+            "parent": obj.parent.name if obj.parent else None,
+            "data": obj.data.name if obj.data is not None else None,
+        }
+        name = obj.name
+        record["uid"] = obj.session_uid
+        self._records[name] = record
+        self._names[obj.session_uid] = name
+        self._add(self.by_type, record["type"], name)
+        for coll in record["collections"]:
+            self._add(self.by_collection, coll, name)
+        for mat in record["materials"]:
+            self._add(self.by_material, mat, name)
+        self._add(self.by_parent, record["parent"], name)
+        self._add(self.by_data, record["data"], name)
+
+    def _remove(self, name):
+        record = self._records.pop(name, None)
+        if record is None:
+            return
+        self._names.pop(record["uid"], None)
+        self._discard(self.by_type, record["type"], name)
+        for coll in record["collections"]:
+            self._discard(self.by_collection, coll, name)
+        for mat in record["materials"]:
+            self._discard(self.by_material, mat, name)
+        self._discard(self.by_parent, record["parent"], name)
+        self._discard(self.by_data, record["data"], name)
+
+    def rebuild(self):
+        with self._lock:
+            self._records = {}
+            self._names = {}
+            self.by_type, self.by_collection, self.by_material, self.by_parent, self.by_data = {}, {}, {}, {}, {}
+            for obj in bpy.data.objects:
+                self._insert(obj)
+            self._stale = False
+            self._reconcile = False
+            self._collections = {}
+            self.rebuilds += 1
+
+    def invalidate(self):
+        self._stale = True
+
+    def serves(self):
+        """Whether a query should go through the index rather than scan bpy.data.objects.
+
+        True while the index is current, or when the scene is big enough
+        that rebuilding it beats scanning.
+        """
+        return not self._stale or len(bpy.data.objects) >= REBUILD_MIN_OBJECTS
+
+    def on_update(self, scene, depsgraph):
+        """Depsgraph listener: re-indexes the updated objects, or marks the index stale."""
+        if depsgraph is None:
+            self._stale = True
+            return
+        if self._stale:
+            # Not built since the last load or undo; the rebuild reads everything
+            return
+        with self._lock:
+            for update in depsgraph.updates:
+                original = getattr(update.id, "original", update.id)
+                id_type = getattr(original, "id_type", None)
+                if id_type == 'OBJECT':
+                    self._reindex(original)
+                elif id_type in DATA_ID_TYPES:
+                    # Material slots live on the data; refresh every object using it
+                    for name in list(self.by_data.get(original.name, ())):
+                        obj = bpy.data.objects.get(name)
+                        if obj is not None:
+                            self._reindex(obj)
+                elif id_type in ('SCENE', 'COLLECTION'):
+                    self._reconcile = True
+                    # A scene update stands for its master collection
+                    coll = original if id_type == 'COLLECTION' else getattr(original, "collection", None)
+                    if coll is not None:
+                        self._collections[coll.name] = coll
+
+    def _reindex(self, obj):
+        # A renamed object is still filed under its old name
+        old_name = self._names.get(obj.session_uid)
+        if old_name is not None and old_name != obj.name:
+            self._remove(old_name)
+        self._remove(obj.name)
+        self._insert(obj)
+
+    def _sync_membership(self):
+        current = {obj.session_uid: obj for obj in bpy.data.objects}
+        for uid in [uid for uid in self._names if uid not in current]:
+            self._remove(self._names[uid])
+        for uid, obj in current.items():
+            if uid not in self._names:
+                self._insert(obj)
+        # Objects moved between collections are the ones a collection gained or lost
+        collections, self._collections = self._collections, {}
+        for name, coll in collections.items():
+            members = {obj.name for obj in coll.objects}
+            for obj_name in members ^ self.by_collection.get(name, set()):
+                obj = bpy.data.objects.get(obj_name)
+                if obj is not None:
+                    self._reindex(obj)
+        self._reconcile = False
+
+    def ensure(self):
+        if self.flush is not None:
+            self.flush()
+        if self._stale:
+            self.rebuild()
+        elif self._reconcile:
+            with self._lock:
+                self._sync_membership()
+
+    def record(self, name):
+        self.ensure()
+        return self._records.get(name)
+
+    def __len__(self):
+        self.ensure()
+        return len(self._records)
+
+    def names(self):
+        self.ensure()
+        return list(self._records)
+
+    def query(self, type=None, collection=None, material=None, parent=None, data=None, shared_data=None):
+        """Sorted names of objects matching every given criterion.
+
+        collection includes its child collections; shared_data=True keeps
+        objects whose data is used by other objects too (instances).
+        """
+        self.ensure()
+        with self._lock:
+            sets = []
+            if type:
+                types = [type] if isinstance(type, str) else type
+                sets.append(set().union(*(self.by_type.get(t.upper(), ()) for t in types)))
+            if collection:
+                sets.append(self._collection_members(collection))
+            if material:
+                sets.append(self.by_material.get(material, set()))
+            if parent:
+                sets.append(self.by_parent.get(parent, set()))
+            if data:
+                sets.append(self.by_data.get(data, set()))
+            if not sets:
+                result = set(self._records)
+            else:
+                sets.sort(key=len)
+                result = set(sets[0])
+                for other in sets[1:]:
+                    result &= other
+                    if not result:
+                        break
+            if shared_data is not None:
+                result = {n for n in result
+                          if (len(self.by_data.get(self._records[n]["data"], ())) > 1) == shared_data}
+        return sorted(result)
+
+    def users(self, data_name):
+        """How many objects use a data-block."""
+        self.ensure()
+        return len(self.by_data.get(data_name, ()))
+
+    def _collection_members(self, name):
+        coll = bpy.data.collections.get(name)
+        names = [name]
+        if coll is not None:
+            names += [child.name for child in coll.children_recursive]
+        members = set()
+        for coll_name in names:
+            members |= self.by_collection.get(coll_name, set())
+        return members
+
+    def stats(self):
+        return {
+            "objects": len(self._records),
+            "types": {t: len(n) for t, n in self.by_type.items()},
+            "collections": len(self.by_collection),
+            "materials": len(self.by_material),
+            "rebuilds": self.rebuilds,
+            "stale": self._stale,
+        }
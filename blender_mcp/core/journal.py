@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from .optimizer import optimize_commands
+
+# Tools that only read the scene; they are dropped when a journal is compacted
+READ_ONLY_TOOLS = {
+    "get_scene_info", "get_screenshot", "request_feedback", "get_render_info",
+    "audit_scene", "get_object_dimensions", "get_constraints_info", "get_selected_objects",
+    "get_active_object", "get_mode", "get_sculpt_stats", "list_assets", "get_engine_metrics",
+    "get_scene_delta", "find_objects", "find_nearby", "find_nearest", "ray_cast", "find_in_box",
+    "find_free_space",
+}
+
+# Tools that drive other commands; their inner commands are journaled instead
+NOT_JOURNALED = {"replay_journal"}
+
+def read_journal(path):
+    """Yields journal entries, skipping a torn last line from an interrupted write."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping corrupt journal line: {line[:80]}")
+
+class CommandJournal:
+    """Append-only, line-delimited JSON log of executed commands.
+
+    Every `compact_every` appends the file is rewritten without read-only
+    commands, failed commands and writes that later commands overwrite.
+    """
+
+    def __init__(self, path, compact_every=1000):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._since_compact = 0
+        self._seq = 0
+        if os.path.exists(path):
+            for entry in read_journal(path):
+                self._seq = max(self._seq, entry.get("seq", 0))
+        self._file = open(path, "a")
+
+    def append(self, tool, args, result):
+        if tool in NOT_JOURNALED:
+            return
+        if isinstance(result, dict) and "image_data" in result:
+            result = {k: v for k, v in result.items() if k != "image_data"}
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "time": time.time(), "tool": tool, "args": args or {}, "result": result}
+            self._file.write(json.dumps(entry, default=str) + "\n")
+            self._file.flush()
+            self._since_compact += 1
+            if self.compact_every and self._since_compact >= self.compact_every:
+                self._compact_locked()
+
+    def compact(self):
+        with self._lock:
+            return self._compact_locked()
+
+    def _compact_locked(self):
+        self._file.close()
+        all_entries = list(read_journal(self.path))
+        entries = [
+            e for e in all_entries
+            if e.get("tool") not in READ_ONLY_TOOLS
+            and not (isinstance(e.get("result"), dict) and e["result"].get("status") == "error")
+        ]
+        plan, _ = optimize_commands(entries)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for cmd, origins in plan:
+                entry = dict(entries[origins[-1]])
+                entry["args"] = cmd.get("args") or {}
+                f.write(json.dumps(entry, default=str) + "\n")
+        os.replace(tmp_path, self.path)
+
+        self._file = open(self.path, "a")
+        self._since_compact = 0
+        return {"before": len(all_entries), "after": len(plan)}
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def replay_journal(engine, path, batch_size=500):
+    """Re-executes a journal against the current scene in batches."""
+    entries = [{"tool": e["tool"], "args": e.get("args") or {}} for e in read_journal(path)]
+    start = time.perf_counter()
+    errors = 0
+    batches = 0
+    for i in range(0, len(entries), batch_size):
+        batch = engine.execute_batch(entries[i:i + batch_size], undo_message=None)
+        errors += batch["errors"]
+        batches += 1
+    return {
+        "status": "success" if not errors else "error",
+        "commands": len(entries),
+        "batches": batches,
+        "errors": errors,
+        "elapsed": time.perf_counter() - start,
+    }
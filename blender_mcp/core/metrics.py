@@ -0,0 +1,140 @@
+import json
+import threading
+from collections import deque
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class _Histogram:
+    def __init__(self, window):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def summary(self):
+        values = sorted(self.recent)
+        return {
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "p99": _percentile(values, 0.99),
+            "max": values[-1] if values else 0.0,
+            "mean": self.total / self.count if self.count else 0.0,
+        }
+
+class _ToolStats:
+    def __init__(self, window):
+        self.calls = 0
+        self.errors = 0
+        self.error_types = {}
+        self.arg_bytes = 0
+        self.max_arg_bytes = 0
+        self.wall = _Histogram(window)
+        self.blocking = _Histogram(window)
+
+class ToolMetrics:
+    """Per-tool call counts, error rates and latency histograms.
+
+    Wall time runs from submission to completion (queue wait included);
+    blocking time is what the tool itself spent on the main thread.
+    Percentiles are computed over the most recent `window` calls.
+    """
+
+    def __init__(self, window=1024):
+        self.window = window
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool, wall, blocking, ok=True, arg_bytes=0, error_type=None):
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats(self.window)
+            stats.calls += 1
+            if not ok:
+                stats.errors += 1
+                if error_type:
+                    stats.error_types[error_type] = stats.error_types.get(error_type, 0) + 1
+            stats.arg_bytes += arg_bytes
+            stats.max_arg_bytes = max(stats.max_arg_bytes, arg_bytes)
+            stats.wall.observe(wall)
+            stats.blocking.observe(blocking)
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+
+    def snapshot(self, tool=None):
+        with self._lock:
+            names = [tool] if tool else sorted(self._tools)
+            report = {}
+            for name in names:
+                stats = self._tools.get(name)
+                if stats is None:
+                    continue
+                report[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "error_rate": stats.errors / stats.calls,
+                    "error_types": dict(stats.error_types),
+                    "avg_arg_bytes": stats.arg_bytes / stats.calls,
+                    "max_arg_bytes": stats.max_arg_bytes,
+                    "wall": stats.wall.summary(),
+                    "blocking": stats.blocking.summary(),
+                }
+            return report
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="blender_mcp_tool"):
+        lines = []
+        with self._lock:
+            items = sorted(self._tools.items())
+
+            lines.append(f"# TYPE {prefix}_calls_total counter")
+            for name, stats in items:
+                lines.append(f'{prefix}_calls_total{{tool="{name}"}} {stats.calls}')
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for name, stats in items:
+                lines.append(f'{prefix}_errors_total{{tool="{name}"}} {stats.errors}')
+            lines.append(f"# TYPE {prefix}_arg_bytes_total counter")
+            for name, stats in items:
+                lines.append(f'{prefix}_arg_bytes_total{{tool="{name}"}} {stats.arg_bytes}')
+
+            for kind in ("wall", "blocking"):
+                metric = f"{prefix}_{kind}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for name, stats in items:
+                    hist = getattr(stats, kind)
+                    cumulative = 0
+                    for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{tool="{name}",le="+Inf"}} {hist.count}')
+                    lines.append(f'{metric}_sum{{tool="{name}"}} {hist.total}')
+                    lines.append(f'{metric}_count{{tool="{name}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, format="json"):
+        text = self.to_prometheus() if format == "prometheus" else self.to_json()
+        with open(path, "w") as f:
+            f.write(text)
+        return path
@@ -0,0 +1,127 @@
+# Declared effects of tools that only write the properties named by their
+# arguments and read nothing else. Only these tools are ever merged or dropped;
+# any other tool is treated as a barrier that may observe the scene.
+#
+#   overwrite: a later call with the same target replaces the earlier one entirely
+#   merge:     a later call with the same target overrides the earlier one per argument
+#   create / delete: object lifetime, keyed by the name argument
+#
+# set_render_samples and set_denoising are left out on purpose: what they write
+# depends on the current render engine, so they also read the scene.
+TOOL_EFFECTS = {
+    "transform_object": {"kind": "merge", "target": "name"},
+    "hide_object": {"kind": "overwrite", "target": "name"},
+    "set_display_color": {"kind": "overwrite", "target": "name"},
+    "set_draw_type": {"kind": "overwrite", "target": "name"},
+    "set_object_pass_index": {"kind": "overwrite", "target": "name"},
+    "set_light_property": {"kind": "overwrite", "target": "name"},
+    "set_viewport_shading": {"kind": "overwrite"},
+    "toggle_overlays": {"kind": "overwrite"},
+    "set_render_engine": {"kind": "overwrite"},
+    "set_resolution": {"kind": "overwrite"},
+    "set_current_frame": {"kind": "overwrite"},
+    "set_background_transparent": {"kind": "overwrite"},
+    "create_primitive": {"kind": "create", "target": "name"},
+    "delete_object": {"kind": "delete", "target": "name"},
+}
+
+def optimize_commands(commands, object_exists=None):
+    """Removes redundant commands from a parsed command list.
+
+    Returns (plan, report). plan is a list of (command, origins) pairs, where
+    origins lists the indices of the input commands the planned command stands
+    for. report has "removed" (index -> reason) and "merged" (index -> index
+    it was folded into).
+
+    A create_primitive/delete_object pair on the same name is only dropped when
+    object_exists is given and says the name is free, since otherwise the new
+    object would be renamed and the delete would hit the existing one.
+    """
+    out = []
+    removed = {}
+    merged = {}
+    pending = {}
+    by_target = {}
+    created = {}
+    created_names = set()
+    seen_barrier = False
+
+    def drop(pos, reason):
+        for origin in out[pos][1]:
+            removed[origin] = reason
+            merged.pop(origin, None)
+        out[pos] = None
+
+    def forget(target):
+        for key in [k for k in pending if k[1] == target]:
+            del pending[key]
+        by_target.pop(target, None)
+        created.pop(target, None)
+
+    for i, cmd in enumerate(commands):
+        tool = cmd.get('tool')
+        args = cmd.get('args') or {}
+        effect = TOOL_EFFECTS.get(tool)
+
+        if effect is None:
+            pending.clear()
+            by_target.clear()
+            created.clear()
+            seen_barrier = True
+            out.append((cmd, [i]))
+            continue
+
+        kind = effect["kind"]
+        target = args.get(effect["target"]) if "target" in effect else None
+
+        if kind == "create":
+            if target is not None:
+                forget(target)
+                eligible = (not seen_barrier and target not in created_names
+                            and object_exists is not None and not object_exists(target))
+                created_names.add(target)
+                out.append((cmd, [i]))
+                if eligible:
+                    created[target] = len(out) - 1
+            else:
+                out.append((cmd, [i]))
+            continue
+
+        if kind == "delete":
+            writes = [p for p in by_target.get(target, []) if out[p] is not None]
+            if target in created:
+                reason = f"'{target}' is created and deleted in the same batch"
+                drop(created[target], reason)
+                for pos in writes:
+                    drop(pos, reason)
+                removed[i] = reason
+            else:
+                for pos in writes:
+                    drop(pos, f"overwritten by delete_object at command {i}")
+                out.append((cmd, [i]))
+            forget(target)
+            continue
+
+        key = (tool, target)
+        prev = pending.get(key)
+        origins = [i]
+        if prev is not None and out[prev] is not None:
+            prev_cmd, prev_origins = out[prev]
+            if kind == "merge":
+                merged_args = {k: v for k, v in (prev_cmd.get('args') or {}).items() if v is not None}
+                merged_args.update({k: v for k, v in args.items() if v is not None})
+                cmd = {"tool": tool, "args": merged_args}
+                origins = prev_origins + [i]
+                for origin in prev_origins:
+                    merged[origin] = i
+                out[prev] = None
+            else:
+                drop(prev, f"overwritten by command {i}")
+
+        out.append((cmd, origins))
+        pending[key] = len(out) - 1
+        if target is not None:
+            by_target.setdefault(target, []).append(len(out) - 1)
+
+    plan = [entry for entry in out if entry is not None]
+    return plan, {"removed": removed, "merged": merged}
@@ -0,0 +1,176 @@
+import json
+
+OPEN_TAG = "<blender_cmd>"
+CLOSE_TAG = "</blender_cmd>"
+
+_TEXT = 0
+_BODY = 1
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+class CommandStream:
+    """Resumable parser for <blender_cmd> blocks in a reply that arrives in fragments.
+
+    A two-state machine (outside a block / inside one) scans each fragment
+    once; only a tail shorter than a tag is carried between fragments, so
+    work is linear in the reply size however it is split. feed() returns the
+    commands whose closing tag arrived with that fragment. Blocks that are
+    not valid JSON get a repair pass for common model glitches (code fences,
+    single quotes, trailing commas, Python literals); anything still broken
+    is recorded in `errors` instead of being dropped silently.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._state = _TEXT
+        self._carry = ""
+        self._offset = 0
+        self._body = []
+        self._body_start = 0
+        self.errors = []
+        self.repaired = 0
+
+    @property
+    def text(self):
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, fragment):
+        self._chunks.append(fragment)
+        data = self._carry + fragment
+        base = self._offset - len(self._carry)
+        self._offset += len(fragment)
+        self._carry = ""
+        commands = []
+        pos = 0
+        while True:
+            if self._state == _TEXT:
+                start = data.find(OPEN_TAG, pos)
+                if start == -1:
+                    # Keep a tail that could be the start of a split opening tag
+                    self._carry = data[max(pos, len(data) - len(OPEN_TAG) + 1):]
+                    break
+                pos = start + len(OPEN_TAG)
+                self._body_start = base + pos
+                self._state = _BODY
+            else:
+                end = data.find(CLOSE_TAG, pos)
+                if end == -1:
+                    keep = max(pos, len(data) - len(CLOSE_TAG) + 1)
+                    self._body.append(data[pos:keep])
+                    self._carry = data[keep:]
+                    break
+                self._body.append(data[pos:end])
+                self._finish_block(commands)
+                pos = end + len(CLOSE_TAG)
+        return commands
+
+    def close(self):
+        """Ends the stream; a block the model never closed is parsed if possible."""
+        commands = []
+        if self._state == _BODY:
+            self._body.append(self._carry)
+            self._finish_block(commands, unterminated=True)
+        self._carry = ""
+        return commands
+
+    def parse(self, text):
+        """Parses a complete reply in one go."""
+        return self.feed(text) + self.close()
+
+    def _finish_block(self, commands, unterminated=False):
+        body = "".join(self._body)
+        start = self._body_start
+        self._body = []
+        self._state = _TEXT
+        # An opening tag inside a block means the previous block was never closed
+        while True:
+            nested = body.find(OPEN_TAG)
+            if nested == -1:
+                break
+            self._parse_block(body[:nested], start, commands, unterminated=True)
+            start += nested + len(OPEN_TAG)
+            body = body[nested + len(OPEN_TAG):]
+        self._parse_block(body, start, commands, unterminated=unterminated)
+
+    def _parse_block(self, body, offset, commands, unterminated=False):
+        body = body.strip()
+        if not body:
+            if not unterminated:
+                self.errors.append({"offset": offset, "message": "Empty command block", "snippet": ""})
+            return
+        try:
+            parsed = json.loads(body)
+        except json.JSONDecodeError as e:
+            try:
+                parsed = json.loads(repair_json(body))
+                self.repaired += 1
+            except json.JSONDecodeError:
+                reason = "Unterminated command block" if unterminated else f"Invalid JSON: {e.msg}"
+                self.errors.append({"offset": offset, "message": reason, "snippet": body[:80]})
+                return
+
+        # Some replies put several commands in one block as a list
+        for item in parsed if isinstance(parsed, list) else [parsed]:
+            if isinstance(item, dict) and isinstance(item.get("tool"), str):
+                commands.append(item)
+            else:
+                self.errors.append({"offset": offset, "message": "Block is not a {\"tool\", \"args\"} command",
+                                    "snippet": body[:80]})
+
+def repair_json(text):
+    """Rewrites near-JSON as emitted by models into JSON.
+
+    Drops markdown code fences, turns single-quoted strings into double-quoted
+    ones, maps True/False/None to JSON literals and removes trailing commas.
+    """
+    lines = [line for line in text.splitlines() if not line.lstrip().startswith("```")]
+    text = "\n".join(lines)
+    out = []
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '"' or ch == "'":
+            # Copy a string, re-quoting single-quoted ones
+            quote = ch
+            out.append('"')
+            i += 1
+            while i < n and text[i] != quote:
+                if text[i] == "\\" and i + 1 < n:
+                    if quote == "'" and text[i + 1] == "'":
+                        out.append("'")
+                    else:
+                        out.append(text[i:i + 2])
+                    i += 2
+                    continue
+                out.append('\\"' if text[i] == '"' else text[i])
+                i += 1
+            out.append('"')
+            i += 1
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in "}]":
+                i = j
+            else:
+                out.append(ch)
+                i += 1
+        elif ch.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_LITERALS.get(word, word))
+            i = j
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+def extract_commands(text):
+    """Returns (commands, errors) for a complete reply."""
+    stream = CommandStream()
+    commands = stream.parse(text)
+    return commands, stream.errors
@@ -0,0 +1,181 @@
+import bpy
+import functools
+import math
+
+# Object names Blender's own Add menu gives each primitive
+DEFAULT_NAMES = {
+    "CUBE": "Cube", "SPHERE": "Sphere", "PLANE": "Plane", "CYLINDER": "Cylinder", "CONE": "Cone",
+    "ICOSPHERE": "Icosphere", "TORUS": "Torus", "MONKEY": "Suzanne",
+}
+
+PRIMITIVE_TYPES = tuple(DEFAULT_NAMES)
+
+@functools.lru_cache(maxsize=None)
+def torus_geometry(major_radius=1.0, minor_radius=0.25, major_segments=48, minor_segments=12):
+    """(vertices, faces) of a torus around the Z axis, laid out like Blender's.
+
+    Cached, so templates rebuilt after a file load skip the trigonometry.
+    """
+    verts = []
+    for i in range(major_segments):
+        angle = 2 * math.pi * i / major_segments
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        for j in range(minor_segments):
+            tube = 2 * math.pi * j / minor_segments
+            radius = major_radius + minor_radius * math.cos(tube)
+            verts.append((radius * cos_a, radius * sin_a, minor_radius * math.sin(tube)))
+    faces = []
+    for i in range(major_segments):
+        ring, next_ring = i * minor_segments, (i + 1) % major_segments * minor_segments
+        for j in range(minor_segments):
+            k = (j + 1) % minor_segments
+            faces.append((ring + j, next_ring + j, next_ring + k, ring + k))
+    return verts, faces
+
+@functools.lru_cache(maxsize=None)
+def torus_uvs(major_segments=48, minor_segments=12):
+    """Flat per-loop UV coordinates matching torus_geometry's faces, seams on both rings."""
+    uvs = []
+    for i in range(major_segments):
+        u0, u1 = i / major_segments, (i + 1) / major_segments
+        for j in range(minor_segments):
+            v0, v1 = j / minor_segments, (j + 1) / minor_segments
+            uvs.extend((u0, v0, u1, v0, u1, v1, u0, v1))
+    return uvs
+
+def build_geometry(mesh, kind, subdivisions=2):
+    """Fills an empty mesh with a primitive at Blender's default size (2 units across)."""
+    if kind == "TORUS":
+        verts, faces = torus_geometry()
+        mesh.from_pydata(verts, [], faces)
+        mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", torus_uvs())
+        mesh.update()
+        return
+    import bmesh
+    bm = bmesh.new()
+    try:
+        # The Add menu operators give every primitive a UV map; calc_uvs fills this layer
+        bm.loops.layers.uv.new("UVMap")
+        if kind == "CUBE":
+            bmesh.ops.create_cube(bm, size=2.0, calc_uvs=True)
+        elif kind == "SPHERE":
+            bmesh.ops.create_uvsphere(bm, u_segments=32, v_segments=16, radius=1.0, calc_uvs=True)
+        elif kind == "PLANE":
+            bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=1.0, calc_uvs=True)
+        elif kind == "CYLINDER":
+            bmesh.ops.create_cone(bm, cap_ends=True, segments=32, radius1=1.0, radius2=1.0, depth=2.0,
+                                  calc_uvs=True)
+        elif kind == "CONE":
+            bmesh.ops.create_cone(bm, cap_ends=True, segments=32, radius1=1.0, radius2=0.0, depth=2.0,
+                                  calc_uvs=True)
+        elif kind == "ICOSPHERE":
+            bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, radius=1.0, calc_uvs=True)
+        elif kind == "MONKEY":
+            bmesh.ops.create_monkey(bm, calc_uvs=True)
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+
+class PrimitiveFactory:
+    """Primitive objects made through the data API from cached template meshes.
+
+    Each primitive kind (and parameter set) is built once into a template
+    mesh kept in bpy.data under a hidden ".template_" name. Objects never
+    use the template itself, since tools edit obj.data in place; each gets
+    a copy, or a bulk call shares one copy between the objects it makes.
+    No operator runs, so creation does not depend on the active context and
+    does not change the selection or trigger a redraw per object.
+
+    Templates have no users and no fake user, and are removed before every
+    save and by release(), so they never end up in the user's .blend file.
+    """
+
+    PREFIX = ".template_"
+
+    def __init__(self):
+        self.built = 0
+        self._save_handler = None
+
+    def _watch_saves(self):
+        if self._save_handler is not None:
+            return
+
+        @bpy.app.handlers.persistent
+        def save_handler(*args):
+            self.clear()
+
+        self._save_handler = save_handler
+        bpy.app.handlers.save_pre.append(save_handler)
+
+    def clear(self):
+        """Removes the template meshes; they are rebuilt on next use."""
+        for mesh in [mesh for mesh in bpy.data.meshes if mesh.name.startswith(self.PREFIX)]:
+            if not mesh.users:
+                bpy.data.meshes.remove(mesh)
+
+    def release(self):
+        """Removes the templates and stops watching for saves."""
+        handler, self._save_handler = self._save_handler, None
+        if handler is not None and handler in bpy.app.handlers.save_pre:
+            bpy.app.handlers.save_pre.remove(handler)
+        self.clear()
+
+    def template(self, kind, subdivisions=2):
+        """The template mesh for a kind, built on first use."""
+        kind = kind.upper()
+        if kind not in DEFAULT_NAMES:
+            raise ValueError(f"Unknown primitive {kind}; available: {', '.join(PRIMITIVE_TYPES)}")
+        name = self.PREFIX + kind.lower() + (f"_{subdivisions}" if kind == "ICOSPHERE" else "")
+        # Looked up by name every time: undo and file loads invalidate held references
+        mesh = bpy.data.meshes.get(name)
+        if mesh is None:
+            mesh = bpy.data.meshes.new(name)
+            build_geometry(mesh, kind, subdivisions=subdivisions)
+            self.built += 1
+            self._watch_saves()
+        return mesh
+
+    def _copy(self, template, name):
+        mesh = template.copy()
+        mesh.name = name
+        return mesh
+
+    def create(self, kind, name=None, location=(0.0, 0.0, 0.0), rotation=None, scale=None, collection=None,
+               subdivisions=2):
+        """One new object; rotation in radians. Linked to `collection` or the active collection."""
+        template = self.template(kind, subdivisions)
+        name = name or DEFAULT_NAMES[kind.upper()]
+        obj = bpy.data.objects.new(name, self._copy(template, name))
+        obj.location = location
+        if rotation is not None:
+            obj.rotation_euler = rotation
+        if scale is not None:
+            obj.scale = scale
+        (collection or bpy.context.collection).objects.link(obj)
+        return obj
+
+    def create_many(self, kind, count, names=None, locations=None, rotations=None, scales=None, shared=True,
+                    collection=None, subdivisions=2):
+        """`count` new objects from per-object rows (rotations in radians); returns them in order.
+
+        shared=True gives all of them one copy of the template, False a copy each.
+        """
+        template = self.template(kind, subdivisions)
+        base = DEFAULT_NAMES[kind.upper()]
+        collection = collection or bpy.context.collection
+        mesh = self._copy(template, base) if shared else None
+        objects = []
+        for i in range(count):
+            name = names[i] if names else base
+            obj = bpy.data.objects.new(name, mesh if shared else self._copy(template, name))
+            if locations is not None:
+                obj.location = locations[i]
+            if rotations is not None:
+                obj.rotation_euler = rotations[i]
+            if scales is not None:
+                obj.scale = scales[i]
+            collection.objects.link(obj)
+            objects.append(obj)
+        return objects
+
+factory = PrimitiveFactory()
@@ -0,0 +1,122 @@
+import bpy
+import fnmatch
+from .index import active_index
+
+try:
+    import numpy as np
+except ImportError:
+    # Bundled with Blender; objects are read one by one without it
+    np = None
+
+# Object properties read for every matched object with one foreach_get
+VECTOR_FIELDS = {"location": "location", "rotation": "rotation_euler", "scale": "scale", "dimensions": "dimensions"}
+
+def _mesh_count(obj, attr):
+    return len(getattr(obj.data, attr)) if obj.type == 'MESH' and obj.data is not None else 0
+
+FIELD_READERS = {
+    "name": lambda obj: obj.name,
+    "type": lambda obj: obj.type,
+    "parent": lambda obj: obj.parent.name if obj.parent else None,
+    "collections": lambda obj: [c.name for c in obj.users_collection],
+    "modifiers": lambda obj: [m.name for m in obj.modifiers],
+    "materials": lambda obj: [slot.material.name for slot in obj.material_slots if slot.material],
+    "vertices": lambda obj: _mesh_count(obj, "vertices"),
+    "polycount": lambda obj: _mesh_count(obj, "polygons"),
+    "hidden": lambda obj: obj.hide_viewport,
+}
+
+# Below this many objects reading each one is cheaper than a foreach_get buffer
+BULK_READ_MIN = 64
+
+def check_fields(fields, default, readers=FIELD_READERS):
+    """Returns the requested field list, or raises ValueError naming the unknown ones."""
+    if not fields:
+        return list(default)
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in readers and f not in VECTOR_FIELDS]
+    if unknown:
+        available = tuple(readers) + tuple(VECTOR_FIELDS)
+        raise ValueError(f"Unknown fields {', '.join(unknown)}; available: {', '.join(available)}")
+    return list(fields)
+
+def match_objects(type=None, collection=None, name=None):
+    """Objects passing every filter, with their indices in bpy.data.objects.
+
+    type is one type or a list (or comma-separated string) of types,
+    collection includes objects in its child collections, and name is a
+    glob such as "Tree_*".
+
+    Type and collection filters are answered from the scene index (when it
+    is current or worth rebuilding) when they keep less than half the scene;
+    indices are then None and vectors are read per object, which beats
+    bulk-reading the whole scene for a few rows.
+    """
+    if isinstance(type, str):
+        type = type.split(",")
+    types = {t.strip().upper() for t in type} if type else None
+    coll = bpy.data.collections.get(collection) if collection else None
+    if collection and coll is None:
+        raise ValueError(f"Collection {collection} not found")
+    index = active_index()
+    if index is not None and (types or collection) and index.serves():
+        names = index.query(type=types and sorted(types), collection=collection)
+        if len(names) * 2 < len(bpy.data.objects):
+            objects = [bpy.data.objects.get(n) for n in names if not name or fnmatch.fnmatchcase(n, name)]
+            return None, [obj for obj in objects if obj is not None]
+    members = None
+    if coll is not None:
+        members = {obj.name for obj in coll.all_objects}
+    indices = []
+    objects = []
+    for i, obj in enumerate(bpy.data.objects):
+        if types is not None and obj.type not in types:
+            continue
+        if members is not None and obj.name not in members:
+            continue
+        if name and not fnmatch.fnmatchcase(obj.name, name):
+            continue
+        indices.append(i)
+        objects.append(obj)
+    return indices, objects
+
+def read_vectors(attr, indices, objects, width=3):
+    """Rows of a float-vector property for the objects at `indices` in bpy.data.objects.
+
+    The whole collection is read into a NumPy array with one foreach_get;
+    `objects` are read one by one when NumPy is missing (a Python buffer is
+    slower than the per-object reads), when indices is None, when the
+    collection is too small for a bulk read to pay off, or when it cannot
+    be bulk-read.
+    """
+    collection = bpy.data.objects
+    count = len(collection)
+    digits = (4,) * width
+    if np is None or indices is None or count < BULK_READ_MIN:
+        return [list(map(round, getattr(obj, attr), digits)) for obj in objects]
+    try:
+        buffer = np.empty(count * width, dtype=np.float32)
+        collection.foreach_get(attr, buffer)
+        return np.round(buffer.reshape(count, width)[indices], 4).tolist()
+    except (AttributeError, TypeError, RuntimeError):
+        return [list(map(round, getattr(obj, attr), digits)) for obj in objects]
+
+def object_rows(fields, indices, objects, readers=FIELD_READERS):
+    """One dict per object holding the requested fields."""
+    columns = {f: read_vectors(VECTOR_FIELDS[f], indices, objects) for f in fields if f in VECTOR_FIELDS}
+    # Built in field order in one pass; vector fields come from their column
+    plan = [(f, readers.get(f), columns.get(f)) for f in fields]
+    return [{f: values[row] if read is None else read(obj) for f, read, values in plan}
+            for row, obj in enumerate(objects)]
+
+def paginate(items, cursor=None, page_size=None):
+    """Returns (page, next_cursor). Cursors are offsets into the filtered list."""
+    try:
+        start = int(cursor) if cursor else 0
+    except ValueError:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    if not page_size or page_size <= 0:
+        return items[start:], None
+    end = start + page_size
+    return items[start:end], str(end) if end < len(items) else None
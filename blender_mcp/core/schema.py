@@ -0,0 +1,186 @@
+import inspect
+import re
+from itertools import zip_longest
+from .validation import ENUM_CHOICES, VECTOR_PARAMS
+
+# Types for parameters without a default to infer from, keyed by parameter name
+PARAM_TYPES = {
+    "frame": "integer", "frame_start": "integer", "frame_end": "integer", "index": "integer",
+    "input_index": "integer", "socket_index": "integer", "from_socket": "integer", "to_socket": "integer",
+    "x": "integer", "y": "integer",
+    "value": "number", "strength": "number", "size": "number", "hardness": "number",
+    "use_autosmooth": "boolean",
+}
+
+# Parameters that take a list of names
+NAME_LIST_PARAMS = {"names", "node_names", "fields", "exclude"}
+
+# Parameters that take a list of number rows (points, or one row per object)
+ROW_LIST_PARAMS = {"points", "locations", "rotations", "scales", "matrices"}
+
+# Keywords that pull a tool module into the per-turn subset
+CATEGORY_KEYWORDS = {
+    "object": ("object", "move", "rotate", "scale", "place", "position", "duplicate", "copy", "rename",
+               "parent", "hide", "delete", "remove", "align", "snap", "origin", "join", "cube", "sphere",
+               "plane", "cylinder", "primitive", "empty", "instance", "transform", "color", "size"),
+    "mesh": ("mesh", "torus", "monkey", "suzanne", "icosphere", "subdivide", "smooth", "shade"),
+    "modeling": ("extrude", "bevel", "inset", "bridge", "loop", "cut", "knife", "fill", "merge", "vertex",
+                 "vertices", "edge", "face", "boolean", "geometry", "bisect", "spin"),
+    "material": ("material", "color", "colour", "texture", "shader", "metal", "metallic", "rough", "glass",
+                 "emission", "paint", "red", "green", "blue", "world", "background"),
+    "light": ("light", "lamp", "sun", "spot", "area", "camera", "lighting", "illuminate", "shadow"),
+    "modifier": ("modifier", "subsurf", "subdivision", "solidify", "bevel", "array", "mirror", "decimate",
+                 "displace", "remesh", "screw", "wireframe", "deform", "wave", "warp", "cast", "shrinkwrap",
+                 "boolean", "hook", "lattice", "curve"),
+    "physics": ("physics", "cloth", "collision", "rigid", "force", "wind", "gravity", "fluid", "smoke",
+                "fire", "soft", "simulate", "simulation", "bake", "particle"),
+    "node": ("node", "nodes", "socket", "geometry", "group", "shader", "link", "connect"),
+    "animation": ("animate", "animation", "keyframe", "frame", "timeline", "motion", "action"),
+    "collection": ("collection", "collections", "organize", "group"),
+    "selection": ("select", "selection", "deselect", "active", "mode", "edit", "focus", "unhide", "invert"),
+    "scene": ("render", "resolution", "samples", "engine", "cycles", "eevee", "viewport", "shading",
+              "scene", "save", "denoise", "units", "overlay", "clear", "mist", "output", "compositor"),
+    "io": ("import", "export", "obj", "fbx", "file", "load"),
+    "constraint": ("constraint", "track", "follow", "ik", "limit", "pivot", "copy", "damped", "stretch"),
+    "sculpt": ("sculpt", "brush", "dyntopo", "multires", "clay", "grab", "crease", "inflate"),
+    "asset": ("asset", "pbr", "glass", "emission", "paint", "library", "preset"),
+    "spatial": ("near", "nearby", "nearest", "closest", "around", "distance", "ray", "hit", "free", "space",
+                "room", "overlap", "inside", "between", "floor", "ground"),
+}
+
+# Tools offered on every turn so the model can always look, build and ask for feedback
+CORE_TOOLS = (
+    "get_scene_info", "get_scene_delta", "request_feedback", "create_primitive", "transform_object",
+    "delete_object", "select_object", "assign_material",
+)
+
+# Tool-name words too generic to route on
+_STOP_WORDS = {"add", "set", "get", "to", "object", "objects", "node", "nodes", "by", "all", "from", "with"}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+def _param_schema(tool_name, param):
+    name = param.name
+    default = param.default
+    choices = ENUM_CHOICES.get((tool_name, name))
+    if choices:
+        return {"type": "string", "enum": list(choices)}
+    if default is inspect.Parameter.empty or default is None:
+        if name in VECTOR_PARAMS:
+            return {"type": "array", "items": {"type": "number"}}
+        if name in NAME_LIST_PARAMS:
+            return {"type": "array", "items": {"type": "string"}}
+        if "color" in name:
+            return {"type": "array", "items": {"type": "number"}}
+        if name.endswith("indices"):
+            return {"type": "array", "items": {"type": "integer"}}
+        if name.endswith("_list") or name in ROW_LIST_PARAMS:
+            return {"type": "array", "items": {"type": "array", "items": {"type": "number"}}}
+        return {"type": PARAM_TYPES.get(name, "string")}
+    if isinstance(default, bool):
+        return {"type": "boolean"}
+    if isinstance(default, int):
+        return {"type": "integer"}
+    if isinstance(default, float):
+        return {"type": "number"}
+    if isinstance(default, (tuple, list)):
+        return {"type": "array", "items": {"type": "number"}}
+    if isinstance(default, dict):
+        return {"type": "object"}
+    return {"type": "string"}
+
+def function_declaration(tool_name, fn):
+    """Builds a compact function declaration from a tool's signature.
+
+    Parameter types come from defaults, the validation tables and PARAM_TYPES;
+    the description is the first docstring line, left out when there is none
+    since the tool name already says as much.
+    """
+    properties = {}
+    required = []
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        params = ()
+    for param in params:
+        if param.kind in (param.VAR_KEYWORD, param.VAR_POSITIONAL):
+            continue
+        properties[param.name] = _param_schema(tool_name, param)
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+
+    declaration = {"name": tool_name, "parameters": {"type": "object", "properties": properties}}
+    doc = inspect.getdoc(fn)
+    if doc:
+        declaration["description"] = doc.split("\n")[0]
+    if required:
+        declaration["parameters"]["required"] = required
+    return declaration
+
+class ToolSchemas:
+    """Function declarations for a tool registry, generated on first use and cached."""
+
+    def __init__(self, tools, max_tools=32):
+        self.tools = tools
+        self.max_tools = max_tools
+        self._declarations = {}
+        self._name_index = None
+        self._recent = None
+
+    def declaration(self, name):
+        declaration = self._declarations.get(name)
+        if declaration is None:
+            declaration = function_declaration(name, self.tools[name])
+            self._declarations[name] = declaration
+        return declaration
+
+    def declarations(self, names=None):
+        return [self.declaration(name) for name in (self.tools if names is None else names)]
+
+    def _module_of(self, name):
+        module_of = getattr(self.tools, "module_of", None)
+        return module_of(name) if module_of else None
+
+    def _index(self):
+        # word -> tools whose name contains it, e.g. "torus" -> add_torus
+        if self._name_index is None:
+            index = {}
+            for name in self.tools:
+                for word in name.split("_"):
+                    if word not in _STOP_WORDS:
+                        index.setdefault(word, []).append(name)
+            self._name_index = index
+        return self._name_index
+
+    def route(self, message):
+        """Picks the tools worth offering for a message.
+
+        Core tools always go in, then tools named after words in the message,
+        then the tool modules whose keywords match, interleaved, with the
+        broad object module last. A message matching no
+        module keeps the previous turn's tools, so follow-ups like "make it
+        bigger" still get the right ones.
+        """
+        words = set(_WORD_RE.findall(message.lower()))
+        # Plural and -ing forms route like the bare word
+        words |= {w[:-1] for w in words if w.endswith("s")} | {w[:-3] for w in words if w.endswith("ing")}
+        categories = [c for c, keywords in CATEGORY_KEYWORDS.items() if words.intersection(keywords)]
+        index = self._index()
+        named = [name for word in sorted(words) for name in index.get(word, ())]
+        if not categories and self._recent:
+            return list(dict.fromkeys(self._recent + named))[:self.max_tools]
+
+        selected = [name for name in CORE_TOOLS if name in self.tools] + named
+        by_module = {}
+        for name in self.tools:
+            by_module.setdefault(self._module_of(name), []).append(name)
+        # The object module matches common words ("plane", "size"), so it only fills
+        # what is left; the other matched modules take turns so each gets a share
+        categories = categories or ["object", "scene"]
+        specific = [c for c in categories if c != "object"]
+        for row in zip_longest(*(by_module.get(c, ()) for c in specific)):
+            selected.extend(name for name in row if name is not None)
+        if "object" in categories:
+            selected.extend(by_module.get("object", ()))
+        self._recent = list(dict.fromkeys(selected))[:self.max_tools]
+        return list(self._recent)
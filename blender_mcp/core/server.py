@@ -0,0 +1,358 @@
+import functools
+import hmac
+import json
+import os
+import secrets
+import socketserver
+import threading
+from concurrent.futures import Future
+from .schema import ToolSchemas
+
+PROTOCOL_VERSION = "2024-11-05"
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNAUTHORIZED = -32001
+
+# Tools whose results carry a next_cursor
+PAGED_TOOLS = ("get_scene_info", "audit_scene")
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+def _response(msg_id, result):
+    return {"jsonrpc": "2.0", "id": msg_id, "result": result}
+
+def _error(msg_id, code, message):
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+class _Connection:
+    """Serialises writes from completion callbacks and bounds in-flight requests."""
+
+    def __init__(self, wfile, max_inflight):
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.closed = False
+
+    def send(self, message):
+        data = (json.dumps(message, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self._wfile.write(data)
+                self._wfile.flush()
+            except OSError:
+                self.closed = True
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server.mcp
+        conn = _Connection(self.wfile, server.max_inflight)
+        # Unix socket peers are vouched for by the socket file's permissions
+        authorized = not self.server.needs_token
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                conn.send(_error(None, PARSE_ERROR, "Parse error"))
+                continue
+            if not authorized:
+                if not server.check_token(message):
+                    msg_id = message.get("id") if isinstance(message, dict) else None
+                    conn.send(_error(msg_id, UNAUTHORIZED, "Send the server token in initialize params as 'token'"))
+                    break
+                authorized = True
+            # Blocks reading further requests once max_inflight are pending
+            conn.slots.acquire()
+            server.handle_message(message, conn.send, done=conn.slots.release)
+        conn.closed = True
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    needs_token = True
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        needs_token = False
+
+        def server_bind(self):
+            # Only the owner may connect; the socket never exists with wider permissions
+            umask = os.umask(0o177)
+            try:
+                super().server_bind()
+            finally:
+                os.umask(umask)
+else:
+    _UnixServer = None
+
+class MCPServer:
+    """JSON-RPC 2.0 / MCP front end for an AtomicEngine over TCP and Unix sockets.
+
+    Messages are newline-delimited JSON. Requests on a connection are pipelined:
+    each is queued on the engine's main-thread dispatcher as soon as it is read
+    and answered when it completes, so responses may arrive out of order.
+
+    The tools can read and write files, so TCP clients must first send
+    `initialize` with params {"token": server.token}; without one a random
+    token is generated. Unix socket clients are trusted, as the socket is only
+    accessible to its owner.
+    """
+
+    def __init__(self, engine, host="127.0.0.1", port=9876, socket_path=None, max_inflight=256, token=None):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.max_inflight = max_inflight
+        self.token = token or secrets.token_urlsafe(24)
+        self.schemas = ToolSchemas(engine.tools)
+        self._servers = []
+        self._threads = []
+        self._methods = {
+            "initialize": self._initialize,
+            "ping": lambda params: {},
+            "tools/list": self._tools_list,
+            "tools/call": self._tools_call,
+            "engine/batch": self._engine_batch,
+            "engine/stats": self._engine_stats,
+        }
+        # Methods that send notifications before their response
+        self._streams = {
+            "scene/pages": self._scene_pages,
+        }
+
+    def start(self):
+        if self.port is not None:
+            self._servers.append(_TCPServer((self.host, self.port), _Handler))
+            # Port 0 picks a free port; report the real one
+            self.port = self._servers[-1].server_address[1]
+        if self.socket_path:
+            if _UnixServer is None:
+                raise RuntimeError("Unix sockets are not supported on this platform")
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._servers.append(_UnixServer(self.socket_path, _Handler))
+        for server in self._servers:
+            server.mcp = self
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        self._threads = []
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def check_token(self, message):
+        """True if message is an initialize request carrying this server's token."""
+        if not isinstance(message, dict) or message.get("method") != "initialize":
+            return False
+        token = (message.get("params") or {}).get("token")
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def handle_message(self, message, reply, done=None):
+        """Handles a request, notification or batch and calls reply with the response(s)."""
+        if isinstance(message, list):
+            if not message:
+                reply(_error(None, INVALID_REQUEST, "Empty batch"))
+                if done:
+                    done()
+                return
+            responses = []
+            remaining = [len(message)]
+            lock = threading.Lock()
+
+            def collect(response):
+                with lock:
+                    if response is not None:
+                        responses.append(response)
+                    remaining[0] -= 1
+                    finished = remaining[0] == 0
+                if finished:
+                    if responses:
+                        reply(responses)
+                    if done:
+                        done()
+
+            for item in message:
+                self._handle_one(item, collect, notify=reply)
+            return
+
+        def single(response):
+            if response is not None:
+                reply(response)
+            if done:
+                done()
+
+        self._handle_one(message, single, notify=reply)
+
+    def _handle_one(self, message, reply, notify=None):
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or "method" not in message:
+            reply(_error(None, INVALID_REQUEST, "Invalid request"))
+            return
+        msg_id = message.get("id")
+        is_notification = "id" not in message
+        handler = self._methods.get(message["method"])
+        stream = self._streams.get(message["method"])
+        if stream is not None:
+            def send(method, params):
+                if notify is not None:
+                    notify({"jsonrpc": "2.0", "method": method, "params": dict(params, requestId=msg_id)})
+            handler = functools.partial(stream, send=send)
+        if handler is None:
+            reply(None if is_notification else _error(msg_id, METHOD_NOT_FOUND, f"Method {message['method']} not found"))
+            return
+
+        def finish(result=None, error=None):
+            if is_notification:
+                reply(None)
+            elif error is not None:
+                reply(_error(msg_id, error.code, error.message))
+            else:
+                reply(_response(msg_id, result))
+
+        try:
+            outcome = handler(message.get("params") or {})
+        except RpcError as e:
+            finish(error=e)
+            return
+        except Exception as e:
+            finish(error=RpcError(INTERNAL_ERROR, str(e)))
+            return
+
+        if isinstance(outcome, Future):
+            def on_done(future):
+                try:
+                    finish(result=future.result())
+                except Exception as e:
+                    finish(error=RpcError(INTERNAL_ERROR, str(e)))
+            outcome.add_done_callback(on_done)
+        else:
+            finish(result=outcome)
+
+    def _initialize(self, params):
+        return {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "blender-mcp", "version": "1.0.0"},
+        }
+
+    def _tools_list(self, params):
+        tools = []
+        for declaration in self.schemas.declarations():
+            tools.append({
+                "name": declaration["name"],
+                "description": declaration.get("description", ""),
+                "inputSchema": declaration["parameters"],
+            })
+        return {"tools": tools}
+
+    def _tools_call(self, params):
+        if not isinstance(params, dict) or "name" not in params:
+            raise RpcError(INVALID_PARAMS, "tools/call needs a 'name'")
+        cmd, errors = self.engine.validate_command({"tool": params["name"], "args": params.get("arguments") or {}})
+        if errors:
+            return _tool_content({"status": "error", "message": "; ".join(errors)})
+
+        result = Future()
+        queued = self.engine.submit_command(cmd)
+
+        def wrap(future):
+            try:
+                result.set_result(_tool_content(future.result()))
+            except Exception as e:
+                result.set_exception(e)
+        queued.add_done_callback(wrap)
+        return result
+
+    def _engine_batch(self, params):
+        commands = params.get("commands") if isinstance(params, dict) else None
+        if not isinstance(commands, list):
+            raise RpcError(INVALID_PARAMS, "engine/batch needs a 'commands' list")
+        return self.engine.submit_batch(commands, validate=True)
+
+    def _engine_stats(self, params):
+        return {
+            "queue": self.engine.dispatcher.get_stats(),
+            "metrics": self.engine.metrics.snapshot(),
+        }
+
+    def _scene_pages(self, params, send):
+        """Streams every page of get_scene_info or audit_scene as scene/page notifications.
+
+        Each page is its own main-thread job, so Blender keeps redrawing
+        between pages. The response reports the page count once all are sent.
+        """
+        tool = params.get("tool", "get_scene_info")
+        if tool not in PAGED_TOOLS:
+            raise RpcError(INVALID_PARAMS, f"scene/pages supports {', '.join(PAGED_TOOLS)}")
+        args = dict(params.get("arguments") or {})
+        args.setdefault("page_size", 500)
+        result = Future()
+        pages = [0]
+
+        def request(cursor):
+            cmd, errors = self.engine.validate_command({"tool": tool, "args": dict(args, cursor=cursor)})
+            if errors:
+                result.set_exception(RpcError(INVALID_PARAMS, "; ".join(errors)))
+                return
+            self.engine.submit_command(cmd).add_done_callback(on_page)
+
+        def on_page(future):
+            try:
+                page = future.result()
+            except Exception as e:
+                result.set_exception(e)
+                return
+            if isinstance(page, dict) and page.get("status") == "error":
+                result.set_exception(RpcError(INTERNAL_ERROR, page.get("message", "Tool failed")))
+                return
+            pages[0] += 1
+            send("scene/page", {"page": pages[0], "result": page})
+            if page.get("next_cursor"):
+                request(page["next_cursor"])
+            else:
+                result.set_result({"pages": pages[0]})
+
+        request(args.pop("cursor", None))
+        return result
+
+def _tool_content(result):
+    is_error = isinstance(result, dict) and result.get("status") == "error"
+    return {
+        "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+        "isError": is_error,
+    }
+
+def run_headless(engine, host="127.0.0.1", port=9876, socket_path=None, stop_event=None, token=None):
+    """Serves the engine and pumps its queue on the calling (main) thread until stopped."""
+    stop_event = stop_event or threading.Event()
+    server = MCPServer(engine, host=host, port=port, socket_path=socket_path, token=token).start()
+    if port is not None:
+        print(f"Blender MCP server listening on {host}:{server.port}, token {server.token}")
+    if socket_path:
+        print(f"Blender MCP server listening on {socket_path}")
+    try:
+        engine.dispatcher.run_forever(stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
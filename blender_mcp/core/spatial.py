@@ -0,0 +1,557 @@
+import bpy
+import heapq
+import itertools
+import math
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    # Bundled with Blender; boxes are computed per object without it
+    np = None
+
+try:
+    from mathutils import Vector
+    from mathutils.bvhtree import BVHTree
+except ImportError:
+    # Outside Blender ray casts stop at bounding boxes
+    Vector = BVHTree = None
+
+# Boxes covering more cells than this go to a short list every query checks
+MAX_CELLS_PER_BOX = 64
+
+_active = None
+
+def active_spatial_index():
+    """The SpatialIndex of the running engine, or None."""
+    return _active
+
+def set_active_spatial_index(index):
+    global _active
+    _active = index
+
+def box_distance(point, bmin, bmax):
+    """Distance from a point to a box; 0 inside it."""
+    total = 0.0
+    for p, lo, hi in zip(point, bmin, bmax):
+        if p < lo:
+            total += (lo - p) ** 2
+        elif p > hi:
+            total += (p - hi) ** 2
+    return math.sqrt(total)
+
+def boxes_overlap(amin, amax, bmin, bmax):
+    return all(amin[i] <= bmax[i] and bmin[i] <= amax[i] for i in range(3))
+
+def ray_slab(origin, inv_dir, bmin, bmax):
+    """(t_enter, t_exit) of a ray through a box, or None when it misses.
+
+    inv_dir holds 1/direction per axis, None for axes the ray is parallel to.
+    """
+    t_enter, t_exit = 0.0, math.inf
+    for i in range(3):
+        if inv_dir[i] is None:
+            if origin[i] < bmin[i] or origin[i] > bmax[i]:
+                return None
+            continue
+        t1 = (bmin[i] - origin[i]) * inv_dir[i]
+        t2 = (bmax[i] - origin[i]) * inv_dir[i]
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return None
+    return t_enter, t_exit
+
+def _cells_in(lo, hi):
+    return itertools.product(range(lo[0], hi[0] + 1), range(lo[1], hi[1] + 1), range(lo[2], hi[2] + 1))
+
+class SpatialGrid:
+    """Uniform hash grid over axis-aligned boxes.
+
+    Each box is filed in every cell it overlaps, so inserting, moving or
+    removing one touches only its own cells. Queries visit the cells around
+    the query region (never more cells than are occupied) and then test the
+    boxes found there exactly.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell = float(cell_size)
+        self.boxes = {}
+        self._cells = {}
+        self._spans = {}
+        self._large = set()
+        # Occupied cell index range; only grows until the next rebuild
+        self._lo = self._hi = None
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell_of(self, point):
+        c = self.cell
+        return math.floor(point[0] / c), math.floor(point[1] / c), math.floor(point[2] / c)
+
+    def insert(self, key, bmin, bmax):
+        if key in self.boxes:
+            self.remove(key)
+        self.boxes[key] = (tuple(bmin), tuple(bmax))
+        lo, hi = self._cell_of(bmin), self._cell_of(bmax)
+        if lo == hi:
+            cells = (lo,)
+        elif (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1) > MAX_CELLS_PER_BOX:
+            self._spans[key] = None
+            self._large.add(key)
+            return
+        else:
+            cells = _cells_in(lo, hi)
+        self._spans[key] = (lo, hi)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        if self._lo is None:
+            self._lo, self._hi = lo, hi
+        else:
+            self._lo = tuple(map(min, self._lo, lo))
+            self._hi = tuple(map(max, self._hi, hi))
+
+    def remove(self, key):
+        if self.boxes.pop(key, None) is None:
+            return
+        span = self._spans.pop(key)
+        if span is None:
+            self._large.discard(key)
+            return
+        for cell in _cells_in(*span):
+            members = self._cells.get(cell)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._cells[cell]
+
+    def _candidates(self, bmin, bmax):
+        found = set(self._large)
+        if self._lo is None:
+            return found
+        lo = tuple(map(max, self._cell_of(bmin), self._lo))
+        hi = tuple(map(min, self._cell_of(bmax), self._hi))
+        if any(l > h for l, h in zip(lo, hi)):
+            return found
+        if math.prod(h - l + 1 for l, h in zip(lo, hi)) > len(self._cells):
+            for cell, members in self._cells.items():
+                if all(lo[i] <= cell[i] <= hi[i] for i in range(3)):
+                    found |= members
+        else:
+            for cell in _cells_in(lo, hi):
+                members = self._cells.get(cell)
+                if members:
+                    found |= members
+        return found
+
+    def within(self, point, radius, accept=None):
+        """(distance, key) of boxes within radius of point, nearest first."""
+        bmin = [p - radius for p in point]
+        bmax = [p + radius for p in point]
+        hits = []
+        for key in self._candidates(bmin, bmax):
+            if accept is not None and not accept(key):
+                continue
+            d = box_distance(point, *self.boxes[key])
+            if d <= radius:
+                hits.append((d, key))
+        hits.sort()
+        return hits
+
+    def overlapping(self, bmin, bmax, accept=None):
+        return [key for key in self._candidates(bmin, bmax)
+                if (accept is None or accept(key)) and boxes_overlap(bmin, bmax, *self.boxes[key])]
+
+    def nearest(self, point, count=1, max_distance=math.inf, accept=None):
+        """(distance, key) of the `count` boxes nearest to point.
+
+        Rings of cells are searched outwards from the point's cell and the
+        search stops once no unvisited cell can hold anything nearer.
+        """
+        best = []
+        seen = set()
+
+        def consider(keys):
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                if accept is not None and not accept(key):
+                    continue
+                d = box_distance(point, *self.boxes[key])
+                if d > max_distance:
+                    continue
+                heapq.heappush(best, (-d, key))
+                if len(best) > count:
+                    heapq.heappop(best)
+
+        consider(self._large)
+        if self._lo is not None:
+            center = self._cell_of(point)
+            reach = max(max(abs(c - l), abs(c - h)) for c, l, h in zip(center, self._lo, self._hi))
+            for ring in range(reach + 1):
+                # Everything in this ring or beyond is at least this far away
+                floor = (ring - 1) * self.cell
+                if floor > max_distance or (len(best) == count and -best[0][0] <= floor):
+                    break
+                for cell in self._ring(center, ring):
+                    members = self._cells.get(cell)
+                    if members:
+                        consider(members)
+        return sorted((-d, key) for d, key in best)
+
+    def _ring(self, center, ring):
+        lo, hi = self._lo, self._hi
+        ranges = [range(max(c - ring, l), min(c + ring, h) + 1) for c, l, h in zip(center, lo, hi)]
+        for i in ranges[0]:
+            for j in ranges[1]:
+                if abs(i - center[0]) == ring or abs(j - center[1]) == ring:
+                    for k in ranges[2]:
+                        yield i, j, k
+                else:
+                    for k in {center[2] - ring, center[2] + ring}:
+                        if lo[2] <= k <= hi[2]:
+                            yield i, j, k
+
+    def ray(self, origin, direction, max_distance=math.inf, hit=None, accept=None):
+        """(distance, key) of the first box along a ray, or None.
+
+        Cells are walked in ray order (3D DDA). hit(key, t_box) may refine a
+        box hit into an exact one, returning a distance or None for a miss.
+        """
+        length = math.sqrt(sum(d * d for d in direction))
+        if not length:
+            raise ValueError("Ray direction must not be zero")
+        direction = [d / length for d in direction]
+        inv_dir = [1.0 / d if d else None for d in direction]
+        best = None
+        tested = set()
+
+        def test(keys):
+            nonlocal best
+            for key in keys:
+                if key in tested:
+                    continue
+                tested.add(key)
+                if accept is not None and not accept(key):
+                    continue
+                span = ray_slab(origin, inv_dir, *self.boxes[key])
+                if span is None or span[0] > max_distance:
+                    continue
+                t = span[0] if hit is None else hit(key, span[0])
+                if t is not None and t <= max_distance and (best is None or t < best[0]):
+                    best = (t, key)
+
+        test(self._large)
+        if self._lo is None:
+            return best
+        cell = self.cell
+        grid_min = [l * cell for l in self._lo]
+        grid_max = [(h + 1) * cell for h in self._hi]
+        span = ray_slab(origin, inv_dir, grid_min, grid_max)
+        if span is None:
+            return best
+        t, t_exit = span
+        limit = min(max_distance, t_exit)
+        position = [origin[i] + direction[i] * t for i in range(3)]
+        current = [min(max(math.floor(position[i] / cell), self._lo[i]), self._hi[i]) for i in range(3)]
+        step, t_next, t_delta = [0] * 3, [math.inf] * 3, [math.inf] * 3
+        for i in range(3):
+            if direction[i] > 0:
+                step[i] = 1
+                t_next[i] = ((current[i] + 1) * cell - origin[i]) * inv_dir[i]
+                t_delta[i] = cell * inv_dir[i]
+            elif direction[i] < 0:
+                step[i] = -1
+                t_next[i] = (current[i] * cell - origin[i]) * inv_dir[i]
+                t_delta[i] = -cell * inv_dir[i]
+        while True:
+            members = self._cells.get(tuple(current))
+            if members:
+                test(members)
+            t_leave = min(t_next)
+            if (best is not None and best[0] <= t_leave) or t_leave > limit:
+                break
+            axis = t_next.index(t_leave)
+            current[axis] += step[axis]
+            if not self._lo[axis] <= current[axis] <= self._hi[axis]:
+                break
+            t_next[axis] += t_delta[axis]
+        return best
+
+    def free_spot(self, size, near, padding=0.1, max_distance=50.0, accept=None):
+        """Center nearest to `near` (same height) where a box of `size` overlaps nothing, or None.
+
+        Candidates are laid out in square rings around `near`, one box
+        width apart.
+        """
+        half = [s / 2 + padding for s in size]
+        spacing = max(size[0], size[1]) + padding
+        if spacing <= 0:
+            raise ValueError("size must be positive")
+        for ring in range(int(max_distance // spacing) + 1):
+            offsets = [(dx, dy) for dx in range(-ring, ring + 1) for dy in range(-ring, ring + 1)
+                       if max(abs(dx), abs(dy)) == ring]
+            offsets.sort(key=lambda o: o[0] * o[0] + o[1] * o[1])
+            for dx, dy in offsets:
+                center = (near[0] + dx * spacing, near[1] + dy * spacing, near[2])
+                bmin = [c - h for c, h in zip(center, half)]
+                bmax = [c + h for c, h in zip(center, half)]
+                if not self.overlapping(bmin, bmax, accept):
+                    return center
+        return None
+
+def world_aabb(obj):
+    """World-space (min, max) of an object's bounding box."""
+    corners = obj.bound_box
+    # Blender orders the corners so the first is the minimum and the seventh the maximum
+    lo, hi = corners[0], corners[6]
+    cx, cy, cz = (lo[0] + hi[0]) / 2, (lo[1] + hi[1]) / 2, (lo[2] + hi[2]) / 2
+    hx, hy, hz = (hi[0] - lo[0]) / 2, (hi[1] - lo[1]) / 2, (hi[2] - lo[2]) / 2
+    matrix = obj.matrix_world
+    bmin, bmax = [], []
+    for axis in range(3):
+        row = matrix[axis]
+        c = row[0] * cx + row[1] * cy + row[2] * cz + row[3]
+        h = abs(row[0]) * hx + abs(row[1]) * hy + abs(row[2]) * hz
+        bmin.append(c - h)
+        bmax.append(c + h)
+    return bmin, bmax
+
+def bulk_aabbs(collection):
+    """World boxes of every object in a bpy collection, read with two foreach_get calls.
+
+    Returns None when numpy or bulk reads are unavailable.
+    """
+    if np is None:
+        return None
+    count = len(collection)
+    try:
+        matrices = np.empty(count * 16, dtype=np.float32)
+        collection.foreach_get("matrix_world", matrices)
+        corners = np.empty(count * 24, dtype=np.float32)
+        collection.foreach_get("bound_box", corners)
+    except (AttributeError, TypeError, RuntimeError):
+        return None
+    # RNA matrices are stored column-major
+    matrices = matrices.reshape(count, 4, 4).transpose(0, 2, 1)
+    corners = corners.reshape(count, 8, 3)
+    lo, hi = corners[:, 0], corners[:, 6]
+    rotation = matrices[:, :3, :3]
+    center = np.einsum("nij,nj->ni", rotation, (lo + hi) / 2) + matrices[:, :3, 3]
+    half = np.einsum("nij,nj->ni", np.abs(rotation), (hi - lo) / 2)
+    return (center - half).tolist(), (center + half).tolist()
+
+def _cell_size(boxes):
+    """About one object per cell: the mean spacing of box centers, and at least twice the median box size.
+
+    Spacing is taken over the axes the scene actually spreads along, so a
+    flat layout gets square cells sized for its area rather than its volume.
+    """
+    if not boxes:
+        return 1.0
+    extents = sorted(max(hi[i] - lo[i] for i in range(3)) for lo, hi in boxes)
+    median = extents[len(extents) // 2]
+    spans = []
+    for i in range(3):
+        centers = [lo[i] + hi[i] for lo, hi in boxes]
+        spans.append((max(centers) - min(centers)) / 2)
+    spread = [span for span in spans if span > median]
+    spacing = (math.prod(spread) / len(boxes)) ** (1 / len(spread)) if spread else 0.0
+    return max(2 * median, spacing, 1e-3)
+
+class SpatialIndex:
+    """World-space bounding boxes of every object, kept in a SpatialGrid.
+
+    Fed by the depsgraph hub like the scene index: transform and geometry
+    updates re-box only the objects they name, linking and unlinking are
+    reconciled by session_uid without re-reading any box, and undo or file
+    loads drop the grid so the next query rebuilds it. Exact ray casts build
+    a BVHTree per mesh on first hit and keep it until the mesh changes.
+
+    `flush`, when set, is called before every query so that edits Blender
+    has not evaluated yet reach on_update first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.grid = None
+        self._names = {}
+        self._types = {}
+        self._data = {}
+        self._users = {}
+        self._dirty = {}
+        self._reconcile = False
+        self._trees = {}
+        self.flush = None
+        self.rebuilds = 0
+
+    def on_update(self, scene, depsgraph):
+        """Depsgraph listener: remembers which objects to re-box."""
+        if depsgraph is None:
+            self.grid = None
+            return
+        if self.grid is None:
+            return
+        with self._lock:
+            for update in depsgraph.updates:
+                original = getattr(update.id, "original", update.id)
+                id_type = getattr(original, "id_type", None)
+                if id_type == 'OBJECT':
+                    if getattr(update, "is_updated_geometry", True):
+                        self._trees.pop(original.session_uid, None)
+                    if getattr(update, "is_updated_transform", True) or getattr(update, "is_updated_geometry", True):
+                        self._dirty[original.session_uid] = original.name
+                elif id_type in ('SCENE', 'COLLECTION'):
+                    self._reconcile = True
+                elif id_type is not None:
+                    # Mesh, curve, ... edits change the boxes of every object using the data
+                    for uid in self._users.get(original.name, ()):
+                        self._dirty[uid] = self._names[uid]
+                        self._trees.pop(uid, None)
+
+    def ensure(self):
+        """Brings the grid up to date; call on the main thread."""
+        if self.flush is not None:
+            self.flush()
+        with self._lock:
+            if self.grid is None:
+                self._rebuild()
+                return
+            if self._reconcile:
+                self._sync_membership()
+            if self._dirty:
+                dirty, self._dirty = self._dirty, {}
+                for uid, name in dirty.items():
+                    obj = bpy.data.objects.get(name)
+                    if obj is None or obj.session_uid != uid:
+                        self._sync_membership()
+                        break
+                    self._add(obj)
+
+    def _rebuild(self):
+        objects = bpy.data.objects
+        bulk = bulk_aabbs(objects)
+        boxes = list(zip(*bulk)) if bulk else [world_aabb(obj) for obj in objects]
+        self.grid = SpatialGrid(_cell_size(boxes))
+        self._names, self._types, self._data, self._users, self._trees = {}, {}, {}, {}, {}
+        for obj, (bmin, bmax) in zip(objects, boxes):
+            self._add(obj, bmin, bmax)
+        self._dirty = {}
+        self._reconcile = False
+        self.rebuilds += 1
+
+    def _add(self, obj, bmin=None, bmax=None):
+        if bmin is None:
+            bmin, bmax = world_aabb(obj)
+        uid = obj.session_uid
+        self._unlink_data(uid)
+        self.grid.insert(uid, bmin, bmax)
+        self._names[uid] = obj.name
+        self._types[uid] = obj.type
+        data = obj.data.name if obj.data is not None else None
+        self._data[uid] = data
+        if data is not None:
+            self._users.setdefault(data, set()).add(uid)
+
+    def _unlink_data(self, uid):
+        data = self._data.pop(uid, None)
+        users = self._users.get(data)
+        if users is not None:
+            users.discard(uid)
+            if not users:
+                del self._users[data]
+
+    def _forget(self, uid):
+        self.grid.remove(uid)
+        self._unlink_data(uid)
+        for table in (self._names, self._types, self._trees):
+            table.pop(uid, None)
+
+    def _sync_membership(self):
+        current = {obj.session_uid: obj for obj in bpy.data.objects}
+        for uid in [uid for uid in self._names if uid not in current]:
+            self._forget(uid)
+        for uid, obj in current.items():
+            if uid not in self._names:
+                self._add(obj)
+            else:
+                self._names[uid] = obj.name
+        self._reconcile = False
+
+    def _accept(self, type=None, exclude=()):
+        if not type and not exclude:
+            return None
+        types = {t.upper() for t in ([type] if isinstance(type, str) else type)} if type else None
+        excluded = set(exclude)
+        return lambda uid: (types is None or self._types[uid] in types) and self._names[uid] not in excluded
+
+    def within(self, point, radius, type=None, exclude=()):
+        self.ensure()
+        return [(self._names[uid], d) for d, uid in self.grid.within(point, radius, self._accept(type, exclude))]
+
+    def nearest(self, point, count=1, max_distance=math.inf, type=None, exclude=()):
+        self.ensure()
+        hits = self.grid.nearest(point, count, max_distance, self._accept(type, exclude))
+        return [(self._names[uid], d) for d, uid in hits]
+
+    def overlapping(self, bmin, bmax, type=None, exclude=()):
+        self.ensure()
+        return sorted(self._names[uid] for uid in self.grid.overlapping(bmin, bmax, self._accept(type, exclude)))
+
+    def free_spot(self, size, near, padding=0.1, max_distance=50.0, exclude=()):
+        self.ensure()
+        return self.grid.free_spot(size, near, padding, max_distance, self._accept(None, exclude))
+
+    def ray_cast(self, origin, direction, max_distance=math.inf, precise=True, exclude=()):
+        """First object along a ray as {"name", "distance", "location", "normal"}, or None.
+
+        With precise (and inside Blender) mesh hits are exact; otherwise the
+        ray stops at bounding boxes and no normal is given.
+        """
+        self.ensure()
+        normals = {}
+        hit = None
+        if precise and BVHTree is not None:
+            def hit(uid, t_box):
+                return self._mesh_hit(uid, t_box, origin, direction, normals)
+        found = self.grid.ray(origin, direction, max_distance, hit, self._accept(None, exclude))
+        if found is None:
+            return None
+        t, uid = found
+        length = math.sqrt(sum(d * d for d in direction))
+        return {
+            "name": self._names[uid],
+            "distance": round(t, 4),
+            "location": [round(o + d / length * t, 4) for o, d in zip(origin, direction)],
+            "normal": normals.get(uid),
+        }
+
+    def _mesh_hit(self, uid, t_box, origin, direction, normals):
+        obj = bpy.data.objects.get(self._names[uid])
+        if obj is None or obj.type != 'MESH':
+            return t_box
+        tree = self._trees.get(uid)
+        if tree is None:
+            tree = self._trees[uid] = BVHTree.FromObject(obj, bpy.context.evaluated_depsgraph_get())
+        matrix = obj.matrix_world
+        inverse = matrix.inverted()
+        location, normal, _, _ = tree.ray_cast(inverse @ Vector(origin), inverse.to_3x3() @ Vector(direction))
+        if location is None:
+            return None
+        normals[uid] = [round(v, 4) for v in (matrix.to_3x3().inverted().transposed() @ normal).normalized()]
+        return ((matrix @ location) - Vector(origin)).length
+
+    def stats(self):
+        grid = self.grid
+        return {
+            "objects": len(grid) if grid else 0,
+            "cell_size": round(grid.cell, 4) if grid else None,
+            "cells": len(grid._cells) if grid else 0,
+            "large": len(grid._large) if grid else 0,
+            "mesh_trees": len(self._trees),
+            "rebuilds": self.rebuilds,
+        }
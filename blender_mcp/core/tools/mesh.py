@@ -1,19 +1,17 @@
 import bpy
+from ..primitives import factory
 
 def add_torus(location=(0,0,0), name="Torus"):
-    bpy.ops.mesh.primitive_torus_add(location=location)
-    bpy.context.active_object.name = name
-    return {"status": "success"}
+    obj = factory.create("TORUS", name=name, location=location)
+    return {"status": "success", "object": obj.name}
 
 def add_monkey(location=(0,0,0), name="Suzanne"):
-    bpy.ops.mesh.primitive_monkey_add(location=location)
-    bpy.context.active_object.name = name
-    return {"status": "success"}
+    obj = factory.create("MONKEY", name=name, location=location)
+    return {"status": "success", "object": obj.name}
 
 def add_icosphere(location=(0,0,0), subdivisions=2, name="IcoSphere"):
-    bpy.ops.mesh.primitive_ico_sphere_add(location=location, subdivisions=subdivisions)
-    bpy.context.active_object.name = name
-    return {"status": "success"}
+    obj = factory.create("ICOSPHERE", name=name, location=location, subdivisions=subdivisions)
+    return {"status": "success", "object": obj.name}
 
 def subdivide_mesh(name, cuts=1):
     obj = bpy.data.objects.get(name)
@@ -1,20 +1,19 @@
 import bpy
 import math
+from ..primitives import factory
+
+try:
+    import numpy as np
+except ImportError:
+    # Bundled with Blender; arrays are converted row by row without it
+    np = None
 
 def create_primitive(type="CUBE", location=(0, 0, 0), scale=(1, 1, 1), name=None):
-    if type == "CUBE":
-        bpy.ops.mesh.primitive_cube_add(location=location)
-    elif type == "SPHERE":
-        bpy.ops.mesh.primitive_uv_sphere_add(location=location)
-    elif type == "PLANE":
-        bpy.ops.mesh.primitive_plane_add(location=location)
-    elif type == "CYLINDER":
-        bpy.ops.mesh.primitive_cylinder_add(location=location)
-
-    obj = bpy.context.active_object
-    obj.scale = scale
-    if name:
-        obj.name = name
+    # Copied from a cached template mesh instead of running an operator
+    try:
+        obj = factory.create(type, name=name, location=location, scale=scale)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
     return {"status": "success", "object": obj.name}
 
 def transform_object(name, location=None, rotation=None, scale=None):
@@ -30,6 +29,184 @@ def transform_object(name, location=None, rotation=None, scale=None):
         obj.scale = scale
     return {"status": "success"}
 
+def _flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from _flatten(value)
+        else:
+            yield value
+
+def _number_row(values, width):
+    """A row of `width` floats, or None when values holds anything else."""
+    if values is None:
+        return None
+    flat = list(_flatten(values)) if isinstance(values, (list, tuple)) else [values]
+    if len(flat) != width or any(isinstance(v, bool) for v in flat):
+        return None
+    try:
+        return [float(v) for v in flat]
+    except (TypeError, ValueError):
+        return None
+
+def _per_object(values, count, width, name):
+    """One row of `width` numbers per object, from a single row or a row per object.
+
+    A row of its own holding None or other non-numbers comes back as None,
+    so the caller can fail that object alone.
+    """
+    if values is None:
+        return None
+    if np is not None:
+        try:
+            array = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Ragged or holding non-numbers; sorted out row by row below
+            array = None
+        # NumPy reads None as NaN; leave those to the row-by-row checks too
+        if array is not None and not np.isnan(array).any():
+            if array.size == width:
+                return np.broadcast_to(array.reshape(width), (count, width))
+            if array.size == count * width:
+                return array.reshape(count, width)
+            raise ValueError(f"'{name}' needs {width} numbers, or {width} for each of the {count} objects")
+    if not isinstance(values, (list, tuple)):
+        raise ValueError(f"'{name}' must be a list of numbers")
+    flat = list(_flatten(values))
+    if len(flat) == width:
+        row = _number_row(flat, width)
+        if row is None:
+            raise ValueError(f"'{name}' must be numbers")
+        return [list(row) for _ in range(count)]
+    if len(values) == count and any(isinstance(v, (list, tuple)) for v in values):
+        return [_number_row(v, width) for v in values]
+    if len(flat) != count * width:
+        raise ValueError(f"'{name}' needs {width} numbers, or {width} for each of the {count} objects")
+    return [_number_row(flat[i:i + width], width) for i in range(0, len(flat), width)]
+
+def _radians(rows):
+    if rows is None:
+        return None
+    if np is not None and not isinstance(rows, list):
+        return np.radians(rows).tolist()
+    return [None if row is None else [math.radians(v) for v in row] for row in rows]
+
+def _rows(rows):
+    return rows.tolist() if np is not None and rows is not None and not isinstance(rows, list) else rows
+
+def _bad_rows(rows):
+    """Indices of the objects whose row in `rows` could not be read."""
+    return [] if rows is None else [i for i, row in enumerate(rows) if row is None]
+
+def _matmul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+
+def transform_objects(names, locations=None, rotations=None, scales=None, matrices=None, mode='ABSOLUTE'):
+    """Moves, rotates and scales many objects in one call; rotations in degrees.
+
+    locations, rotations and scales are one [x, y, z] for every object or one
+    per name; matrices are 4x4 world matrices (nested or 16 numbers, row by
+    row) instead. RELATIVE adds locations and rotations, multiplies scales and
+    applies matrices on top of the current world matrix. Objects that fail are
+    listed in "failed" and the others are still transformed.
+    """
+    if isinstance(names, str):
+        names = [names]
+    mode = str(mode).upper()
+    if mode not in ('ABSOLUTE', 'RELATIVE'):
+        return {"status": "error", "message": f"Unknown mode {mode}; use ABSOLUTE or RELATIVE"}
+    if matrices is not None and any(v is not None for v in (locations, rotations, scales)):
+        return {"status": "error", "message": "Give either matrices or locations/rotations/scales"}
+    count = len(names)
+    try:
+        # All conversions happen up front, on whole arrays
+        locations = _rows(_per_object(locations, count, 3, "locations"))
+        rotations = _radians(_per_object(rotations, count, 3, "rotations"))
+        scales = _rows(_per_object(scales, count, 3, "scales"))
+        matrices = _rows(_per_object(matrices, count, 16, "matrices"))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+    relative = mode == 'RELATIVE'
+    failed = []
+    fields = (("locations", locations), ("rotations", rotations), ("scales", scales), ("matrices", matrices))
+    for i, name in enumerate(names):
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            failed.append({"name": name, "message": f"Object {name} not found"})
+            continue
+        bad = [field for field, rows in fields if rows is not None and rows[i] is None]
+        if bad:
+            failed.append({"name": name, "message": f"'{bad[0]}' for {name} must be numbers"})
+            continue
+        try:
+            if matrices is not None:
+                m = matrices[i]
+                matrix = [m[0:4], m[4:8], m[8:12], m[12:16]]
+                obj.matrix_world = _matmul(matrix, [list(row) for row in obj.matrix_world]) if relative else matrix
+                continue
+            if locations is not None:
+                obj.location = [a + b for a, b in zip(obj.location, locations[i])] if relative else locations[i]
+            if rotations is not None:
+                obj.rotation_euler = [a + b for a, b in zip(obj.rotation_euler, rotations[i])] if relative else rotations[i]
+            if scales is not None:
+                obj.scale = [a * b for a, b in zip(obj.scale, scales[i])] if relative else scales[i]
+        except (AttributeError, TypeError, ValueError, RuntimeError) as e:
+            failed.append({"name": name, "message": str(e)})
+
+    applied = count - len(failed)
+    response = {"status": "success" if applied or not count else "error", "applied": applied}
+    if failed:
+        response["failed"] = failed
+    return response
+
+def _row_count(values):
+    if values is None:
+        return 0
+    if np is not None:
+        shape = np.shape(values)
+        return shape[0] if len(shape) > 1 else 1
+    return len(values) if values and isinstance(values[0], (list, tuple)) else 1
+
+def create_primitives(type="CUBE", count=None, names=None, locations=None, rotations=None, scales=None,
+                      shared=True, collection=None):
+    """Creates many primitives in one call from one template mesh; rotations in degrees.
+
+    locations, rotations and scales are one [x, y, z] for every object or
+    one per object. count defaults to the number of names or location rows.
+    shared=True (the default) makes every object use one new mesh, like
+    linked duplicates; False gives each its own mesh to edit.
+    """
+    if isinstance(names, str):
+        names = [names]
+    if count is None:
+        count = (len(names) if names else _row_count(locations)) or 1
+    if count < 0:
+        return {"status": "error", "message": f"count must be 0 or more, not {count}"}
+    if names and len(names) != count:
+        return {"status": "error", "message": f"{len(names)} names for {count} objects"}
+    if not count:
+        return {"status": "success", "objects": [], "count": 0}
+    target = None
+    if collection:
+        target = bpy.data.collections.get(collection)
+        if target is None:
+            return {"status": "error", "message": f"Collection {collection} not found"}
+    try:
+        locations = _rows(_per_object(locations, count, 3, "locations"))
+        rotations = _radians(_per_object(rotations, count, 3, "rotations"))
+        scales = _rows(_per_object(scales, count, 3, "scales"))
+        for field, rows in (("locations", locations), ("rotations", rotations), ("scales", scales)):
+            bad = _bad_rows(rows)
+            if bad:
+                raise ValueError(f"'{field}' must be numbers; rows {', '.join(map(str, bad))} are not")
+        objects = factory.create_many(
+            type, count, names=names, locations=locations, rotations=rotations, scales=scales,
+            shared=shared, collection=target,
+        )
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", "objects": [obj.name for obj in objects], "count": len(objects)}
+
 def delete_object(name):
     obj = bpy.data.objects.get(name)
     if obj:
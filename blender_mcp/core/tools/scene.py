@@ -1,4 +1,6 @@
+import base64
 import bpy
+from ..query import FIELD_READERS, check_fields, match_objects, object_rows, paginate
 
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -20,37 +22,43 @@ def render_still(path):
     return {"status": "success"}
 
 def get_screenshot():
-    from ...utils.vision import get_base64_viewport
-    data = get_base64_viewport()
-    if data:
-        return {"status": "success", "image_data": data}
+    from ...utils.encoding import ViewportEncoder
+    from ...utils.vision import get_encoded_viewport
+    # Offscreen when a GPU context exists; the model asked for this frame, so it is always sent
+    frame = get_encoded_viewport(ViewportEncoder(format="PNG", skip_unchanged=False))
+    if frame and frame["data"]:
+        return {"status": "success", "image_data": base64.b64encode(frame["data"]).decode("ascii"),
+                "mime_type": frame["mime_type"], "width": frame["width"], "height": frame["height"]}
     return {"status": "error", "message": "Failed to capture screenshot"}
 
 def request_feedback(message="Please verify the result"):
     # This is a marker tool for the UI to trigger a loop
     return {"status": "success", "feedback_requested": True, "message": message}
 
-def get_scene_info():
-    info = {
-        "objects": [],
-        "materials": [m.name for m in bpy.data.materials],
-        "node_groups": [g.name for g in bpy.data.node_groups],
-        "collections": [c.name for c in bpy.data.collections],
-        "render": {
-            "engine": bpy.context.scene.render.engine,
-            "resolution": [bpy.context.scene.render.resolution_x, bpy.context.scene.render.resolution_y]
-        }
-    }
-    for obj in bpy.data.objects:
-        obj_info = {
-            "name": obj.name,
-            "type": obj.type,
-            "location": list(obj.location),
-            "rotation": list(obj.rotation_euler),
-            "modifiers": [m.name for m in obj.modifiers],
-        }
-        info["objects"].append(obj_info)
-    return {"status": "success", "info": info}
+SCENE_INFO_FIELDS = ("name", "type", "location", "rotation", "modifiers")
+
+def get_scene_info(fields=None, type=None, collection=None, name=None, cursor=None, page_size=200):
+    """Lists objects with the requested fields, filtered by type, collection and name glob, one page at a time.
+
+    Scene-wide lists (materials, collections, render settings) come with the
+    first page only. Pass the returned next_cursor to get the next page.
+    """
+    fields = check_fields(fields, SCENE_INFO_FIELDS)
+    indices, objects = match_objects(type, collection, name)
+    page_objects, next_cursor = paginate(objects, cursor, page_size)
+    page_indices = None if indices is None else paginate(indices, cursor, page_size)[0]
+    info = {"objects": object_rows(fields, page_indices, page_objects)}
+    if not cursor:
+        info.update({
+            "materials": [m.name for m in bpy.data.materials],
+            "node_groups": [g.name for g in bpy.data.node_groups],
+            "collections": [c.name for c in bpy.data.collections],
+            "render": {
+                "engine": bpy.context.scene.render.engine,
+                "resolution": [bpy.context.scene.render.resolution_x, bpy.context.scene.render.resolution_y]
+            }
+        })
+    return {"status": "success", "info": info, "total": len(objects), "next_cursor": next_cursor}
 
 def set_render_samples(samples=128, preview_samples=32):
     scene = bpy.context.scene
@@ -231,27 +239,40 @@ def save_file(filepath=None):
         bpy.ops.wm.save_mainfile()
     return {"status": "success"}
 
-def audit_scene():
-    """Provides detailed analysis of the scene (polycount, materials, modifiers)."""
+AUDIT_FIELDS = ("name", "type", "polycount", "modifiers", "materials")
+
+# Audit rows list modifier types rather than names
+AUDIT_READERS = dict(FIELD_READERS, modifiers=lambda obj: [m.type for m in obj.modifiers])
+
+def audit_scene(fields=None, type=None, collection=None, name=None, cursor=None, page_size=200):
+    """Provides detailed analysis of the scene (polycount, materials, modifiers), one page of objects at a time.
+
+    total_objects counts the whole scene and matched the objects passing the
+    filters; the vertex and face totals cover the matched objects.
+    """
+    fields = check_fields(fields, AUDIT_FIELDS, AUDIT_READERS)
+    indices, objects = match_objects(type, collection, name)
+
+    # Meshes shared by several objects are counted once per object but read once
+    counts = {}
+    total_vertices = total_faces = 0
+    for obj in objects:
+        if obj.type != 'MESH' or obj.data is None:
+            continue
+        mesh = obj.data
+        key = mesh.name
+        if key not in counts:
+            counts[key] = (len(mesh.vertices), len(mesh.polygons))
+        total_vertices += counts[key][0]
+        total_faces += counts[key][1]
+
+    page_objects, next_cursor = paginate(objects, cursor, page_size)
+    page_indices = None if indices is None else paginate(indices, cursor, page_size)[0]
     stats = {
         "total_objects": len(bpy.data.objects),
-        "total_vertices": 0,
-        "total_faces": 0,
-        "objects_audit": []
+        "matched": len(objects),
+        "total_vertices": total_vertices,
+        "total_faces": total_faces,
+        "objects_audit": object_rows(fields, page_indices, page_objects, AUDIT_READERS),
     }
-
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            stats["total_vertices"] += len(obj.data.vertices)
-            stats["total_faces"] += len(obj.data.polygons)
-
-        obj_audit = {
-            "name": obj.name,
-            "type": obj.type,
-            "polycount": len(obj.data.polygons) if obj.type == 'MESH' else 0,
-            "modifiers": [m.type for m in obj.modifiers],
-            "materials": [slot.material.name for slot in obj.material_slots if slot.material]
-        }
-        stats["objects_audit"].append(obj_audit)
-
-    return {"status": "success", "audit": stats}
+    return {"status": "success", "audit": stats, "next_cursor": next_cursor}
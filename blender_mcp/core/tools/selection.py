@@ -1,4 +1,5 @@
 import bpy
+from ..index import active_index
 
 def select_object(name, select=True):
     obj = bpy.data.objects.get(name)
@@ -24,8 +25,13 @@ def select_all():
 
 def select_by_type(type='MESH'):
     # type: 'MESH', 'CURVE', 'SURFACE', 'META', 'FONT', 'ARMATURE', 'LATTICE', 'EMPTY', 'LIGHT', 'CAMERA'
-    for obj in bpy.data.objects:
-        if obj.type == type:
+    index = active_index()
+    if index is not None and index.serves():
+        objects = (bpy.data.objects.get(name) for name in index.query(type=type))
+    else:
+        objects = (obj for obj in bpy.data.objects if obj.type == type)
+    for obj in objects:
+        if obj is not None:
             obj.select_set(True)
     return {"status": "success"}
 
@@ -0,0 +1,41 @@
+from ..spatial import SpatialIndex, active_spatial_index
+
+def _index():
+    # Without a running engine a one-off index is built for the call
+    return active_spatial_index() or SpatialIndex()
+
+def _rows(hits):
+    return [{"name": name, "distance": round(distance, 4)} for name, distance in hits]
+
+def find_nearby(point=(0.0, 0.0, 0.0), radius=5.0, type=None, limit=50):
+    """Objects whose bounding box is within radius of a point, nearest first."""
+    hits = _index().within(point, radius, type=type)
+    return {"status": "success", "objects": _rows(hits[:limit]), "total": len(hits)}
+
+def find_nearest(point=(0.0, 0.0, 0.0), count=5, type=None, exclude=None):
+    """The count objects nearest to a point, measured to their bounding boxes."""
+    hits = _index().nearest(point, count, type=type, exclude=exclude or ())
+    return {"status": "success", "objects": _rows(hits)}
+
+def ray_cast(origin=(0.0, 0.0, 10.0), direction=(0.0, 0.0, -1.0), max_distance=1000.0, precise=True, exclude=None):
+    """First object hit by a ray, with the hit location and surface normal."""
+    try:
+        hit = _index().ray_cast(origin, direction, max_distance, precise=precise, exclude=exclude or ())
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", "hit": hit is not None, **(hit or {})}
+
+def find_in_box(box_min=(-1.0, -1.0, -1.0), box_max=(1.0, 1.0, 1.0), type=None):
+    """Objects whose bounding box overlaps an axis-aligned box."""
+    names = _index().overlapping(box_min, box_max, type=type)
+    return {"status": "success", "objects": names}
+
+def find_free_space(size=(1.0, 1.0, 1.0), near=(0.0, 0.0, 0.0), padding=0.1, max_distance=50.0, exclude=None):
+    """Center nearest to `near` where a box of `size` touches no other object."""
+    try:
+        location = _index().free_spot(size, near, padding, max_distance, exclude=exclude or ())
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    if location is None:
+        return {"status": "error", "message": f"No free space within {max_distance} of {list(near)}"}
+    return {"status": "success", "location": [round(v, 4) for v in location]}
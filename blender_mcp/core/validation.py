@@ -0,0 +1,197 @@
+import inspect
+import math
+import re
+
+# Parameters that are always 3-vectors, even when the tool gives no default
+VECTOR_PARAMS = {"location", "rotation", "scale", "translate", "dimensions", "gravity"}
+
+# Known choices for enum-like parameters, keyed by (tool, parameter)
+ENUM_CHOICES = {
+    ("create_primitive", "type"): ("CUBE", "SPHERE", "PLANE", "CYLINDER", "CONE", "ICOSPHERE", "TORUS", "MONKEY"),
+    ("create_primitives", "type"): ("CUBE", "SPHERE", "PLANE", "CYLINDER", "CONE", "ICOSPHERE", "TORUS", "MONKEY"),
+    ("transform_objects", "mode"): ("ABSOLUTE", "RELATIVE"),
+    ("add_light", "type"): ("POINT", "SUN", "SPOT", "AREA"),
+    ("set_viewport_shading", "type"): ("WIREFRAME", "SOLID", "MATERIAL", "RENDERED"),
+    ("set_mode", "mode"): ("OBJECT", "EDIT", "POSE", "SCULPT", "VERTEX_PAINT", "WEIGHT_PAINT", "TEXTURE_PAINT"),
+    ("set_render_engine", "engine"): ("CYCLES", "BLENDER_EEVEE", "BLENDER_EEVEE_NEXT", "BLENDER_WORKBENCH"),
+}
+
+# Parameters that must be whole numbers (counts, indices, subdivision levels);
+# other parameters with an integer default also accept fractions
+INTEGER_PARAMS = {
+    "count", "chain_count", "segments", "subdivisions", "iterations", "levels", "render_levels",
+    "steps", "sub_steps", "blur_steps", "cuts", "number_cuts", "edge_index", "sides", "resolution",
+    "spatial_size", "u", "v", "w", "samples", "preview_samples", "max_subdiv", "seed", "limit",
+    "page_size", "batch_size", "start", "end", "fps", "frame_start", "frame_end", "radius", "spacing",
+}
+
+# Allowed ranges in degrees, keyed by (tool, parameter)
+ANGLE_RANGES = {
+    ("add_ik_constraint", "pole_angle"): (-180.0, 180.0),
+    ("edge_split", "angle"): (0.0, 180.0),
+    ("add_simple_deform_modifier", "angle"): (-360.0, 360.0),
+    ("apply_simple_deform_bend", "angle"): (-360.0, 360.0),
+    ("add_screw_modifier", "angle"): (-360.0, 360.0),
+    ("screw_mesh", "angle"): (-360.0, 360.0),
+    ("spin_mesh", "angle"): (-360.0, 360.0),
+    ("spin_selected_region", "angle"): (-360.0, 360.0),
+}
+
+_ENUM_RE = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+class ArgumentError(ValueError):
+    pass
+
+def _number(value, name):
+    if isinstance(value, bool):
+        raise ArgumentError(f"'{name}' must be a number, got a boolean")
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ArgumentError(f"'{name}' must be a number, got '{value}'")
+    if not isinstance(value, (int, float)):
+        raise ArgumentError(f"'{name}' must be a number, got {type(value).__name__}")
+    if not math.isfinite(value):
+        raise ArgumentError(f"'{name}' must be finite")
+    return value
+
+def _float_coercer(name):
+    def coerce(value):
+        return float(_number(value, name))
+    return coerce
+
+def _int_coercer(name):
+    def coerce(value):
+        value = _number(value, name)
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ArgumentError(f"'{name}' must be an integer, got {value}")
+            value = int(value)
+        return value
+    return coerce
+
+def _number_coercer(name):
+    def coerce(value):
+        return _number(value, name)
+    return coerce
+
+def _angle_coercer(name, low, high):
+    def coerce(value):
+        value = float(_number(value, name))
+        if not low <= value <= high:
+            raise ArgumentError(f"'{name}' must be between {low:g} and {high:g} degrees, got {value:g}")
+        return value
+    return coerce
+
+def _bool_coercer(name):
+    def coerce(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        raise ArgumentError(f"'{name}' must be a boolean, got {value!r}")
+    return coerce
+
+def _vector_coercer(name, size, pad=None):
+    def coerce(value):
+        if value is None:
+            return None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # A scalar scale/size is broadcast to every axis
+            return (float(_number(value, name)),) * size
+        if not isinstance(value, (list, tuple)):
+            raise ArgumentError(f"'{name}' must be a list of {size} numbers")
+        if pad is not None and len(value) == size - 1:
+            value = list(value) + [pad]
+        if len(value) != size:
+            raise ArgumentError(f"'{name}' must have {size} components, got {len(value)}")
+        return tuple(_number(v, name) for v in value)
+    return coerce
+
+def _enum_coercer(name, choices=None):
+    def coerce(value):
+        if not isinstance(value, str):
+            raise ArgumentError(f"'{name}' must be a string")
+        normalized = value.strip().upper().replace(" ", "_")
+        if choices and normalized not in choices:
+            raise ArgumentError(f"'{name}' must be one of {', '.join(choices)}, got '{value}'")
+        return normalized
+    return coerce
+
+def _coercer_for(tool_name, param):
+    name = param.name
+    default = param.default
+    choices = ENUM_CHOICES.get((tool_name, name))
+    if choices:
+        return _enum_coercer(name, choices)
+    angles = ANGLE_RANGES.get((tool_name, name))
+    if angles:
+        return _angle_coercer(name, *angles)
+    if default is inspect.Parameter.empty or default is None:
+        return _vector_coercer(name, 3) if name in VECTOR_PARAMS else None
+    if isinstance(default, bool):
+        return _bool_coercer(name)
+    if isinstance(default, int):
+        return _int_coercer(name) if name in INTEGER_PARAMS else _number_coercer(name)
+    if isinstance(default, float):
+        return _float_coercer(name)
+    if isinstance(default, (tuple, list)) and default and all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in default):
+        # Colors given as RGB get an opaque alpha appended
+        pad = 1.0 if len(default) == 4 and "color" in name else None
+        return _vector_coercer(name, len(default), pad)
+    if isinstance(default, str) and _ENUM_RE.match(default):
+        return _enum_coercer(name)
+    return None
+
+def compile_validator(tool_name, fn):
+    """Builds a validator for fn's signature.
+
+    The returned callable takes an args dict and returns (args, errors) where
+    args has been coerced to the types the tool expects.
+    """
+    try:
+        signature = inspect.signature(fn)
+    except (TypeError, ValueError):
+        return lambda args: (args, [])
+
+    params = {}
+    required = []
+    accepts_any = False
+    for param in signature.parameters.values():
+        if param.kind is inspect.Parameter.VAR_KEYWORD:
+            accepts_any = True
+            continue
+        if param.kind is inspect.Parameter.VAR_POSITIONAL:
+            continue
+        params[param.name] = _coercer_for(tool_name, param)
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+
+    def validate(args):
+        errors = []
+        fixed = {}
+        for key, value in args.items():
+            if key not in params:
+                if not accepts_any:
+                    errors.append(f"Unexpected argument '{key}' (expected: {', '.join(params) or 'none'})")
+                    continue
+                fixed[key] = value
+                continue
+            coerce = params[key]
+            if coerce is None:
+                fixed[key] = value
+                continue
+            try:
+                fixed[key] = coerce(value)
+            except ArgumentError as e:
+                errors.append(str(e))
+        for key in required:
+            if key not in args:
+                errors.append(f"Missing required argument '{key}'")
+        return fixed, errors
+
+    return validate
@@ -0,0 +1,38 @@
+"""Runs the engine behind the JSON-RPC/MCP socket server without a UI.
+
+    blender --background --python blender_mcp/headless.py -- --port 9876 --socket /tmp/blender_mcp.sock
+"""
+import argparse
+import os
+import sys
+
+def parse_args(argv):
+    # Blender passes its own arguments; ours follow the "--" separator
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="blender_mcp.headless")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9876, help="TCP port, 0 picks a free one, -1 disables TCP")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    parser.add_argument("--token", default=os.environ.get("BLENDER_MCP_TOKEN"),
+                        help="token TCP clients send with initialize (default: $BLENDER_MCP_TOKEN or a random one)")
+    parser.add_argument("--journal", default=None, help="journal executed commands to this file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(sys.argv if argv is None else argv)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from blender_mcp.core.engine import AtomicEngine
+    from blender_mcp.core.server import run_headless
+
+    engine = AtomicEngine(journal_path=args.journal)
+    run_headless(
+        engine,
+        host=args.host,
+        port=None if args.port < 0 else args.port,
+        socket_path=args.socket,
+        token=args.token,
+    )
+
+if __name__ == "__main__":
+    main()
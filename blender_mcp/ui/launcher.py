@@ -2,21 +2,51 @@ import webview
 import threading
 import os
 import bpy
-from ..core.gemini import GeminiManager
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from ..core.cache import ResponseCache
+from ..core.catalog import ModelCatalog, list_models_rest, list_models_sdk
+from ..core.gemini import AsyncGeminiClient, GeminiManager, RequestCancelled
+from ..core.history import ChatHistory
 from ..core.engine import AtomicEngine
-from ..utils.vision import get_base64_viewport
+from ..core.dispatch import gather
+from ..core.journal import READ_ONLY_TOOLS
+from ..core.parser import CommandStream, extract_commands
+from ..utils.encoding import ViewportEncoder
+from ..utils.paths import cache_dir
+from ..utils.vision import get_encoded_viewport, get_scene_fingerprint, get_scene_summary
 
 class UIBridge:
     def __init__(self):
         self.engine = AtomicEngine()
         self.gemini = None
         self._window = None
+        self._pending_results = []
+        self.command_timeout = 60.0
+        self.stream_responses = True
+        # Extra model turns per message that report errors and query results back
+        self.max_followups = 2
+        self.encoder = ViewportEncoder()
+        self.catalog = ModelCatalog(os.path.join(cache_dir(), "models.json"))
 
     def set_window(self, window):
         self._window = window
 
-    def init_gemini(self, api_key, model_name):
-        self.gemini = GeminiManager(api_key, model_name)
+    def init_gemini(self, api_key, model_name, function_calling=False, history=None, cache=None, client=None,
+                    api_endpoint=None):
+        if self.gemini:
+            self.gemini.close()
+        if not model_name:
+            model_name = self.catalog.pick(function_calling=function_calling) or "gemini-1.5-flash"
+        self.gemini = GeminiManager(
+            api_key, model_name,
+            tools=self.engine.tools if function_calling else None,
+            history=history,
+            cache=cache,
+            client=client,
+            api_endpoint=api_endpoint,
+        )
+        # A new conversation has not seen any screenshot yet
+        self.encoder.reset()
 
     def get_settings(self):
         prefs = bpy.context.preferences.addons['blender_mcp'].preferences
@@ -30,76 +60,244 @@ class UIBridge:
         prefs.api_key = api_key
         prefs.model_name = model_name
         # Re-init Gemini with new settings
-        self.init_gemini(api_key, model_name)
+        self.encoder = encoder_from_prefs(prefs)
+        self.catalog.fetch = catalog_fetch_from_prefs(prefs)
+        self.init_gemini(api_key, model_name, **gemini_options_from_prefs(prefs))
         return {"status": "success"}
 
     def fetch_available_models(self, api_key):
-        return GeminiManager.list_available_models(api_key)
+        """Answers from the model catalog; it refreshes itself in the background when stale."""
+        models = self.catalog.models(api_key, wait=5.0)
+        current = self.gemini.model_name if self.gemini else None
+        if current and not any(m["name"] == current for m in models):
+            # Keep the configured model selectable when offline or not listed
+            models = [{"name": current, "display_name": current}] + models
+        return models
 
     def send_to_gemini(self, message):
         if not self.gemini:
             return {"text": "Please configure your Gemini API Key in Blender preferences first.", "feedback_loop": False}
 
         # Automatically take screenshot on main thread
-        import threading
-        result = {"image_data": None}
-        event = threading.Event()
+        use_cache = self.gemini.cache is not None
+        try:
+            image_data, summary, fingerprint = self.engine.dispatcher.call(
+                _capture_turn_context, self.encoder, use_cache, timeout=5.0)
+        except FutureTimeoutError:
+            image_data, summary, fingerprint = None, None, None
+
+        # Results the model has not seen yet ride along with this message
+        tool_results = self._pending_results
+        self._pending_results = []
+
+        try:
+            turn = self._exchange(message, image_data, tool_results, summary, fingerprint, use_cache)
+        except RequestCancelled:
+            # The model never saw these results; send them with the next message
+            self._pending_results = tool_results
+            return {"text": "Request cancelled.", "results": [], "parse_errors": [], "usage": {},
+                    "feedback_loop": False, "feedback_message": ""}
+        texts = [turn["text"]]
+        results = list(turn["results"])
+        parse_errors = list(turn["parse_errors"])
 
-        def capture_task():
-            result["image_data"] = get_base64_viewport()
-            event.set()
-            return None
+        # Errors and looked-up data go back to the model in this same turn, so it
+        # can fix or use them before the user types again
+        rounds = 0
+        while rounds < self.max_followups and not turn["feedback_loop"] and _needs_followup(turn):
+            rounds += 1
+            try:
+                turn = self._exchange(FOLLOWUP_MESSAGE, None, turn["report"], None, None, False)
+            except RequestCancelled:
+                texts.append("[Cancelled]")
+                break
+            texts.append(turn["text"])
+            results.extend(turn["results"])
+            parse_errors.extend(turn["parse_errors"])
+        # Plain confirmations are not worth a model call; they go with the next message
+        self._pending_results = turn["report"]
 
-        bpy.app.timers.register(capture_task)
-        event.wait(timeout=5.0) # Wait for capture
+        return {
+            "text": "\n\n".join(text for text in texts if text),
+            "results": results,
+            "parse_errors": parse_errors,
+            "usage": self.gemini.last_usage,
+            "feedback_loop": turn["feedback_loop"],
+            "feedback_message": turn["feedback_message"],
+        }
 
-        image_data = result["image_data"]
+    def _exchange(self, message, image_data, tool_results, summary, fingerprint, use_cache):
+        """Sends one message, runs the commands in the reply and gathers their results.
 
-        # Get response from Gemini
-        response_text = self.gemini.send_message(message, image_data)
+        Returns a dict with the reply text, per-command results, parse errors,
+        the feedback request, and "report": the results in the form they are
+        sent back to the model.
+        """
+        cached = self.gemini.cached_reply(message, fingerprint, image_data, tool_results, summary) if use_cache else None
+        if cached is not None:
+            response_text, commands = cached["text"], cached["commands"]
+            pending = [(commands, self.engine.submit_batch(commands, validate=True))] if commands else []
+            parse_errors = []
+        elif self.gemini.function_calling:
+            response_text, commands = self.gemini.send_message_with_tools(
+                message, image_data, tool_results=tool_results, summary=summary)
+            pending = [(commands, self.engine.submit_batch(commands, validate=True))] if commands else []
+            parse_errors = []
+        elif self.stream_responses:
+            response_text, pending, parse_errors = self._stream_reply(message, image_data, tool_results, summary)
+        else:
+            response_text = self.gemini.send_message(message, image_data, tool_results=tool_results, summary=summary)
+            commands, parse_errors = extract_commands(response_text)
+            pending = [(commands, self.engine.submit_batch(commands, validate=True))] if commands else []
+        if self.gemini.last_usage.get("cancelled"):
+            response_text += "\n[Cancelled]"
 
-        # Extract and execute commands
-        commands = self.gemini.extract_commands(response_text)
+        commands = [cmd for group, _ in pending for cmd in group]
         feedback_requested = False
         feedback_message = ""
 
         for cmd in commands:
-            # Execute and check for feedback request
-            # Since we execute in main thread via timer, we need a way to get results back
-            # For feedback loop, we'll assume the engine returns it
-            # Actually, execute_tool returns the dict. Let's make execute_in_main_thread return it or handle it.
-
-            # For simplicity, we'll check if any command is request_feedback
-            if cmd['tool'] == 'request_feedback':
+            if cmd.get('tool') == 'request_feedback':
                 feedback_requested = True
-                feedback_message = cmd['args'].get('message', 'Result of previous action.')
+                feedback_message = cmd.get('args', {}).get('message', 'Result of previous action.')
 
-            self.execute_in_main_thread(cmd)
+        # Replies that asked to look again depend on the screenshot, not just the scene
+        if use_cache and cached is None and commands and not parse_errors and not feedback_requested:
+            self.gemini.cache_reply(message, fingerprint, response_text, commands)
 
+        results = []
+        if pending:
+            batches = gather([future for _, future in pending], timeout=self.command_timeout)
+            for (group, _), batch in zip(pending, batches):
+                per_command = batch.get("results") or [batch] * len(group)
+                results.extend(
+                    {"tool": cmd.get('tool'), "result": result}
+                    for cmd, result in zip(group, per_command)
+                )
+        # Blocks that could not be parsed are reported back so the model can resend them
+        report = results + [
+            {"tool": None, "result": {"status": "error", "message": f"Unparsed command block: {e['message']}",
+                                      "snippet": e["snippet"]}}
+            for e in parse_errors
+        ]
         return {
             "text": response_text,
+            "results": results,
+            "parse_errors": parse_errors,
+            "report": report,
             "feedback_loop": feedback_requested,
-            "feedback_message": feedback_message
+            "feedback_message": feedback_message,
         }
 
+    def _stream_reply(self, message, image_data, tool_results, summary=None):
+        """Streams the reply and queues each group of completed commands as it arrives.
+
+        Returns the full text, a list of (commands, future) pairs and the parse
+        errors. Bad arguments are rejected on this thread instead of costing
+        main-thread time.
+        """
+        stream = CommandStream()
+        pending = []
+
+        def dispatch(completed):
+            if completed:
+                pending.append((completed, self.engine.submit_batch(completed, validate=True, undo_message=None)))
+
+        for chunk in self.gemini.send_message_stream(message, image_data, tool_results=tool_results, summary=summary):
+            dispatch(stream.feed(chunk))
+        dispatch(stream.close())
+        if pending:
+            # One undo step for the whole reply, queued behind its last command
+            self.engine.dispatcher.submit(self.engine.finalize_batch, "Gemini Commands")
+        return stream.text, pending, stream.errors
+
+    def cancel_request(self):
+        """Called from the UI to abort the model request in flight."""
+        if not self.gemini:
+            return {"status": "success", "cancelled": 0}
+        return {"status": "success", "cancelled": self.gemini.cancel()}
+
     def execute_in_main_thread(self, cmd):
-        def run():
-            self.engine.execute_tool(cmd['tool'], cmd['args'])
-            return None # Timers need a return value
+        return self.engine.submit_command(cmd)
 
-        bpy.app.timers.register(run)
+    def get_queue_stats(self):
+        return self.engine.dispatcher.get_stats()
 
     def close(self):
+        if self.gemini:
+            self.gemini.close()
+        self.engine.close()
         if self._window:
             self._window.destroy()
 
+# Sent in place of a user message when results go straight back to the model
+FOLLOWUP_MESSAGE = ("Here are the results of the commands you just ran. Fix anything that failed; "
+                    "if nothing is left to do, reply briefly without commands.")
+
+# Tools whose results the model asked for to read, rather than to confirm
+_LOOKUP_TOOLS = READ_ONLY_TOOLS - {"request_feedback", "get_screenshot"}
+
+def _needs_followup(turn):
+    return any(
+        entry["tool"] in _LOOKUP_TOOLS
+        or (isinstance(entry["result"], dict) and entry["result"].get("status") == "error")
+        for entry in turn["report"]
+    )
+
+def _capture_turn_context(encoder, fingerprint=False):
+    return get_encoded_viewport(encoder), get_scene_summary(), get_scene_fingerprint() if fingerprint else None
+
+def history_from_prefs(prefs):
+    return ChatHistory(max_images=prefs.history_images, token_budget=prefs.history_token_budget)
+
+def gemini_options_from_prefs(prefs):
+    """Keyword arguments for init_gemini taken from the add-on preferences."""
+    return {
+        "function_calling": prefs.function_calling,
+        "history": history_from_prefs(prefs),
+        "cache": cache_from_prefs(prefs),
+        "client": AsyncGeminiClient(
+            timeout=prefs.request_timeout,
+            retries=prefs.request_retries,
+            hedge_after=prefs.hedge_after or None,
+        ),
+        "api_endpoint": prefs.api_endpoint or None,
+    }
+
+def catalog_fetch_from_prefs(prefs):
+    endpoint = prefs.api_endpoint
+    if endpoint:
+        return lambda api_key: list_models_rest(api_key, endpoint)
+    return list_models_sdk
+
+def cache_from_prefs(prefs):
+    if not prefs.response_cache:
+        return None
+    return ResponseCache(
+        os.path.join(cache_dir(), "responses.json"),
+        max_entries=prefs.response_cache_size,
+        ttl=prefs.response_cache_ttl_hours * 3600,
+    )
+
+def encoder_from_prefs(prefs):
+    return ViewportEncoder(
+        max_edge=prefs.screenshot_max_edge,
+        format=prefs.screenshot_format,
+        quality=prefs.screenshot_quality,
+        skip_unchanged=prefs.skip_unchanged_screenshots,
+    )
+
 def launch():
     bridge = UIBridge()
 
     # Get API key from preferences
     prefs = bpy.context.preferences.addons['blender_mcp'].preferences
+    bridge.encoder = encoder_from_prefs(prefs)
+    bridge.catalog.fetch = catalog_fetch_from_prefs(prefs)
     if prefs.api_key:
-        bridge.init_gemini(prefs.api_key, prefs.model_name)
+        # Warms the model list so the settings panel opens instantly
+        bridge.catalog.models(prefs.api_key)
+        bridge.init_gemini(prefs.api_key, prefs.model_name, **gemini_options_from_prefs(prefs))
 
     html_path = os.path.join(os.path.dirname(__file__), "index.html")
 
@@ -2,11 +2,11 @@ import sys
 import subprocess
 import importlib.util
 
-def install_package(package_name):
+def install_package(package_name, module_name=None):
     """Installs a python package using pip from within Blender."""
     try:
         # Check if package is already installed
-        if importlib.util.find_spec(package_name.replace("-", "_")):
+        if importlib.util.find_spec(module_name or package_name.replace("-", "_")):
             return True
 
         print(f"Installing {package_name}...")
@@ -24,4 +24,6 @@ def ensure_dependencies():
     for pkg in packages:
         if not install_package(pkg):
             success = False
+    # Optional: faster screenshot encoding; Blender's image API is used without it
+    install_package("Pillow", "PIL")
     return success
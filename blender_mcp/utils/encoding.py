@@ -0,0 +1,163 @@
+import io
+import os
+import tempfile
+
+try:
+    from PIL import Image
+except ImportError:
+    # Not bundled with Blender; the Blender image API is used instead
+    Image = None
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+
+def dhash(gray):
+    """64-bit difference hash of a 9x8 grid of luminance values (row-major)."""
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (gray[row * 9 + col] > gray[row * 9 + col + 1])
+    return bits
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+def _luminance(r, g, b):
+    return 0.299 * r + 0.587 * g + 0.114 * b
+
+def _target_size(width, height, max_edge):
+    edge = max(width, height)
+    if not max_edge or edge <= max_edge:
+        return width, height
+    scale = max_edge / edge
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+class ViewportEncoder:
+    """Downscales and compresses viewport captures before they are sent to the model.
+
+    Each frame is hashed first; when the difference hash is within
+    `hash_threshold` bits of the last frame sent, the result is
+    {"data": None, "unchanged": True} instead of a newly encoded image.
+    Pillow is used when installed, otherwise Blender's own image API.
+    """
+
+    def __init__(self, max_edge=1024, format="JPEG", quality=80, skip_unchanged=True, hash_threshold=3):
+        self.max_edge = max_edge
+        self.format = format.upper()
+        self.quality = quality
+        self.skip_unchanged = skip_unchanged
+        self.hash_threshold = hash_threshold
+        self._last_hash = None
+
+    def reset(self):
+        """Forgets the last frame so the next one is always sent."""
+        self._last_hash = None
+
+    def is_unchanged(self, frame_hash):
+        """Checks a frame hash against the last frame sent and remembers it if it differs."""
+        if self.skip_unchanged and self._last_hash is not None \
+                and hamming(frame_hash, self._last_hash) <= self.hash_threshold:
+            return True
+        self._last_hash = frame_hash
+        return False
+
+    def _result(self, data, size, frame_hash):
+        return {
+            "data": data,
+            "mime_type": MIME_TYPES[self.format],
+            "width": size[0],
+            "height": size[1],
+            "bytes": len(data) if data else 0,
+            "hash": frame_hash,
+            "unchanged": data is None,
+        }
+
+    def encode_file(self, path):
+        if Image is not None:
+            with Image.open(path) as image:
+                return self._encode_pil(image)
+        return self._encode_blender(path)
+
+    def encode_pixels(self, width, height, pixels):
+        """Encodes a raw RGBA uint8 buffer, bottom row first, as read back from the GPU."""
+        import numpy as np
+        rgba = np.frombuffer(pixels, dtype=np.uint8) if isinstance(pixels, (bytes, bytearray, memoryview)) \
+            else np.asarray(pixels, dtype=np.uint8)
+        rgba = rgba.reshape(height, width, 4)[::-1]
+        frame_hash = dhash(_grid_luminance(rgba))
+        if self.is_unchanged(frame_hash):
+            return self._result(None, (width, height), frame_hash)
+        if Image is not None:
+            return self._encode_pil(Image.fromarray(np.ascontiguousarray(rgba), "RGBA"), frame_hash)
+
+        import bpy
+        image = bpy.data.images.new("blender_mcp_capture", width, height, alpha=True)
+        try:
+            image.pixels.foreach_set((rgba[::-1].astype(np.float32) / 255.0).ravel())
+            return self._save_blender(image, frame_hash)
+        finally:
+            bpy.data.images.remove(image)
+
+    def _encode_pil(self, image, frame_hash=None):
+        if frame_hash is None:
+            frame_hash = dhash(list(image.convert("L").resize((9, 8), Image.BILINEAR).getdata()))
+            if self.is_unchanged(frame_hash):
+                return self._result(None, image.size, frame_hash)
+        size = _target_size(image.width, image.height, self.max_edge)
+        image = image.convert("RGB" if self.format == "JPEG" else "RGBA")
+        if size != image.size:
+            image = image.resize(size, Image.BILINEAR)
+        buffer = io.BytesIO()
+        if self.format == "PNG":
+            image.save(buffer, format="PNG", optimize=False)
+        else:
+            image.save(buffer, format=self.format, quality=self.quality)
+        return self._result(buffer.getvalue(), size, frame_hash)
+
+    def _encode_blender(self, path):
+        import bpy
+        image = bpy.data.images.load(path, check_existing=False)
+        try:
+            probe = image.copy()
+            probe.scale(9, 8)
+            pixels = list(probe.pixels)
+            bpy.data.images.remove(probe)
+            # Blender stores rows bottom-up; flip to match the row-major grid
+            rows = [pixels[row * 36:(row + 1) * 36] for row in range(8)][::-1]
+            gray = [_luminance(*row[i:i + 3]) for row in rows for i in range(0, 36, 4)]
+            frame_hash = dhash(gray)
+            if self.is_unchanged(frame_hash):
+                return self._result(None, tuple(image.size), frame_hash)
+            return self._save_blender(image, frame_hash)
+        finally:
+            bpy.data.images.remove(image)
+
+    def _save_blender(self, image, frame_hash):
+        # Blender can only encode to a file; each call gets its own
+        width, height = image.size
+        size = _target_size(width, height, self.max_edge)
+        if size != (width, height):
+            image.scale(*size)
+        image.file_format = self.format
+        fd, out_path = tempfile.mkstemp(suffix=EXTENSIONS[self.format], prefix="blender_mcp_")
+        os.close(fd)
+        try:
+            image.save(filepath=out_path, quality=self.quality)
+            with open(out_path, "rb") as f:
+                data = f.read()
+        finally:
+            os.remove(out_path)
+        return self._result(data, size, frame_hash)
+
+def _grid_luminance(rgba):
+    """Mean luminance of a 9x8 grid of blocks over an (h, w, 4) uint8 array, top row first."""
+    height, width = rgba.shape[:2]
+    bh, bw = max(height // 8, 1), max(width // 9, 1)
+    if height < 8 or width < 9:
+        rows = [min(r * height // 8, height - 1) for r in range(8)]
+        cols = [min(c * width // 9, width - 1) for c in range(9)]
+        grid = rgba[rows][:, cols, :3].astype("float32")
+    else:
+        grid = rgba[:bh * 8, :bw * 9, :3].astype("float32").reshape(8, bh, 9, bw, 3).mean(axis=(1, 3))
+    gray = 0.299 * grid[..., 0] + 0.587 * grid[..., 1] + 0.114 * grid[..., 2]
+    return gray.ravel().tolist()
@@ -2,12 +2,27 @@ import bpy
 import os
 import tempfile
 
+def _find_view3d():
+    """Returns (window, area, region) of the first 3D viewport, or Nones."""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                for region in area.regions:
+                    if region.type == 'WINDOW':
+                        return window, area, region
+    return None, None, None
+
 def capture_viewport():
-    """Captures the current 3D viewport and returns the path to the saved image."""
+    """Captures the current 3D viewport and returns the path to the saved image.
+
+    Each capture gets its own private temporary file, which the caller
+    removes. If the render writes nothing the file is removed here and None
+    is returned, so a failed render is not mistaken for an empty image.
+    """
+    # Created owner-only under an unpredictable name; the render overwrites it
+    fd, file_path = tempfile.mkstemp(suffix=".png", prefix="blender_mcp_viewport_")
+    os.close(fd)
     try:
-        # Create a temporary file for the screenshot
-        temp_dir = tempfile.gettempdir()
-        file_path = os.path.join(temp_dir, "blender_mcp_viewport.png")
 
         # Set render settings for viewport capture
         scene = bpy.context.scene
@@ -18,45 +33,137 @@ def capture_viewport():
         scene.render.filepath = file_path
 
         # Find 3D Viewport context
-        override = None
-        for window in bpy.context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type == 'VIEW_3D':
-                    for region in area.regions:
-                        if region.type == 'WINDOW':
-                            override = {
-                                'window': window,
-                                'screen': window.screen,
-                                'area': area,
-                                'region': region,
-                                'scene': scene,
-                            }
-                            break
-                    if override: break
-            if override: break
-
-        if override:
-            with bpy.context.temp_override(**override):
+        window, area, region = _find_view3d()
+        try:
+            if region is not None:
+                override = {
+                    'window': window,
+                    'screen': window.screen,
+                    'area': area,
+                    'region': region,
+                    'scene': scene,
+                }
+                with bpy.context.temp_override(**override):
+                    bpy.ops.render.opengl(write_still=True)
+            else:
+                # Fallback
                 bpy.ops.render.opengl(write_still=True)
-        else:
-            # Fallback
-            bpy.ops.render.opengl(write_still=True)
-
-        # Restore settings
-        scene.render.image_settings.file_format = original_format
-        scene.render.filepath = original_path
+        finally:
+            # Restore settings
+            scene.render.image_settings.file_format = original_format
+            scene.render.filepath = original_path
 
-        return file_path
+        if os.path.getsize(file_path):
+            return file_path
     except Exception as e:
         print(f"Error capturing viewport: {e}")
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    return None
+
+def capture_viewport_pixels():
+    """Draws the 3D viewport into an offscreen buffer and returns its pixels.
+
+    Returns {"width", "height", "pixels"} with pixels as a flat uint8 RGBA
+    NumPy array, bottom row first, or None when no viewport or GPU context is
+    available (e.g. `blender --background`). Render settings and disk are
+    left untouched.
+    """
+    try:
+        import gpu
+        import numpy as np
+    except ImportError:
+        return None
+    window, area, region = _find_view3d()
+    if region is None:
+        return None
+    try:
+        space = area.spaces.active
+        width, height = region.width, region.height
+        offscreen = gpu.types.GPUOffScreen(width, height)
+        try:
+            offscreen.draw_view3d(
+                bpy.context.scene,
+                bpy.context.view_layer,
+                space,
+                region,
+                space.region_3d.view_matrix,
+                space.region_3d.window_matrix,
+                do_color_management=True,
+            )
+            with offscreen.bind():
+                framebuffer = gpu.state.active_framebuffer_get()
+                buffer = framebuffer.read_color(0, 0, width, height, 4, 0, 'UBYTE')
+        finally:
+            offscreen.free()
+        buffer.dimensions = width * height * 4
+        try:
+            pixels = np.frombuffer(buffer, dtype=np.uint8).copy()
+        except (TypeError, ValueError):
+            # Builds whose gpu.types.Buffer lacks the buffer protocol
+            pixels = np.array(buffer.to_list(), dtype=np.uint8)
+        return {"width": width, "height": height, "pixels": pixels}
+    except Exception as e:
+        print(f"Offscreen viewport capture failed: {e}")
         return None
 
-def get_base64_viewport():
-    """Captures the viewport and returns the base64 encoded image."""
-    import base64
-    path = capture_viewport()
-    if path and os.path.exists(path):
-        with open(path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-        return encoded_string
-    return None
+def get_encoded_viewport(encoder):
+    """Captures the viewport and runs it through a ViewportEncoder.
+
+    The offscreen capture is tried first and the render-to-file capture is
+    the fallback. Returns the encoder's result (data is None when the view is
+    unchanged), or None if the capture failed.
+    """
+    try:
+        frame = capture_viewport_pixels()
+        if frame is not None:
+            return encoder.encode_pixels(frame["width"], frame["height"], frame["pixels"])
+        path = capture_viewport()
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return encoder.encode_file(path)
+        finally:
+            os.remove(path)
+    except Exception as e:
+        print(f"Error encoding viewport: {e}")
+        return None
+
+def get_scene_summary(max_names=8):
+    """Describes the scene in one line; kept in the chat history in place of old screenshots."""
+    counts = {}
+    for obj in bpy.data.objects:
+        counts[obj.type] = counts.get(obj.type, 0) + 1
+    summary = ", ".join(f"{n} {kind.lower()}" for kind, n in sorted(counts.items())) or "empty scene"
+    active = bpy.context.view_layer.objects.active
+    if active is not None:
+        summary += f"; active: {active.name}"
+    selected = [obj.name for obj in bpy.context.selected_objects[:max_names]]
+    if selected:
+        summary += f"; selected: {', '.join(selected)}"
+    return summary
+
+def get_scene_fingerprint(precision=3):
+    """Short hash of the scene state a reply depends on.
+
+    Covers each object's name, type, transform (rounded to `precision`
+    decimals), materials and modifiers, plus the active and selected objects,
+    so a cached reply is only replayed when the scene has not changed.
+    """
+    import hashlib
+    state = []
+    for obj in sorted(bpy.data.objects, key=lambda o: o.name):
+        state.append([
+            obj.name,
+            obj.type,
+            [round(v, precision) for v in obj.location],
+            [round(v, precision) for v in obj.rotation_euler],
+            [round(v, precision) for v in obj.scale],
+            [slot.material.name if slot.material else None for slot in obj.material_slots],
+            [mod.type for mod in obj.modifiers],
+            obj.parent.name if obj.parent else None,
+        ])
+    active = bpy.context.view_layer.objects.active
+    selected = sorted(obj.name for obj in bpy.context.selected_objects)
+    raw = repr((state, active.name if active else None, selected, bpy.context.scene.frame_current))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
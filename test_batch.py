@@ -0,0 +1,37 @@
+import sys
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+
+def test_execute_batch():
+    engine = AtomicEngine()
+    engine.tools["test_ok"] = lambda name: {"status": "success", "object": name}
+    engine.tools["test_fail"] = lambda: {"status": "error", "message": "nope"}
+
+    commands = [
+        {"tool": "test_ok", "args": {"name": "A"}},
+        {"tool": "test_fail", "args": {}},
+        {"tool": "test_ok", "args": {"name": "B"}},
+        {"tool": "missing_tool", "args": {}},
+    ]
+    batch = engine.execute_batch(commands)
+
+    if [r.get("object") for r in batch["results"]] != ["A", None, "B", None]:
+        print(f"✗ unexpected results {batch['results']}")
+        return False
+    print("✓ per-command results returned in order")
+    if batch["errors"] != 2 or batch["status"] != "error":
+        print(f"✗ expected 2 errors, got {batch['errors']}")
+        return False
+    print("✓ failures counted without aborting the batch")
+    if len(batch["timings"]["commands"]) != 4 or batch["timings"]["total"] < 0:
+        print("✗ timings missing")
+        return False
+    print("✓ total and per-command timings reported")
+    return True
+
+if __name__ == "__main__":
+    if test_execute_batch():
+        print("Batch test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,102 @@
+import json
+import os
+import sys
+import tempfile
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.cache import ResponseCache, normalize_prompt
+from blender_mcp.core.gemini import GeminiManager
+
+LIGHTING = [{"tool": "add_light", "args": {"type": "AREA", "name": "Key"}}]
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        self.calls += 1
+        return types.SimpleNamespace(text=f"Reply {self.calls}", usage_metadata=None)
+
+def ask(gemini, message, fingerprint):
+    """What the bridge does with a turn: replay from the cache or ask and remember."""
+    cached = gemini.cached_reply(message, fingerprint)
+    if cached is not None:
+        return cached
+    text = gemini.send_message(message)
+    gemini.cache_reply(message, fingerprint, text, LIGHTING)
+    return {"text": text, "commands": LIGHTING}
+
+def test_cache_hits():
+    gemini = GeminiManager("key", "fake-model", cache=ResponseCache())
+    gemini.model = FakeModel()
+    first = ask(gemini, "Set up three-point lighting", "scene-a")
+    again = ask(gemini, "  set up three-point   LIGHTING. ", "scene-a")
+    if gemini.model.calls != 1 or again != first or not gemini.last_usage.get("cached"):
+        print(f"✗ repeated macro not served from the cache: {gemini.model.calls} calls")
+        return False
+    if [t["role"] for t in gemini.history.turns] != ["user", "model", "user", "model"]:
+        print("✗ cached exchange not recorded in the history")
+        return False
+    print("✓ retyped prompt in the same scene replayed without a model call")
+
+    ask(gemini, "set up three-point lighting", "scene-b")
+    other = GeminiManager("key", "other-model", cache=gemini.cache)
+    other.model = FakeModel()
+    ask(other, "set up three-point lighting", "scene-a")
+    if gemini.model.calls != 2 or other.model.calls != 1:
+        print("✗ a changed scene or another model must miss")
+        return False
+    stats = gemini.cache.stats()
+    if (stats["hits"], stats["misses"], stats["entries"]) != (1, 3, 3):
+        print(f"✗ unexpected metrics {stats}")
+        return False
+    print(f"✓ scene and model are part of the key, metrics {stats}")
+    return True
+
+def test_eviction_and_expiry():
+    path = os.path.join(tempfile.mkdtemp(), "responses.json")
+    cache = ResponseCache(path, max_entries=2)
+    for name in ("a", "b"):
+        cache.put(name, f"reply {name}", [])
+    cache.get("a")
+    with open(path) as f:
+        written = [key for key, _ in json.load(f)]
+    cache.flush()
+    with open(path) as f:
+        flushed = [key for key, _ in json.load(f)]
+    if written != ["a", "b"] or flushed != ["b", "a"]:
+        print(f"✗ hit rewrote the file or flush lost the order: {written} {flushed}")
+        return False
+    print("✓ hits reorder in memory only; flush writes the order out")
+    cache.put("c", "reply c", [])
+    if cache.get("b") is not None or cache.get("a") is None or cache.stats()["evictions"] != 1:
+        print(f"✗ least recently used entry not evicted: {cache.stats()}")
+        return False
+    print("✓ least recently used entry evicted at the size cap")
+
+    reloaded = ResponseCache(path, max_entries=2)
+    if reloaded.get("c") is None or len(reloaded) != 2:
+        print("✗ cache not persisted")
+        return False
+    print("✓ entries survive a restart")
+
+    reloaded.ttl = 60
+    reloaded._entries["c"]["time"] -= 120
+    if reloaded.get("c") is not None or reloaded.stats()["expired"] != 1:
+        print("✗ stale entry served")
+        return False
+    print("✓ entries older than the TTL expire")
+
+    if normalize_prompt("Studio　Backdrop!") != "studio backdrop":
+        print("✗ prompt normalisation")
+        return False
+    return True
+
+if __name__ == "__main__":
+    if test_cache_hits() and test_eviction_and_expiry():
+        print("Cache test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.catalog import ModelCatalog
+
+LISTING = [
+    {"name": "gemini-1.5-flash", "display_name": "Gemini 1.5 Flash", "input_token_limit": 1000000,
+     "methods": ["generateContent", "countTokens"]},
+    {"name": "gemini-2.0-flash-exp", "display_name": "Gemini 2.0 Flash (exp)", "input_token_limit": 1000000,
+     "methods": ["generateContent"]},
+    {"name": "gemini-1.5-pro", "display_name": "Gemini 1.5 Pro", "input_token_limit": 2000000,
+     "methods": ["generateContent"]},
+    {"name": "gemini-1.0-pro", "display_name": "Gemini 1.0 Pro", "input_token_limit": 30720,
+     "methods": ["generateContent"]},
+    {"name": "text-embedding-004", "display_name": "Embedding", "input_token_limit": 2048,
+     "methods": ["embedContent"]},
+]
+
+class FakeLister:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.offline = False
+
+    def __call__(self, api_key):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.offline:
+            raise ConnectionError("offline")
+        return [dict(m) for m in LISTING]
+
+def test_catalog():
+    path = os.path.join(tempfile.mkdtemp(), "models.json")
+    lister = FakeLister()
+    catalog = ModelCatalog(path, fetch=lister)
+    models = catalog.models("key", wait=2.0)
+    if [m["name"] for m in models] != ["gemini-1.5-flash", "gemini-2.0-flash-exp", "gemini-1.5-pro", "gemini-1.0-pro"]:
+        print(f"✗ first listing not waited for or not filtered: {models}")
+        return False
+    flash, old = catalog.get("gemini-1.5-flash"), catalog.get("gemini-1.0-pro")
+    if not (flash["vision"] and flash["function_calling"] and flash["context_size"] == 1000000) or old["vision"]:
+        print(f"✗ wrong capability flags {flash} {old}")
+        return False
+    print("✓ first listing fetched once, with vision, function calling and context flags")
+
+    if catalog.pick() != "gemini-1.5-flash" or catalog.pick(prefer="pro") != "gemini-1.5-pro":
+        print(f"✗ auto-pick chose {catalog.pick()}")
+        return False
+    print("✓ auto-pick prefers stable models with the wanted capabilities")
+
+    # A restart offline: answered from disk instantly, the failed refresh keeps the listing
+    lister = FakeLister(delay=0.5)
+    lister.offline = True
+    reopened = ModelCatalog(path, ttl=0, fetch=lister)
+    start = time.perf_counter()
+    models = reopened.models("key", wait=2.0)
+    elapsed = time.perf_counter() - start
+    if len(models) != 4 or elapsed > 0.1:
+        print(f"✗ cached listing not returned instantly: {len(models)} in {elapsed:.2f}s")
+        return False
+    reopened._refreshing.join(2.0)
+    if lister.calls != 1 or len(reopened.models("key")) != 4 or reopened.last_error != "offline":
+        print("✗ stale listing not refreshed in the background or lost on failure")
+        return False
+    print(f"✓ offline start answered from disk in {elapsed * 1000:.1f} ms, refresh ran in the background")
+
+    fresh = ModelCatalog(path, fetch=FakeLister())
+    fresh.models("key")
+    if fresh._refreshing is not None:
+        print("✗ fresh cache refreshed anyway")
+        return False
+    fresh.models("other-key")
+    if fresh._refreshing is None:
+        print("✗ a different API key should refresh")
+        return False
+    print("✓ refresh only when stale or the API key changes")
+    return True
+
+if __name__ == "__main__":
+    if test_catalog():
+        print("Catalog test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,87 @@
+import sys
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.dispatch import MainThreadDispatcher, gather
+
+def test_dispatch_order_and_budget():
+    dispatcher = MainThreadDispatcher(budget=10.0)
+    order = []
+    for i in range(40):
+        dispatcher.submit(order.append, i)
+
+    if dispatcher.depth() != 40:
+        print(f"✗ expected depth 40, got {dispatcher.depth()}")
+        return False
+    print("✓ 40 commands queued behind a single pump")
+
+    dispatcher.drain()
+    if order != list(range(40)):
+        print("✗ submission order not preserved")
+        return False
+    print("✓ submission order preserved")
+
+    # A zero budget still makes progress one job per tick
+    for i in range(3):
+        dispatcher.submit(order.append, i)
+    dispatcher.drain(budget=0.0)
+    stats = dispatcher.get_stats()
+    if stats["last_tick"]["drained"] != 1 or stats["depth"] != 2:
+        print(f"✗ unexpected tick stats {stats}")
+        return False
+    print("✓ per-tick budget respected")
+    return True
+
+def test_dispatch_futures():
+    dispatcher = MainThreadDispatcher()
+
+    def fail():
+        raise ValueError("boom")
+
+    futures = [
+        dispatcher.submit(lambda: {"status": "success", "object": "Cube"}),
+        dispatcher.submit(fail),
+        dispatcher.submit(lambda: {"status": "success"}),
+    ]
+    dispatcher.drain()
+    results = gather(futures, timeout=1.0)
+    if results[0].get("object") != "Cube":
+        print(f"✗ result not returned: {results[0]}")
+        return False
+    print("✓ tool result returned through future")
+    if results[1] != {"status": "error", "message": "boom"}:
+        print(f"✗ exception not reported: {results[1]}")
+        return False
+    print("✓ exception reported as error result")
+
+    pending = dispatcher.submit(lambda: None)
+    timed_out = gather([pending], timeout=0.01)[0]
+    if timed_out.get("status") != "error" or not pending.cancelled():
+        print("✗ undrained future did not time out")
+        return False
+    print("✓ gather times out and cancels undrained jobs")
+
+    ran, errors = [], []
+
+    def worker():
+        try:
+            dispatcher.call(ran.append, "late capture", timeout=0.01)
+        except FutureTimeoutError:
+            errors.append("timeout")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    dispatcher.drain()
+    if errors != ["timeout"] or ran:
+        print(f"✗ timed out call still ran: {ran} {errors}")
+        return False
+    print("✓ call cancels its job on timeout instead of running it late")
+    return True
+
+if __name__ == "__main__":
+    if test_dispatch_order_and_budget() and test_dispatch_futures():
+        print("Dispatch test PASSED")
+    else:
+        sys.exit(1)
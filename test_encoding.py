@@ -0,0 +1,119 @@
+import glob
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.gemini import GeminiManager
+from blender_mcp.utils import vision
+from blender_mcp.utils.encoding import ViewportEncoder, _grid_luminance, _target_size, dhash, hamming
+
+def test_change_detection():
+    frame = [float((row * 7 + col * 13) % 17) for row in range(8) for col in range(9)]
+    noisy = [v + 0.01 for v in frame]
+    noisy[5] += 5.0
+    different = [17.0 - v for v in frame]
+
+    base = dhash(frame)
+    if hamming(base, dhash(noisy)) > 3 or hamming(base, dhash(different)) < 16:
+        print(f"✗ hash distances {hamming(base, dhash(noisy))} / {hamming(base, dhash(different))}")
+        return False
+    print("✓ small edits stay within a few bits, a different frame does not")
+
+    encoder = ViewportEncoder(hash_threshold=3)
+    sent = [not encoder.is_unchanged(dhash(f)) for f in (frame, noisy, frame, different)]
+    if sent != [True, False, False, True]:
+        print(f"✗ unexpected skip decisions {sent}")
+        return False
+    encoder.reset()
+    if encoder.is_unchanged(dhash(different)):
+        print("✗ reset did not force the next frame")
+        return False
+    print("✓ unchanged frames skipped, changed frames and the first frame after reset sent")
+
+    if _target_size(1920, 1080, 1024) != (1024, 576) or _target_size(800, 600, 1024) != (800, 600):
+        print("✗ wrong downscale size")
+        return False
+    print("✓ long edge capped without upscaling")
+    return True
+
+def test_pixel_frames():
+    try:
+        import numpy as np
+    except ImportError:
+        raise unittest.SkipTest("numpy not installed; offscreen pixel path not checked")
+    # A ramp that brightens to the right and darkens downwards
+    pixels = np.zeros((60, 90, 4), dtype=np.uint8)
+    pixels[..., 0] = np.linspace(0, 255, 90, dtype=np.uint8)
+    pixels[..., 1] = np.linspace(255, 0, 60, dtype=np.uint8)[:, None]
+    gray = _grid_luminance(pixels)
+    if dhash(gray) != 0 or not gray[0] > gray[-9]:
+        print(f"✗ pixel grid hashed wrongly: {gray}")
+        return False
+    print("✓ raw pixel frames hashed from a block-averaged grid")
+    return True
+
+def test_capture_file():
+    # The package keeps the bpy stand-in it was first imported with
+    bpy = vision.bpy
+    saved = bpy.ops.render.opengl, bpy.context.window_manager.windows
+    try:
+        return check_capture_file(bpy)
+    finally:
+        bpy.ops.render.opengl, bpy.context.window_manager.windows = saved
+
+def check_capture_file(bpy):
+    def render(write_still):
+        with open(bpy.context.scene.render.filepath, "wb") as f:
+            f.write(b"\x89PNG")
+
+    # No 3D viewport, so the plain render call is used
+    bpy.context.window_manager.windows = []
+    bpy.ops.render.opengl = render
+    paths = [vision.capture_viewport(), vision.capture_viewport()]
+    try:
+        modes = {stat.S_IMODE(os.stat(path).st_mode) for path in paths}
+        if paths[0] == paths[1] or modes != {0o600}:
+            print(f"✗ capture files shared or readable by others: {paths} {modes}")
+            return False
+    finally:
+        for path in paths:
+            os.remove(path)
+    print("✓ each capture gets its own owner-only temporary file")
+
+    pattern = os.path.join(tempfile.gettempdir(), "blender_mcp_viewport_*")
+    before = set(glob.glob(pattern))
+    bpy.ops.render.opengl = lambda write_still: None
+    if vision.capture_viewport() is not None or set(glob.glob(pattern)) != before:
+        print("✗ a render that wrote nothing left a file or returned a path")
+        return False
+    print("✓ a failed render returns None and leaves no file behind")
+    return True
+
+def test_encoded_frame_content():
+    gemini = GeminiManager("key", "fake-model")
+    content = gemini.build_content("hi", {"data": b"\xff\xd8jpeg", "mime_type": "image/jpeg", "unchanged": False})
+    if content[0] != {"mime_type": "image/jpeg", "data": b"\xff\xd8jpeg"}:
+        print(f"✗ encoded frame not attached as is: {content}")
+        return False
+    content = gemini.build_content("hi", {"data": None, "mime_type": "image/jpeg", "unchanged": True})
+    if content != ["[Viewport unchanged since the previous screenshot]", "hi"]:
+        print(f"✗ unchanged frame should be a note: {content}")
+        return False
+    print("✓ encoded bytes sent without a base64 round trip, unchanged frames replaced by a note")
+    return True
+
+if __name__ == "__main__":
+    try:
+        pixels_ok = test_pixel_frames()
+    except unittest.SkipTest as skipped:
+        print(f"- skipped: {skipped}")
+        pixels_ok = True
+    if test_change_detection() and pixels_ok and test_capture_file() and test_encoded_frame_content():
+        print("Encoding test PASSED")
+    else:
+        sys.exit(1)
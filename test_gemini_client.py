@@ -0,0 +1,162 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.gemini import AsyncGeminiClient, GeminiError, GeminiManager, RequestCancelled
+
+class StandIn(ThreadingHTTPServer):
+    """Local generateContent endpoint; `script` lists (delay, status) per request in arrival order."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.script = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            n = len(self.server.requests)
+            self.server.requests.append(body)
+            delay, status = self.server.script[n] if n < len(self.server.script) else (0, 200)
+        time.sleep(delay)
+        if status != 200:
+            self.send_response(status)
+            self.end_headers()
+            self.wfile.write(b'{"error": {"message": "overloaded"}}')
+            return
+        payload = {
+            "candidates": [{"content": {"role": "model", "parts": [
+                {"text": f"reply {n}"},
+                {"functionCall": {"name": "create_primitive", "args": {"type": "CUBE"}}},
+            ]}}],
+            "usageMetadata": {"promptTokenCount": 12, "candidatesTokenCount": 3},
+        }
+        data = json.dumps(payload).encode()
+        if "alt=sse" in self.path:
+            data = b"data: " + data + b"\r\n\r\n"
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this attempt (timeout, cancel or a winning hedge)
+            pass
+
+def manager(server, **client_options):
+    client = AsyncGeminiClient(backoff=0.01, **client_options)
+    return GeminiManager("key", "fake-model", client=client, api_endpoint=server.endpoint)
+
+def test_retry_and_timeout():
+    server = StandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        server.script = [(0, 503), (0, 429), (0, 200)]
+        gemini = manager(server, timeout=2.0)
+        text = gemini.send_message("add a cube")
+        stats = gemini.client.stats()
+        if text != "reply 2" or stats["retries"] != 2 or gemini.last_usage.get("prompt_tokens") != 12:
+            print(f"✗ retryable errors not retried: {text!r} {stats}")
+            return False
+        if server.requests[0]["contents"][0]["parts"] != [{"text": "add a cube"}]:
+            print(f"✗ unexpected request body {server.requests[0]}")
+            return False
+        print("✓ 503 and 429 retried with backoff, third attempt answered")
+
+        server.requests, server.script = [], [(0, 400)]
+        try:
+            gemini.send_message("bad")
+            print("✗ a client error must not be retried")
+            return False
+        except GeminiError as e:
+            if e.status != 400 or len(server.requests) != 1 or len(gemini.history.turns) != 2:
+                print(f"✗ wrong failure handling {e.status} {len(server.requests)}")
+                return False
+        print("✓ non-retryable error raised at once and the turn rolled back")
+
+        server.requests, server.script = [], [(1.0, 200), (1.0, 200)]
+        gemini = manager(server, timeout=0.2, retries=1)
+        start = time.perf_counter()
+        try:
+            gemini.send_message("slow")
+            print("✗ a hung request should time out")
+            return False
+        except GeminiError:
+            elapsed = time.perf_counter() - start
+        if elapsed > 0.8 or gemini.client.stats()["timeouts"] != 2:
+            print(f"✗ timeout not enforced: {elapsed:.2f}s {gemini.client.stats()}")
+            return False
+        print(f"✓ two attempts timed out after {elapsed:.2f}s instead of hanging")
+        return True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_hedging_and_cancel():
+    server = StandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # The first request stalls in the tail; the hedged duplicate answers quickly
+        server.script = [(1.5, 200), (0, 200)]
+        gemini = manager(server, timeout=5.0, hedge_after=0.1)
+        start = time.perf_counter()
+        text = gemini.send_message("hedge me")
+        elapsed = time.perf_counter() - start
+        stats = gemini.client.stats()
+        if text != "reply 1" or elapsed > 1.0 or (stats["hedges"], stats["hedge_wins"]) != (1, 1):
+            print(f"✗ hedged request did not win: {text!r} {elapsed:.2f}s {stats}")
+            return False
+        print(f"✓ hedged duplicate answered in {elapsed:.2f}s while the first took 1.5s")
+
+        server.requests, server.script = [], [(2.0, 200)]
+        gemini = manager(server, timeout=5.0)
+        threading.Timer(0.2, gemini.cancel).start()
+        start = time.perf_counter()
+        try:
+            gemini.send_message("never mind")
+            print("✗ request not cancelled")
+            return False
+        except RequestCancelled:
+            elapsed = time.perf_counter() - start
+        if elapsed > 1.0 or gemini.history.turns:
+            print(f"✗ cancel took {elapsed:.2f}s or left a turn behind")
+            return False
+        print(f"✓ cancelled from another thread after {elapsed:.2f}s")
+
+        server.requests, server.script = [], []
+        chunks = list(gemini.send_message_stream("stream"))
+        if chunks != ["reply 0"]:
+            print(f"✗ streamed reply not parsed: {chunks}")
+            return False
+        _, commands = gemini.parse_function_calls(gemini.model.generate_content([{"role": "user", "parts": ["x"]}]))
+        if commands != [{"tool": "create_primitive", "args": {"type": "CUBE"}}]:
+            print(f"✗ function calls not parsed from REST responses: {commands}")
+            return False
+        print("✓ streaming and function calls work over the REST endpoint")
+        return True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    if test_retry_and_timeout() and test_hedging_and_cancel():
+        print("Gemini client test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,88 @@
+import json
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.gemini import GeminiManager
+from blender_mcp.core.history import ChatHistory
+
+class FakeModel:
+    def __init__(self):
+        self.requests = []
+
+    def generate_content(self, contents, **kwargs):
+        self.requests.append([dict(turn, parts=list(turn["parts"])) for turn in contents])
+        i = len(self.requests)
+        cmd = json.dumps({"tool": "create_primitive", "args": {"type": "CUBE", "name": f"Box{i}"}})
+        return types.SimpleNamespace(
+            text=f"Adding box {i}.\n<blender_cmd>{cmd}</blender_cmd>",
+            usage_metadata=types.SimpleNamespace(prompt_token_count=100 * i, candidates_token_count=20),
+        )
+
+def test_history_compaction():
+    gemini = GeminiManager("key", "fake-model", history=ChatHistory(max_images=2, keep_turns=2))
+    gemini.model = FakeModel()
+    image = "A" * 40000  # base64 screenshot stand-in
+    results = [{"tool": "create_primitive", "result": {"status": "success", "object": "Box"}}]
+
+    usage = []
+    for turn in range(8):
+        gemini.send_message(f"add box {turn}", image_data=image, tool_results=results if turn else None,
+                            summary=f"{turn} mesh")
+        usage.append(dict(gemini.last_usage))
+
+    last = gemini.model.requests[-1]
+    if usage[-1]["images"] != 2 or sum(1 for t in last for p in t["parts"] if isinstance(p, dict)) != 2:
+        print(f"✗ screenshots not pruned: {usage[-1]}")
+        return False
+    if "[Earlier screenshot omitted. Scene then: 0 mesh]" not in last[0]["parts"]:
+        print(f"✗ old screenshot not replaced by its summary: {last[0]}")
+        return False
+    print("✓ only the newest screenshots are sent, older ones become summaries")
+
+    if last[1]["parts"] != ["Adding box 1.\n[ran: create_primitive]"]:
+        print(f"✗ old model turn not collapsed: {last[1]}")
+        return False
+    if last[2]["parts"][1] != "[1 earlier command results, 0 errors]":
+        print(f"✗ old tool results not collapsed: {last[2]}")
+        return False
+    if "<blender_cmd>" not in last[-2]["parts"][0]:
+        print("✗ recent turns should stay verbatim")
+        return False
+    print("✓ old command blocks and tool results collapsed to one line")
+
+    # Request size levels off instead of growing with every turn
+    if usage[-1]["bytes"] > usage[3]["bytes"] * 1.2 or usage[-1]["prompt_tokens"] != 800:
+        print(f"✗ request size kept growing: {[u['bytes'] for u in usage]}")
+        return False
+    print(f"✓ bytes per turn {[u['bytes'] for u in usage]}")
+
+    gemini.history.token_budget = 200
+    gemini.send_message("one more", summary="8 mesh")
+    if gemini.last_usage["tokens_estimate"] > 200 or gemini.model.requests[-1][0]["role"] != "user":
+        print(f"✗ token budget not enforced: {gemini.last_usage}")
+        return False
+    print(f"✓ token budget enforced by dropping {gemini.last_usage['dropped_turns']} old turns")
+    return True
+
+def test_function_responses_stay_paired():
+    history = ChatHistory(keep_turns=1)
+    history.add_user(["build"])
+    history.add_model([{"function_call": {"name": "create_primitive", "args": {}}}])
+    history.add_user([{"function_response": {"name": "create_primitive", "response": {"status": "success"}}}, "next"])
+    history.add_model(["done"])
+    history.add_user(["again"])
+    contents = history.contents()
+    if contents[1]["parts"] != ["[called: create_primitive]"] or contents[2]["parts"][0] != "[1 earlier function results, 0 errors]":
+        print(f"✗ orphaned function response left behind: {contents}")
+        return False
+    print("✓ function responses collapsed together with their calls")
+    return True
+
+if __name__ == "__main__":
+    if test_history_compaction() and test_function_responses_stay_paired():
+        print("History test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,44 @@
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.journal import read_journal
+
+def test_journal_and_replay():
+    path = os.path.join(tempfile.mkdtemp(), "session.jsonl")
+    engine = AtomicEngine(journal_path=path)
+    engine.execute_tool("transform_object", {"name": "Cube", "location": [1, 0, 0]})
+    engine.execute_tool("get_scene_info")
+    engine.execute_tool("transform_object", {"name": "Cube", "rotation": [0, 0, 90]})
+    engine.execute_tool("set_viewport_shading", {"type": "SOLID"})
+    engine.execute_tool("set_viewport_shading", {"type": "MATERIAL"})
+
+    entries = list(read_journal(path))
+    if [e["seq"] for e in entries] != [1, 2, 3, 4, 5]:
+        print(f"✗ journal not append-only: {entries}")
+        return False
+    print("✓ every executed command journaled with its result")
+
+    report = engine.journal.compact()
+    entries = list(read_journal(path))
+    if report != {"before": 5, "after": 2} or entries[0]["args"]["rotation"] != [0, 0, 90]:
+        print(f"✗ unexpected compaction {report} {entries}")
+        return False
+    print("✓ compaction drops reads and overwritten writes")
+
+    fresh = AtomicEngine()
+    replay = fresh.execute_tool("replay_journal", {"path": path, "batch_size": 1})
+    if replay["commands"] != 2 or replay["batches"] != 2 or replay["errors"]:
+        print(f"✗ replay failed: {replay}")
+        return False
+    print("✓ journal replayed in batches on a fresh engine")
+    engine.journal.close()
+    return True
+
+if __name__ == "__main__":
+    if test_journal_and_replay():
+        print("Journal test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+
+def test_engine_metrics():
+    engine = AtomicEngine()
+    engine.tools["test_ok"] = lambda name: {"status": "success"}
+    engine.tools["test_raise"] = lambda: 1 / 0
+
+    for i in range(10):
+        engine.execute_tool("test_ok", {"name": f"Cube{i}"})
+    engine.execute_tool("test_raise")
+    engine.execute_tool("test_raise")
+
+    metrics = engine.execute_tool("get_engine_metrics")["metrics"]
+    ok, failing = metrics["test_ok"], metrics["test_raise"]
+    if ok["calls"] != 10 or ok["errors"] != 0 or ok["avg_arg_bytes"] <= 0:
+        print(f"✗ unexpected stats {ok}")
+        return False
+    print("✓ calls, errors and argument sizes recorded")
+    if failing["error_rate"] != 1.0 or failing["error_types"] != {"ZeroDivisionError": 2}:
+        print(f"✗ failure rate hidden: {failing}")
+        return False
+    print("✓ exceptions counted by type")
+    if not all(k in ok["wall"] for k in ("p50", "p95", "p99")):
+        print("✗ percentiles missing")
+        return False
+    print("✓ p50/p95/p99 reported")
+
+    path = os.path.join(tempfile.mkdtemp(), "metrics.prom")
+    engine.get_engine_metrics(export_path=path, format="prometheus")
+    with open(path) as f:
+        text = f.read()
+    if 'blender_mcp_tool_errors_total{tool="test_raise"} 2' not in text:
+        print("✗ prometheus export missing error counter")
+        return False
+    print("✓ prometheus text export written")
+    return True
+
+if __name__ == "__main__":
+    if test_engine_metrics():
+        print("Metrics test PASSED")
+    else:
+        sys.exit(1)
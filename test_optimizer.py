@@ -0,0 +1,75 @@
+import sys
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.optimizer import optimize_commands
+
+def _cmd(tool, **args):
+    return {"tool": tool, "args": args}
+
+def test_optimizer():
+    commands = [
+        _cmd("create_primitive", type="CUBE", name="Box"),
+        _cmd("transform_object", name="Box", location=(1, 0, 0)),
+        _cmd("set_viewport_shading", type="SOLID"),
+        _cmd("transform_object", name="Box", rotation=(0, 0, 45)),
+        _cmd("set_viewport_shading", type="MATERIAL"),
+        _cmd("transform_object", name="Box", location=(2, 0, 0)),
+    ]
+    plan, report = optimize_commands(commands)
+    if len(plan) != 3:
+        print(f"✗ expected 3 planned commands, got {plan}")
+        return False
+    transform = plan[-1][0]["args"]
+    if transform != {"name": "Box", "location": (2, 0, 0), "rotation": (0, 0, 45)}:
+        print(f"✗ transforms not merged: {transform}")
+        return False
+    print("✓ writes to the same object merged, later values win")
+    if report["removed"].keys() != {2} or report["merged"] != {1: 5, 3: 5}:
+        print(f"✗ unexpected report {report}")
+        return False
+    print("✓ overwritten shading change dropped and reported")
+
+    barrier = [
+        _cmd("set_viewport_shading", type="SOLID"),
+        _cmd("get_screenshot"),
+        _cmd("set_viewport_shading", type="RENDERED"),
+    ]
+    plan, report = optimize_commands(barrier)
+    if len(plan) != 3 or report["removed"]:
+        print("✗ command observed by an unknown tool was dropped")
+        return False
+    print("✓ undeclared tools act as barriers")
+
+    throwaway = [
+        _cmd("create_primitive", type="SPHERE", name="Temp"),
+        _cmd("transform_object", name="Temp", scale=(2, 2, 2)),
+        _cmd("delete_object", name="Temp"),
+    ]
+    plan, _ = optimize_commands(throwaway)
+    if len(plan) != 2:
+        print("✗ create/delete dropped without knowing the name is free")
+        return False
+    plan, report = optimize_commands(throwaway, object_exists=lambda name: False)
+    if plan or sorted(report["removed"]) != [0, 1, 2]:
+        print(f"✗ create/delete pair not eliminated: {plan}")
+        return False
+    print("✓ create/delete pair eliminated only when the name is known to be free")
+
+    per_engine = [
+        _cmd("set_render_engine", engine="CYCLES"),
+        _cmd("set_render_samples", samples=256),
+        _cmd("set_render_engine", engine="BLENDER_EEVEE"),
+        _cmd("set_render_samples", samples=64),
+    ]
+    plan, report = optimize_commands(per_engine)
+    if len(plan) != 4 or report["removed"]:
+        print(f"✗ samples for another render engine dropped: {report}")
+        return False
+    print("✓ sample counts set under different render engines are all kept")
+    return True
+
+if __name__ == "__main__":
+    if test_optimizer():
+        print("Optimizer test PASSED")
+    else:
+        sys.exit(1)
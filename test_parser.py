@@ -0,0 +1,60 @@
+import sys
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.parser import CommandStream, extract_commands
+
+REPLY = """I'll add a cube and light it.
+<blender_cmd>
+{"tool": "create_primitive", "args": {"type": "CUBE", "name": "Box"}}
+</blender_cmd>
+Now the light:
+<blender_cmd>```json
+{'tool': 'add_light', 'args': {'type': 'SUN', 'name': "Key's light",},}
+```</blender_cmd>
+<blender_cmd>{"tool": "hide_object", "args": {"name": "Box", "hide": False}}</blender_cmd>
+<blender_cmd>{"tool": "oops", "args": {</blender_cmd>
+<blender_cmd>[{"tool": "deselect_all"}, {"tool": "select_all"}]</blender_cmd>
+<blender_cmd>{"tool": "focus_selected"}"""
+
+def test_parser():
+    commands, errors = extract_commands(REPLY)
+    tools = [c["tool"] for c in commands]
+    if tools != ["create_primitive", "add_light", "hide_object", "deselect_all", "select_all", "focus_selected"]:
+        print(f"✗ unexpected commands {tools}")
+        return False
+    if commands[1]["args"] != {"type": "SUN", "name": "Key's light"} or commands[2]["args"]["hide"] is not False:
+        print(f"✗ repair pass produced {commands[1]} {commands[2]}")
+        return False
+    print("✓ fences, single quotes, trailing commas and Python literals repaired")
+
+    if len(errors) != 1 or not errors[0]["message"].startswith("Invalid JSON") or REPLY[errors[0]["offset"]:][:5] != '{"too':
+        print(f"✗ unexpected errors {errors}")
+        return False
+    print("✓ malformed block reported with its offset, unterminated last block recovered")
+
+    # Every split point must give the same result as parsing in one go
+    for split in range(len(REPLY)):
+        stream = CommandStream()
+        streamed = stream.feed(REPLY[:split]) + stream.feed(REPLY[split:]) + stream.close()
+        if streamed != commands or stream.errors != errors or stream.text != REPLY:
+            print(f"✗ split at {split} changed the result")
+            return False
+    stream = CommandStream()
+    streamed = [c for ch in REPLY for c in stream.feed(ch)] + stream.close()
+    if streamed != commands:
+        print("✗ character-by-character feed changed the result")
+        return False
+    print("✓ resumable across arbitrary fragment boundaries")
+
+    commands, errors = extract_commands('<blender_cmd>{"tool": "a"}<blender_cmd>{"tool": "b"}</blender_cmd>')
+    if [c["tool"] for c in commands] != ["a", "b"] or errors:
+        print(f"✗ missing closing tag not tolerated {commands} {errors}")
+        return False
+    print("✓ block missing its closing tag recovered")
+    return True
+
+if __name__ == "__main__":
+    if test_parser():
+        print("Parser test PASSED")
+    else:
+        sys.exit(1)
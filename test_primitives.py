@@ -0,0 +1,180 @@
+import math
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['bmesh'] = MagicMock()
+from blender_mcp.core import primitives
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.primitives import factory, torus_geometry
+
+# The package keeps the bpy stand-in it was first imported with
+bpy = primitives.bpy
+
+class UVLayers(dict):
+    def new(self, name):
+        self[name] = types.SimpleNamespace(data=types.SimpleNamespace(
+            foreach_set=lambda attr, values: setattr(self, "uvs", values)))
+        return self[name]
+
+class Mesh(types.SimpleNamespace):
+    # Datablocks are distinct even when their fields match
+    __eq__, __hash__ = object.__eq__, object.__hash__
+
+    def copy(self):
+        mesh = Mesh(name=self.name + ".001", use_fake_user=self.use_fake_user, users=0, materials=list(self.materials))
+        bpy.data.meshes.append(mesh)
+        return mesh
+
+    def from_pydata(self, verts, edges, faces):
+        self.verts, self.faces = verts, faces
+        self.uv_layers = UVLayers()
+
+    def update(self):
+        pass
+
+class Blocks(list):
+    """bpy.data collection stand-in: iterable, with lookup by name."""
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+class Meshes(Blocks):
+    def new(self, name):
+        mesh = Mesh(name=name, use_fake_user=False, users=0, materials=[])
+        self.append(mesh)
+        return mesh
+
+    def remove(self, mesh):
+        if mesh.users:
+            raise RuntimeError(f"{mesh.name} still in use")
+        super().remove(mesh)
+
+class Objects(Blocks):
+    def new(self, name, data):
+        obj = types.SimpleNamespace(name=name, data=data, location=None, rotation_euler=None, scale=None)
+        data.users += 1
+        self.append(obj)
+        return obj
+
+def linked_collection(name):
+    collection = types.SimpleNamespace(name=name, objects=types.SimpleNamespace(linked=[]))
+    collection.objects.link = collection.objects.linked.append
+    return collection
+
+def test_primitives():
+    saved = bpy.data.meshes, bpy.data.objects, bpy.data.collections, bpy.context.collection
+    saved_handlers = bpy.app.handlers.persistent, bpy.app.handlers.save_pre
+    try:
+        return check_primitives()
+    finally:
+        bpy.data.meshes, bpy.data.objects, bpy.data.collections, bpy.context.collection = saved
+        bpy.app.handlers.persistent, bpy.app.handlers.save_pre = saved_handlers
+
+def check_primitives():
+    # Imported by build_geometry when a template is built
+    bmesh = sys.modules['bmesh']
+    bpy.data.meshes, bpy.data.objects = Meshes(), Objects()
+    bpy.context.collection = linked_collection("Scene Collection")
+    props = linked_collection("Props")
+    bpy.data.collections = Blocks([props])
+    bpy.app.handlers.persistent = lambda handler: handler
+    bpy.app.handlers.save_pre = []
+    # Forget any save handler registered by earlier tests
+    factory.release()
+    engine = AtomicEngine()
+    built = factory.built
+
+    first = engine.execute_tool("create_primitive", {"type": "CUBE", "location": [1, 2, 3], "name": "Box"})
+    second = engine.execute_tool("create_primitive", {"type": "CUBE", "name": "Crate"})
+    box, crate = bpy.data.objects
+    template = bpy.data.meshes.get(".template_cube")
+    if first != {"status": "success", "object": "Box"} or second["object"] != "Crate" \
+            or factory.built != built + 1 or template is None or template.use_fake_user:
+        print(f"✗ cube template not built once: {first} {second} {bpy.data.meshes}")
+        return False
+    if template in (box.data, crate.data) or box.data is crate.data or box.data.name != "Box" \
+            or box.data.use_fake_user:
+        print("✗ each object should get its own renamed copy of the template")
+        return False
+    if box.location != [1, 2, 3] or bpy.context.collection.objects.linked != [box, crate]:
+        print("✗ objects not placed or linked to the active collection")
+        return False
+    bm = bmesh.new.return_value
+    if bm.loops.layers.uv.new.call_args != (("UVMap",),) \
+            or bmesh.ops.create_cube.call_args.kwargs.get("calc_uvs") is not True:
+        print("✗ primitives built without a UV map")
+        return False
+    print("✓ template built once with a UV map; every object gets its own copy")
+
+    result = engine.execute_tool("create_primitives", {
+        "type": "sphere", "names": [f"Ball_{i}" for i in range(50)],
+        "locations": [[i, 0, 0] for i in range(50)], "rotations": [0, 0, 90], "collection": "Props",
+    })
+    balls = props.objects.linked
+    if result["count"] != 50 or len(balls) != 50 or balls[49].location != [49.0, 0.0, 0.0] \
+            or abs(balls[0].rotation_euler[2] - math.pi / 2) > 1e-9 or factory.built != built + 2 \
+            or any(ball.data is not balls[0].data for ball in balls) \
+            or balls[0].data is bpy.data.meshes.get(".template_sphere"):
+        print(f"✗ bulk creation wrong: {result}")
+        return False
+    print("✓ 50 spheres in one call share one copy of the template; rotations converted to radians")
+
+    # Editing a shared mesh must not reach the template or later primitives
+    balls[0].data.materials.append("Mat_Ball_0")
+    engine.execute_tool("create_primitive", {"type": "SPHERE", "name": "Fresh"})
+    if bpy.data.objects.get("Fresh").data.materials or bpy.data.meshes.get(".template_sphere").materials \
+            or balls[49].data.materials != ["Mat_Ball_0"]:
+        print("✗ material on a shared mesh leaked into the template")
+        return False
+    print("✓ edits to shared meshes reach their instances but not the template")
+
+    torus = engine.execute_tool("add_torus", {"name": "Ring"})
+    verts, faces = torus_geometry()
+    mesh = bpy.data.meshes.get(".template_torus")
+    if torus["object"] != "Ring" or len(verts) != 576 or len(faces) != 576 or mesh.verts is not verts \
+            or len(mesh.uv_layers.uvs) != 576 * 4 * 2:
+        print(f"✗ torus geometry wrong: {len(verts)} verts, {len(faces)} faces")
+        return False
+    print("✓ torus built from its own geometry, 576 vertices and quads with UVs")
+
+    none = engine.execute_tool("create_primitives", {"type": "CONE", "count": 0})
+    if none != {"status": "success", "objects": [], "count": 0} or bpy.data.meshes.get(".template_cone"):
+        print(f"✗ count=0 should create nothing: {none}")
+        return False
+    print("✓ an explicit count of 0 creates nothing")
+
+    if len(bpy.app.handlers.save_pre) != 1:
+        print(f"✗ expected one save handler, got {bpy.app.handlers.save_pre}")
+        return False
+    for handler in bpy.app.handlers.save_pre:
+        handler(None)
+    if any(mesh.name.startswith(factory.PREFIX) for mesh in bpy.data.meshes) \
+            or bpy.data.objects.get("Ring").data not in bpy.data.meshes or balls[0].data not in bpy.data.meshes:
+        print(f"✗ templates should be removed before a save, and nothing else: {bpy.data.meshes}")
+        return False
+    rebuilt = factory.built
+    engine.execute_tool("create_primitive", {"type": "CUBE", "name": "AfterSave"})
+    if factory.built != rebuilt + 1 or bpy.data.meshes.get(".template_cube") is None:
+        print("✗ template not rebuilt after a save")
+        return False
+    print("✓ templates removed before every save and rebuilt on next use")
+
+    unknown = engine.execute_tool("create_primitive", {"type": "TEAPOT"})
+    missing = engine.execute_tool("create_primitives", {"count": 2, "collection": "Nowhere"})
+    if unknown["status"] != "error" or missing["status"] != "error" or len(bpy.data.objects) != 55:
+        print(f"✗ bad requests not rejected: {unknown} {missing}")
+        return False
+    print("✓ unknown types and collections rejected without creating anything")
+    engine.close()
+    if bpy.app.handlers.save_pre or bpy.data.meshes.get(".template_cube"):
+        print("✗ closing the engine should drop the templates and the save handler")
+        return False
+    print("✓ closing the engine drops the templates and the save handler")
+    return True
+
+if __name__ == "__main__":
+    if test_primitives():
+        print("Primitives test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,36 @@
+import sys
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.registry import ToolRegistry
+
+def test_lazy_registry():
+    registry = ToolRegistry()
+    if registry.loaded_modules():
+        print(f"✗ modules imported at construction: {registry.loaded_modules()}")
+        return False
+    print(f"✓ {len(registry)} tools registered without importing any module")
+
+    if "set_sculpt_mode" not in registry or registry.loaded_modules():
+        print("✗ membership test imported a module")
+        return False
+    print("✓ membership checks stay import-free")
+
+    registry["add_torus"]
+    if registry.loaded_modules() != ["mesh"]:
+        print(f"✗ expected only mesh loaded, got {registry.loaded_modules()}")
+        return False
+    print("✓ first lookup imports only the owning module")
+
+    registry.preload()
+    report = registry.startup_report()
+    if report["tools_resolved"] != len(registry):
+        print("✗ not every registered tool resolved")
+        return False
+    print(f"✓ all tools resolve across {len(report['modules_loaded'])} modules")
+    return True
+
+if __name__ == "__main__":
+    if test_lazy_registry():
+        print("Registry test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,76 @@
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+import bpy
+from blender_mcp.core.engine import AtomicEngine
+
+class Blocks(list):
+    """bpy.data collection stand-in: iterable, with lookup by name."""
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+def make_object(uid, name, location=(0.0, 0.0, 0.0)):
+    return types.SimpleNamespace(
+        session_uid=uid, name=name, type="MESH", id_type="OBJECT", location=list(location),
+        rotation_euler=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0], parent=None, material_slots=[], modifiers=[],
+    )
+
+def make_material(uid, name, color):
+    return types.SimpleNamespace(session_uid=uid, name=name, id_type="MATERIAL", diffuse_color=list(color),
+                                 use_nodes=False, node_tree=None)
+
+def updates(*ids):
+    return types.SimpleNamespace(updates=[types.SimpleNamespace(id=types.SimpleNamespace(original=i)) for i in ids])
+
+def test_scene_delta():
+    bpy.data.objects = Blocks(make_object(i, f"Mesh_{i}", (i, 0, 0)) for i in range(1, 2001))
+    bpy.data.materials = Blocks([make_material(9001, "Red", (1, 0, 0, 1))])
+    engine = AtomicEngine()
+
+    first = engine.execute_tool("get_scene_delta")
+    if first["mode"] != "snapshot" or len(first["scene"]["objects"]) != 2000:
+        print(f"✗ first call should be a full snapshot: {first.get('mode')}")
+        return False
+    if engine.execute_tool("get_scene_delta")["unchanged"] is not True:
+        print("✗ untouched scene should report no changes")
+        return False
+    print("✓ snapshot first, then an empty delta")
+
+    # Edits reported by the depsgraph handler; only these objects are re-read
+    moved = bpy.data.objects[4]
+    moved.location = [5.0, 0.0, 3.0]
+    renamed = bpy.data.objects[7]
+    renamed.name = "Hero"
+    bpy.data.materials[0].diffuse_color = [0, 0, 1, 1]
+    engine.depsgraph.notify(None, updates(moved, renamed, bpy.data.materials[0]))
+    delta = engine.execute_tool("get_scene_delta")["delta"]
+    if delta["objects"] != {
+        "renamed": [{"from": "Mesh_8", "to": "Hero"}],
+        "changed": [{"name": "Mesh_5", "location": [5.0, 0.0, 3.0]}],
+    } or delta["materials"] != {"changed": [{"name": "Red", "color": [0, 0, 1, 1]}]}:
+        print(f"✗ unexpected delta {delta}")
+        return False
+    print("✓ moves, renames and material edits reported without rescanning")
+
+    bpy.data.objects.remove(bpy.data.objects[0])
+    bpy.data.objects.append(make_object(5000, "Lamp"))
+    engine.depsgraph.notify(None, updates(types.SimpleNamespace(id_type="SCENE")))
+    delta = engine.execute_tool("get_scene_delta")["delta"]["objects"]
+    if delta.get("removed") != ["Mesh_1"] or [r["name"] for r in delta.get("added", [])] != ["Lamp"]:
+        print(f"✗ additions and removals missed: {delta}")
+        return False
+    print("✓ additions and removals found when the scene's membership changes")
+
+    if engine.execute_tool("get_scene_delta", {"full": True})["mode"] != "snapshot":
+        print("✗ full=True should return a snapshot")
+        return False
+    print("✓ full snapshot on request")
+    return True
+
+if __name__ == "__main__":
+    if test_scene_delta():
+        print("Scene delta test PASSED")
+    else:
+        sys.exit(1)
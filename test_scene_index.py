@@ -0,0 +1,149 @@
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+import bpy
+from blender_mcp.core.engine import AtomicEngine
+
+class Blocks(list):
+    """bpy.data collection stand-in: iterable, with lookup by name."""
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+def make_object(uid, name, type, data, collection, material=None, parent=None):
+    slots = [types.SimpleNamespace(material=material)] if material else []
+    return types.SimpleNamespace(
+        session_uid=uid, name=name, type=type, id_type="OBJECT", data=data, users_collection=[collection],
+        material_slots=slots, parent=parent,
+    )
+
+def updates(*ids):
+    return types.SimpleNamespace(updates=[types.SimpleNamespace(id=types.SimpleNamespace(original=i)) for i in ids])
+
+def make_scene():
+    props = types.SimpleNamespace(name="Props", id_type="COLLECTION", children_recursive=[])
+    world = types.SimpleNamespace(name="World", id_type="COLLECTION", children_recursive=[props])
+    bark = types.SimpleNamespace(name="Bark")
+    leaves = types.SimpleNamespace(name="Leaves")
+    trunk = types.SimpleNamespace(name="TrunkMesh", id_type="MESH")
+    objects = [make_object(i + 1, f"Tree_{i:03d}", "MESH", trunk, props if i % 2 else world, bark)
+               for i in range(200)]
+    objects.append(make_object(201, "Bush", "MESH", types.SimpleNamespace(name="BushMesh"), props, leaves))
+    objects.append(make_object(202, "Sun", "LIGHT", types.SimpleNamespace(name="SunLight"), world))
+    for coll in (props, world):
+        coll.objects = [obj for obj in objects if coll in obj.users_collection]
+    bpy.data.objects = Blocks(objects)
+    bpy.data.collections = Blocks([world, props])
+    return objects, bark, leaves, trunk
+
+def test_scene_index():
+    objects, bark, leaves, trunk = make_scene()
+    engine = AtomicEngine()
+    index = engine.scene_index
+    found = engine.execute_tool("find_objects", {"type": "MESH", "material": "Leaves", "collection": "World"})
+    if found["objects"] != ["Bush"] or index.rebuilds != 1:
+        print(f"✗ unexpected query result {found}")
+        return False
+    if len(index.query(collection="World")) != 202 or len(index.query(collection="Props")) != 101:
+        print("✗ collection queries should include child collections")
+        return False
+    shared = index.query(shared_data=True)
+    if len(shared) != 200 or index.users("TrunkMesh") != 200 or index.query(type="LIGHT") != ["Sun"]:
+        print("✗ data-block users not indexed")
+        return False
+    print("✓ type, collection, material and shared-data queries from one rebuild")
+
+    # Re-material and rename through depsgraph updates, no rebuild
+    tree = objects[0]
+    tree.material_slots = [types.SimpleNamespace(material=leaves)]
+    tree.name = "Oak"
+    engine.depsgraph.notify(None, updates(tree))
+    if index.query(material="Leaves") != ["Bush", "Oak"] or "Tree_000" in index.names() or index.rebuilds != 1:
+        print(f"✗ object update not applied incrementally {index.query(material='Leaves')}")
+        return False
+    sun = objects[-1]
+    sun.type = "MESH"
+    engine.depsgraph.notify(None, updates(trunk))
+    if index.rebuilds != 1 or index.query(type="LIGHT") != ["Sun"]:
+        print("✗ a mesh update should only re-index the objects using the mesh")
+        return False
+    print("✓ object and data updates re-index only what they touch")
+
+    world, props = bpy.data.collections
+    bpy.data.objects.pop()
+    world.objects.pop()
+    engine.depsgraph.notify(None, updates(types.SimpleNamespace(name="Scene", id_type="SCENE"), world))
+    if index.query(type="LIGHT") or index.rebuilds != 1:
+        print("✗ an unlinked object should be dropped without a rebuild")
+        return False
+    # Tree_001 moves from Props to World
+    moved = objects[1]
+    props.objects.remove(moved)
+    world.objects.append(moved)
+    moved.users_collection = [world]
+    engine.depsgraph.notify(None, updates(props, world))
+    if "Tree_001" in index.query(collection="Props") or index.record("Tree_001")["collections"] != ["World"] \
+            or index.rebuilds != 1:
+        print("✗ a collection update should re-index only the objects that moved")
+        return False
+    engine.depsgraph.notify(None, None)
+    index.ensure()
+    if index.rebuilds != 2:
+        print("✗ undo or load should invalidate the index")
+        return False
+    print("✓ linking and unlinking reconciled in place; undo and loads rebuild lazily")
+
+    # Blender reports the new object and its collection once the view layer is evaluated
+    created = []
+    evaluations = []
+
+    def evaluate():
+        evaluations.append(len(created))
+        engine.depsgraph.notify(None, updates(*created))
+        created.clear()
+
+    def plant(name):
+        obj = make_object(300, name, "MESH", trunk, world)
+        bpy.data.objects.append(obj)
+        world.objects.append(obj)
+        created.extend([obj, world])
+        return {"status": "success"}
+
+    engine.tools["plant"] = plant
+    saved_update = bpy.context.view_layer.update
+    bpy.context.view_layer.update = evaluate
+    try:
+        batch = engine.execute_batch([
+            {"tool": "find_objects", "args": {"data": "TrunkMesh"}},
+            {"tool": "plant", "args": {"name": "Sapling"}},
+            {"tool": "find_objects", "args": {"data": "TrunkMesh"}},
+        ], undo_message=None)
+        queried = list(evaluations)
+        engine.execute_batch([{"tool": "find_objects", "args": {"type": "LIGHT"}}] * 3, undo_message=None)
+    finally:
+        bpy.context.view_layer.update = saved_update
+    before, after = batch["results"][0], batch["results"][2]
+    if after["count"] != before["count"] + 1 or "Sapling" not in after["objects"] or index.rebuilds != 2:
+        print(f"✗ object created earlier in the batch not found incrementally: {after['count']} {index.rebuilds}")
+        return False
+    # One evaluation before the second query, one when the batch is finalized
+    if queried != [2, 0] or evaluations != [2, 0, 0]:
+        print(f"✗ view layer evaluated more than needed: {evaluations}")
+        return False
+    print("✓ queries see objects created earlier in the same batch without a rebuild")
+
+    # A small scene is scanned instead of rebuilding a stale index for one query
+    index.invalidate()
+    if index.serves() or not index.query(type="MESH") or not index.serves():
+        print("✗ a stale index over a small scene should not serve queries until rebuilt")
+        return False
+    print("✓ stale index over a small scene left to a scan")
+    engine.close()
+    return True
+
+if __name__ == "__main__":
+    if test_scene_index():
+        print("Scene index test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,128 @@
+import sys
+import threading
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+import bpy
+from blender_mcp.core import query
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.server import MCPServer
+
+class Blocks(list):
+    """bpy.data collection stand-in with lookup by name and bulk reads."""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.bulk_reads = 0
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+    def foreach_get(self, attr, buffer):
+        self.bulk_reads += 1
+        for i, value in enumerate(v for item in self for v in getattr(item, attr)):
+            buffer[i] = value
+
+def make_scene(count):
+    meshes = [types.SimpleNamespace(name=f"Mesh{i % 3}", vertices=[0] * 8, polygons=[0] * 6) for i in range(3)]
+    forest = types.SimpleNamespace(name="Forest", children_recursive=[])
+    objects = []
+    for i in range(count):
+        kind = "LIGHT" if i % 10 == 0 else "MESH"
+        objects.append(types.SimpleNamespace(
+            session_uid=i + 1, name=f"{'Lamp' if kind == 'LIGHT' else 'Tree'}_{i:03d}", type=kind,
+            data=meshes[i % 3] if kind == "MESH" else None,
+            location=[float(i), 0.0, 0.0], rotation_euler=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0],
+            dimensions=[2.0, 2.0, 2.0], parent=None, users_collection=[forest] if i < 50 else [], modifiers=[],
+            material_slots=[], hide_viewport=False,
+        ))
+    bpy.data.objects = Blocks(objects)
+    forest.all_objects = objects[:50]
+    bpy.data.collections = Blocks([forest])
+
+def test_fields_filters_pages():
+    make_scene(120)
+    engine = AtomicEngine()
+    result = engine.execute_tool("get_scene_info", {"fields": ["name", "location"], "type": "MESH", "page_size": 40})
+    objects = result["info"]["objects"]
+    if result["total"] != 108 or len(objects) != 40 or objects[1] != {"name": "Tree_002", "location": [2.0, 0.0, 0.0]}:
+        print(f"✗ unexpected first page {result['total']} {objects[:2]}")
+        return False
+    # Without NumPy a Python buffer is slower than reading each object
+    bulk = query.np is not None
+    if bpy.data.objects.bulk_reads != int(bulk):
+        print(f"✗ expected {int(bulk)} foreach_get reads, got {bpy.data.objects.bulk_reads}")
+        return False
+    print(f"✓ projected fields, type filter and {'bulk' if bulk else 'per-object'} transform reads")
+
+    names = [o["name"] for o in objects]
+    cursor = result["next_cursor"]
+    while cursor:
+        page = engine.execute_tool("get_scene_info", {"fields": ["name"], "type": "MESH", "page_size": 40, "cursor": cursor})
+        if "materials" in page["info"]:
+            print("✗ scene-wide lists should only come with the first page")
+            return False
+        names += [o["name"] for o in page["info"]["objects"]]
+        cursor = page["next_cursor"]
+    if len(names) != 108 or len(set(names)) != 108:
+        print(f"✗ paging lost or repeated objects: {len(names)}")
+        return False
+    print("✓ cursors walk every object exactly once")
+
+    audit = engine.execute_tool("audit_scene", {"collection": "Forest", "name": "Tree_*", "page_size": 5})["audit"]
+    if (audit["total_objects"], audit["matched"], audit["total_vertices"], audit["total_faces"]) != (120, 45, 360, 270) \
+            or len(audit["objects_audit"]) != 5 or audit["objects_audit"][0]["polycount"] != 6 \
+            or audit["objects_audit"][0]["modifiers"] != []:
+        print(f"✗ unexpected audit {audit}")
+        return False
+    bad = engine.execute_tool("get_scene_info", {"fields": ["name", "colour"]})
+    if bad["status"] != "error" or "colour" not in bad["message"]:
+        print(f"✗ unknown field not rejected: {bad}")
+        return False
+    print("✓ audit totals over the filtered set, one page of rows, unknown fields rejected")
+
+    bpy.data.objects[1].modifiers = [types.SimpleNamespace(name="Bend", type="SIMPLE_DEFORM")]
+    row = engine.execute_tool("audit_scene", {"name": "Tree_001"})["audit"]["objects_audit"][0]
+    info = engine.execute_tool("get_scene_info", {"fields": ["modifiers"], "name": "Tree_001"})["info"]["objects"][0]
+    if row["modifiers"] != ["SIMPLE_DEFORM"] or info["modifiers"] != ["Bend"]:
+        print(f"✗ audit should list modifier types, scene info names: {row} {info}")
+        return False
+    print("✓ audit rows keep listing modifier types under 'modifiers'")
+    return True
+
+def test_streamed_pages():
+    make_scene(120)
+    engine = AtomicEngine()
+    server = MCPServer(engine, port=None)
+    stop = threading.Event()
+    pump = threading.Thread(target=engine.dispatcher.run_forever, args=(stop,), kwargs={"idle_interval": 0.01})
+    pump.start()
+    messages = []
+    finished = threading.Event()
+
+    def reply(message):
+        messages.append(message)
+        if "id" in message:
+            finished.set()
+
+    try:
+        server.handle_message({"jsonrpc": "2.0", "id": 7, "method": "scene/pages",
+                               "params": {"arguments": {"fields": ["name"], "page_size": 50}}}, reply)
+        finished.wait(5.0)
+    finally:
+        stop.set()
+        pump.join()
+
+    pages = [m["params"] for m in messages if m.get("method") == "scene/page"]
+    if messages[-1].get("result") != {"pages": 3} or [p["page"] for p in pages] != [1, 2, 3] \
+            or sum(len(p["result"]["info"]["objects"]) for p in pages) != 120 or pages[0]["requestId"] != 7:
+        print(f"✗ pages not streamed: {messages[-1]}")
+        return False
+    print("✓ scene/pages streams each page as a notification before the response")
+    return True
+
+if __name__ == "__main__":
+    if test_fields_filters_pages() and test_streamed_pages():
+        print("Scene query test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,85 @@
+import json
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.gemini import GeminiManager
+from blender_mcp.core.schema import ToolSchemas
+
+def test_generated_schemas():
+    engine = AtomicEngine()
+    schemas = ToolSchemas(engine.tools)
+
+    declarations = schemas.declarations()
+    if len(declarations) != len(engine.tools):
+        print(f"✗ {len(declarations)} declarations for {len(engine.tools)} tools")
+        return False
+    params = schemas.declaration("create_primitive")["parameters"]
+    if params["properties"]["type"].get("enum")[:4] != ["CUBE", "SPHERE", "PLANE", "CYLINDER"] \
+            or params["properties"]["location"]["type"] != "array":
+        print(f"✗ unexpected create_primitive schema {params}")
+        return False
+    if schemas.declaration("set_current_frame")["parameters"]["required"] != ["frame"]:
+        print("✗ required parameters missing")
+        return False
+    print(f"✓ declarations generated for all {len(declarations)} tools")
+
+    routed = schemas.route("Add a red sphere and a sun light, then add a subsurf modifier")
+    for name in ("create_primitive", "add_light", "assign_material", "add_subsurf_modifier", "request_feedback"):
+        if name not in routed:
+            print(f"✗ {name} not routed: {routed}")
+            return False
+    if len(routed) > schemas.max_tools:
+        print(f"✗ routed {len(routed)} tools")
+        return False
+    subset = len(json.dumps(schemas.declarations(routed)))
+    print(f"✓ routed {len(routed)} tools ({subset} bytes of {len(json.dumps(declarations))})")
+
+    # Follow-ups keep the previous turn's tools
+    if schemas.route("make it bigger")[:len(routed)] != routed:
+        print("✗ previous tools dropped on follow-up")
+        return False
+    print("✓ previous tools kept for follow-ups")
+
+    # Common object words must not crowd out the module the user asked for
+    routed = ToolSchemas(engine.tools).route("Set up cloth physics on the plane with wind")
+    if "add_force_field" not in routed:
+        print(f"✗ physics tools crowded out by object tools: {routed}")
+        return False
+    routed = ToolSchemas(engine.tools).route("Give the plane cloth physics, a red material and a sun light")
+    for name in ("setup_cloth", "set_world_background", "add_light"):
+        if name not in routed:
+            print(f"✗ {name} crowded out of a multi-category message: {routed}")
+            return False
+    print("✓ every matched module gets a share of the routed tools")
+    return True
+
+def test_function_calls():
+    gemini = GeminiManager.__new__(GeminiManager)
+    gemini.schemas = ToolSchemas(AtomicEngine().tools)
+    call = types.SimpleNamespace(name="transform_object", args={"name": "Cube", "location": (1.0, 2.0, 3.0)})
+    response = types.SimpleNamespace(candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=[
+        types.SimpleNamespace(text="Moving the cube.", function_call=types.SimpleNamespace(name="")),
+        types.SimpleNamespace(text="", function_call=call),
+    ]))])
+    text, commands = gemini.parse_function_calls(response)
+    if text != "Moving the cube." or commands != [{"tool": "transform_object", "args": {"name": "Cube", "location": [1.0, 2.0, 3.0]}}]:
+        print(f"✗ unexpected parse {text!r} {commands}")
+        return False
+    print("✓ function calls turned into commands")
+
+    content = gemini.build_content("next", tool_results=[{"tool": "transform_object", "result": {"status": "success"}}])
+    if content[0] != {"function_response": {"name": "transform_object", "response": {"status": "success"}}}:
+        print(f"✗ results not sent as function responses {content}")
+        return False
+    print("✓ results returned as function responses")
+    return True
+
+if __name__ == "__main__":
+    if test_generated_schemas() and test_function_calls():
+        print("Schema test PASSED")
+    else:
+        sys.exit(1)
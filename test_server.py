@@ -0,0 +1,126 @@
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.server import MCPServer
+
+def test_pipelined_requests():
+    engine = AtomicEngine()
+    engine.tools["echo"] = lambda text: {"status": "success", "text": text}
+    server = MCPServer(engine, port=0).start()
+    stop = threading.Event()
+    # Stands in for Blender's main thread
+    pump = threading.Thread(target=engine.dispatcher.run_forever, args=(stop,), kwargs={"idle_interval": 0.01})
+    pump.start()
+
+    try:
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"token": server.token}},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "echo", "arguments": {"text": "hi"}}},
+            {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "echo", "arguments": {}}},
+            {"jsonrpc": "2.0", "id": 4, "method": "engine/batch", "params": {"commands": [
+                {"tool": "echo", "args": {"text": "a"}},
+                {"tool": "no_such_tool", "args": {}},
+            ]}},
+            [{"jsonrpc": "2.0", "id": 5, "method": "ping"}, {"jsonrpc": "2.0", "id": 6, "method": "nope"}],
+        ]
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5.0) as sock:
+            # All requests are written before any response is read
+            sock.sendall("".join(json.dumps(r) + "\n" for r in requests).encode("utf-8"))
+            reader = sock.makefile("r")
+            responses = {}
+            for _ in range(5):
+                message = json.loads(reader.readline())
+                if isinstance(message, list):
+                    responses.update({m["id"]: m for m in message})
+                else:
+                    responses[message["id"]] = message
+    finally:
+        stop.set()
+        pump.join()
+        server.stop()
+
+    if responses[1]["result"]["serverInfo"]["name"] != "blender-mcp":
+        print(f"✗ bad initialize response {responses[1]}")
+        return False
+    print("✓ initialize answered, notification ignored")
+
+    content = json.loads(responses[2]["result"]["content"][0]["text"])
+    if content.get("text") != "hi" or responses[2]["result"]["isError"]:
+        print(f"✗ tool call failed {responses[2]}")
+        return False
+    if not responses[3]["result"]["isError"]:
+        print(f"✗ missing argument not reported {responses[3]}")
+        return False
+    print("✓ pipelined tool calls executed through the main-thread queue")
+
+    batch = responses[4]["result"]
+    if batch["results"][0].get("text") != "a" or batch["results"][1].get("status") != "error":
+        print(f"✗ batch results not aligned {batch}")
+        return False
+    print("✓ batch runs valid commands and reports rejected ones in place")
+
+    if responses[5]["result"] != {} or responses[6]["error"]["code"] != -32601:
+        print(f"✗ JSON-RPC batch mishandled {responses[5]} {responses[6]}")
+        return False
+    print("✓ JSON-RPC batches and unknown methods handled")
+    return True
+
+def test_server_access():
+    engine = AtomicEngine()
+    ran = []
+    engine.tools["echo"] = lambda text: ran.append(text) or {"status": "success", "text": text}
+    socket_path = os.path.join(tempfile.mkdtemp(), "mcp.sock") if hasattr(socket, "AF_UNIX") else None
+    server = MCPServer(engine, port=0, socket_path=socket_path).start()
+    stop = threading.Event()
+    pump = threading.Thread(target=engine.dispatcher.run_forever, args=(stop,), kwargs={"idle_interval": 0.01})
+    pump.start()
+    call = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "echo", "arguments": {"text": "x"}}}
+
+    try:
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5.0) as sock:
+            sock.sendall((json.dumps(call) + "\n").encode("utf-8"))
+            refused = json.loads(sock.makefile("r").readline())
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5.0) as sock:
+            bad = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"token": "guess"}}
+            sock.sendall((json.dumps(bad) + "\n" + json.dumps(call) + "\n").encode("utf-8"))
+            reader = sock.makefile("r")
+            wrong = json.loads(reader.readline())
+            closed = reader.readline() == ""
+        ran_over_tcp = list(ran)
+        if socket_path:
+            mode = stat.S_IMODE(os.stat(socket_path).st_mode)
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.settimeout(5.0)
+                sock.connect(socket_path)
+                sock.sendall((json.dumps(call) + "\n").encode("utf-8"))
+                local = json.loads(sock.makefile("r").readline())
+    finally:
+        stop.set()
+        pump.join()
+        server.stop()
+
+    if refused.get("error", {}).get("code") != -32001 or wrong.get("error", {}).get("code") != -32001 \
+            or not closed or ran_over_tcp:
+        print(f"✗ TCP client without the token was served: {refused} {wrong} {ran_over_tcp}")
+        return False
+    print("✓ TCP requests refused until initialize carries the token")
+    if socket_path:
+        if mode != 0o600 or local["result"]["isError"] or ran != ["x"]:
+            print(f"✗ Unix socket not private or not served: {oct(mode)} {local}")
+            return False
+        print("✓ Unix socket is owner-only and needs no token")
+    return True
+
+if __name__ == "__main__":
+    if test_pipelined_requests() and test_server_access():
+        print("Server test PASSED")
+    else:
+        sys.exit(1)
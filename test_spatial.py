@@ -0,0 +1,175 @@
+import math
+import sys
+import time
+import types
+import unittest
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core import spatial
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.spatial import box_distance, bulk_aabbs, world_aabb
+
+# The package keeps the bpy stand-in it was first imported with
+bpy = spatial.bpy
+
+class Blocks(list):
+    """bpy.data collection stand-in: iterable, with lookup by name."""
+
+    def get(self, name, default=None):
+        return next((item for item in reversed(self) if item.name == name), default)
+
+def make_object(uid, name, location, half=0.5):
+    # Corner order as in Blender: the first is the minimum, the seventh the maximum
+    corners = [(-half, -half, -half), (-half, -half, half), (-half, half, half), (-half, half, -half),
+               (half, -half, -half), (half, -half, half), (half, half, half), (half, half, -half)]
+    return types.SimpleNamespace(session_uid=uid, name=name, type="MESH", id_type="OBJECT", data=None,
+                                 bound_box=corners, matrix_world=translation(location))
+
+def translation(location):
+    x, y, z = location
+    return [[1.0, 0.0, 0.0, x], [0.0, 1.0, 0.0, y], [0.0, 0.0, 1.0, z], [0.0, 0.0, 0.0, 1.0]]
+
+def updates(*ids):
+    return types.SimpleNamespace(updates=[types.SimpleNamespace(id=types.SimpleNamespace(original=i)) for i in ids])
+
+def test_spatial_queries():
+    saved = bpy.data.objects
+    try:
+        return check_spatial_queries()
+    finally:
+        bpy.data.objects = saved
+
+def check_spatial_queries():
+    # 200 x 100 crates three units apart on a large ground plane
+    objects = [make_object(i + 1, f"Crate_{i:05d}", ((i % 200) * 3.0, (i // 200) * 3.0, 0.5)) for i in range(20000)]
+    ground = make_object(99999, "Ground", (300.0, 150.0, -0.5), half=500.0)
+    ground.bound_box = [(x, y, z * 0.001) for x, y, z in ground.bound_box]
+    bpy.data.objects = Blocks(objects + [ground])
+    engine = AtomicEngine()
+    index = engine.spatial_index
+
+    point = (100.2, 50.7, 0.5)
+    nearest = index.nearest(point, 4, exclude=("Ground",))
+    expected = sorted((box_distance(point, *index.grid.boxes[o.session_uid]), o.name) for o in objects)[:4]
+    if [n for n, _ in nearest] != [n for _, n in expected]:
+        print(f"✗ nearest {nearest} != {expected}")
+        return False
+    within = {n for n, _ in index.within(point, 4.0, exclude=("Ground",))}
+    brute = {o.name for o in objects if box_distance(point, *index.grid.boxes[o.session_uid]) <= 4.0}
+    if within != brute or index.rebuilds != 1:
+        print("✗ radius query differs from brute force")
+        return False
+    start = time.perf_counter()
+    for i in range(200):
+        index.nearest((i * 2.5, i * 0.7, 0.5), 5)
+        index.within((i * 2.5, i * 0.7, 0.5), 6.0)
+    per_query = (time.perf_counter() - start) / 400
+    if per_query > 0.005:
+        print(f"✗ queries too slow: {per_query * 1000:.2f} ms")
+        return False
+    print(f"✓ nearest and radius queries match brute force, {per_query * 1000:.3f} ms each over 20k objects")
+
+    hit = engine.execute_tool("ray_cast", {"origin": [3.0, 3.0, 10.0], "direction": [0, 0, -1]})
+    if hit["name"] != "Crate_00201" or abs(hit["distance"] - 9.0) > 1e-6:
+        print(f"✗ downward ray hit {hit}")
+        return False
+    side = index.ray_cast((-10.0, 6.0, 0.5), (1.0, 0.0, 0.0), exclude=("Ground",))
+    miss = index.ray_cast((-10.0, 7.5, 0.5), (1.0, 0.0, 0.0), exclude=("Ground",))
+    if side["name"] != "Crate_00400" or abs(side["distance"] - 9.5) > 1e-6 or miss is not None:
+        print(f"✗ sideways rays {side} {miss}")
+        return False
+    inside = engine.execute_tool("find_in_box", {"box_min": [-1, -1, 0.1], "box_max": [4, 1, 1]})["objects"]
+    if inside != ["Crate_00000", "Crate_00001"]:
+        print(f"✗ box query returned {inside}")
+        return False
+    print("✓ ray casts walk the grid to the first box; box overlap query")
+
+    spot = engine.execute_tool("find_free_space", {"size": [2, 2, 1], "near": [3, 3, 0.5], "exclude": ["Ground"]})
+    location = spot["location"]
+    if index.overlapping([c - 1.0 for c in location], [c + 1.0 for c in location], exclude=("Ground",)):
+        print(f"✗ free space {location} is occupied")
+        return False
+    if math.dist(location, (3, 3, 0.5)) > 3.0 * math.sqrt(2) + 2.3:
+        print(f"✗ free space {location} not near the request")
+        return False
+    print(f"✓ free 2x2 spot next to the crates at {location}")
+
+    # Move one crate and link a new one: only those are re-boxed
+    objects[0].matrix_world = translation((1000.0, 1000.0, 0.5))
+    engine.depsgraph.notify(None, updates(objects[0]))
+    newcomer = make_object(100000, "Barrel", (1001.0, 1000.0, 0.5))
+    bpy.data.objects.append(newcomer)
+    engine.depsgraph.notify(None, updates(types.SimpleNamespace(name="Scene", id_type="SCENE")))
+    moved = index.nearest((1000.0, 1000.0, 0.5), 2)
+    if [n for n, _ in moved] != ["Crate_00000", "Barrel"] or index.rebuilds != 1:
+        print(f"✗ incremental update lost: {moved} after {index.rebuilds} rebuilds")
+        return False
+    bpy.data.objects.remove(newcomer)
+    engine.depsgraph.notify(None, updates(types.SimpleNamespace(name="Scene", id_type="SCENE")))
+    if index.nearest((1000.0, 1000.0, 0.5), 1)[0][0] != "Crate_00000" or len(index.grid) != 20001:
+        print("✗ removed object still indexed")
+        return False
+    print("✓ moves and links update the grid without a rebuild")
+
+    def move(name, location):
+        bpy.data.objects.get(name).matrix_world = translation(location)
+        return {"status": "success"}
+
+    engine.tools["move"] = move
+    # Blender reports the moved object once the view layer is evaluated
+    saved_update = bpy.context.view_layer.update
+    bpy.context.view_layer.update = lambda: engine.depsgraph.notify(None, updates(bpy.data.objects.get("Crate_00001")))
+    try:
+        batch = engine.execute_batch([
+            {"tool": "move", "args": {"name": "Crate_00001", "location": [-50.0, -50.0, 0.5]}},
+            {"tool": "find_nearest", "args": {"point": [-50.0, -50.0, 0.5], "count": 1, "exclude": ["Ground"]}},
+        ], undo_message=None)
+    finally:
+        bpy.context.view_layer.update = saved_update
+    if batch["results"][1]["objects"][0]["name"] != "Crate_00001" or index.rebuilds != 1:
+        print(f"✗ move earlier in the batch not seen without a rebuild: {batch['results'][1]} {index.rebuilds}")
+        return False
+    print("✓ spatial queries see moves made earlier in the same batch; only the moved crate is re-boxed")
+    engine.close()
+    return True
+
+class BulkBlocks(list):
+    """Collection stand-in whose foreach_get flattens like RNA: matrices column by column."""
+
+    def foreach_get(self, attr, buffer):
+        if attr == "matrix_world":
+            values = [row[col] for obj in self for col in range(4) for row in obj.matrix_world]
+        else:
+            values = [v for obj in self for corner in getattr(obj, attr) for v in corner]
+        buffer[:] = values
+
+def test_bulk_boxes():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise unittest.SkipTest("numpy not installed; bulk_aabbs not checked")
+    objects = [make_object(i + 1, f"Box_{i}", (i * 2.0, -i, 0.5 * i), half=0.5 + i * 0.1) for i in range(5)]
+    # Rotated 30 degrees about Z and stretched along X, so a row/column mix-up moves the boxes
+    c, s = math.cos(math.radians(30)), math.sin(math.radians(30))
+    for obj in objects:
+        x, y, z = (obj.matrix_world[i][3] for i in range(3))
+        obj.matrix_world = [[2.0 * c, -s, 0.0, x], [2.0 * s, c, 0.0, y], [0.0, 0.0, 1.0, z], [0.0, 0.0, 0.0, 1.0]]
+    bulk = bulk_aabbs(BulkBlocks(objects))
+    for obj, bmin, bmax in zip(objects, *bulk):
+        exact = world_aabb(obj)
+        if any(abs(a - b) > 1e-4 for a, b in zip(bmin + bmax, exact[0] + exact[1])):
+            print(f"✗ bulk box of {obj.name} {bmin} {bmax} != {exact}")
+            return False
+    print("✓ bulk-read boxes match per-object boxes for rotated, scaled objects")
+    return True
+
+if __name__ == "__main__":
+    try:
+        bulk_ok = test_bulk_boxes()
+    except unittest.SkipTest as skipped:
+        print(f"- skipped: {skipped}")
+        bulk_ok = True
+    if test_spatial_queries() and bulk_ok:
+        print("Spatial test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,110 @@
+import sys
+import threading
+import types
+from unittest.mock import MagicMock, patch
+sys.modules['bpy'] = MagicMock()
+sys.modules['webview'] = MagicMock()
+sys.modules['google'] = MagicMock()
+sys.modules['google.generativeai'] = sys.modules['google'].generativeai
+from blender_mcp.core.gemini import GeminiManager
+from blender_mcp.ui import launcher
+
+class FakeStreamingModel:
+    """Local stand-in for a streaming model; waits between chunks like a generating one.
+
+    Each call streams the next reply in turn; the prompts it was sent are kept in `prompts`.
+    """
+
+    def __init__(self, replies, executed):
+        self.replies = list(replies)
+        self.executed = executed
+        self.overlapped = False
+        self.prompts = []
+
+    def generate_content(self, contents, stream=False):
+        self.prompts.append(str(contents))
+        chunks = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+
+        def generate():
+            for chunk in chunks:
+                yield types.SimpleNamespace(text=chunk)
+                if "</blender_cmd>" in chunk and not self.overlapped:
+                    # The model is still "generating"; the first command should run meanwhile
+                    self.overlapped = self.executed.wait(2.0)
+        return generate()
+
+def test_streaming_dispatch():
+    capture = lambda encoder, fingerprint=False: (None, "empty scene", None)
+    with patch.object(launcher, "_capture_turn_context", capture):
+        return check_streaming_dispatch()
+
+def check_streaming_dispatch():
+    bridge = launcher.UIBridge()
+    executed = threading.Event()
+    calls = []
+
+    def mark(label):
+        calls.append(label)
+        executed.set()
+        return {"status": "success", "label": label}
+
+    bridge.engine.tools["mark"] = mark
+    bridge.gemini = GeminiManager("key", "fake-model")
+    model = FakeStreamingModel([[
+        "Placing the first marker.\n<blender_",
+        'cmd>{"tool": "mark", "args": {"label": "a"}}</blender_cmd>\nNow two more.',
+        '<blender_cmd>{"tool": "mark", "args": {"label": "b"}}</blender_cmd>',
+        '<blender_cmd>{"tool": "mark", "args": {}}</blender_cmd>',
+        '<blender_cmd>{"tool": "mark", "args": {"label": "c"}}</blender_cmd> Done.',
+    ], [
+        'Fixed the last one.<blender_cmd>{"tool": "mark", "args": {"label": "d"}}</blender_cmd>',
+    ], [
+        "Nothing left to do.",
+    ]], executed)
+    bridge.gemini.model = model
+
+    stop = threading.Event()
+    # Stands in for Blender's main thread
+    pump = threading.Thread(target=bridge.engine.dispatcher.run_forever, args=(stop,), kwargs={"idle_interval": 0.01})
+    pump.start()
+    try:
+        box = {}
+        # pywebview calls the bridge from its own thread
+        worker = threading.Thread(target=lambda: box.update(reply=bridge.send_to_gemini("markers please")))
+        worker.start()
+        worker.join(10.0)
+    finally:
+        stop.set()
+        pump.join()
+
+    reply = box.get("reply")
+    if not reply or "Done." not in reply["text"]:
+        print(f"✗ streamed text not assembled: {reply}")
+        return False
+    print("✓ reply text assembled from chunks")
+
+    if not model.overlapped:
+        print("✗ first command did not run while the reply was still streaming")
+        return False
+    print("✓ first command executed before the model finished")
+
+    labels = [r["result"].get("label") for r in reply["results"]]
+    if calls != ["a", "b", "c", "d"] or labels != ["a", "b", None, "c", "d"] \
+            or reply["results"][2]["result"]["status"] != "error":
+        print(f"✗ unexpected results {calls} {reply['results']}")
+        return False
+    print("✓ results aligned with commands, invalid command rejected")
+
+    # The error went back to the model in the same turn; the clean follow-up ended it
+    if len(model.prompts) != 2 or "Missing required argument" not in model.prompts[1] \
+            or "Fixed the last one." not in reply["text"] or bridge._pending_results[0]["result"]["label"] != "d":
+        print(f"✗ failed command not reported back within the turn: {model.prompts[1:]} {reply['text']!r}")
+        return False
+    print("✓ failed command reported back to the model before the user replies")
+    return True
+
+if __name__ == "__main__":
+    if test_streaming_dispatch():
+        print("Streaming test PASSED")
+    else:
+        sys.exit(1)
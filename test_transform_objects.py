@@ -0,0 +1,106 @@
+import math
+import sys
+import types
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+from blender_mcp.core.tools import object as object_tools
+
+# The tool module keeps the bpy stand-in it was first imported with
+bpy = object_tools.bpy
+
+class Blocks(list):
+    """bpy.data collection stand-in: iterable, with lookup by name."""
+
+    def get(self, name, default=None):
+        return next((item for item in self if item.name == name), default)
+
+class Locked(types.SimpleNamespace):
+    """An object whose transform cannot be written, like a linked library object."""
+
+    def __setattr__(self, name, value):
+        if name == "location":
+            raise AttributeError("bpy_struct: attribute \"location\" from \"Object\" is read-only")
+        super().__setattr__(name, value)
+
+def make_object(name, cls=types.SimpleNamespace):
+    return cls(name=name, location=[0.0, 0.0, 0.0], rotation_euler=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0],
+               matrix_world=[[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]])
+
+def test_transform_objects():
+    saved = bpy.data.objects
+    try:
+        return check_transform_objects()
+    finally:
+        bpy.data.objects = saved
+
+def check_transform_objects():
+    names = [f"Post_{i:03d}" for i in range(300)]
+    bpy.data.objects = Blocks(make_object(n) for n in names)
+    engine = AtomicEngine()
+    result = engine.execute_tool("transform_objects", {
+        "names": names,
+        "locations": [[i * 2.0, 0.0, 0.0] for i in range(300)],
+        "rotations": [0, 0, 90],
+        "scales": [[1, 1, 1 + i % 3] for i in range(300)],
+    })
+    post = bpy.data.objects[7]
+    if result != {"status": "success", "applied": 300} or post.location != [14.0, 0.0, 0.0] \
+            or abs(post.rotation_euler[2] - math.pi / 2) > 1e-9 or post.scale != [1.0, 1.0, 2.0]:
+        print(f"✗ absolute transforms not applied: {result} {post}")
+        return False
+    print("✓ 300 objects placed in one call; one rotation row shared by all, converted to radians")
+
+    result = engine.execute_tool("transform_objects", {
+        "names": names[:2], "locations": [0, 0, 5], "rotations": [0, 0, 90], "scales": [2, 2, 2], "mode": "relative",
+    })
+    post = bpy.data.objects[1]
+    if result["applied"] != 2 or post.location != [2.0, 0.0, 5.0] \
+            or abs(post.rotation_euler[2] - math.pi) > 1e-9 or post.scale != [2.0, 2.0, 4.0]:
+        print(f"✗ relative mode wrong: {post}")
+        return False
+    print("✓ relative mode offsets locations and rotations and multiplies scales")
+
+    shift = [1, 0, 0, 3, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+    engine.execute_tool("transform_objects", {"names": names[:1], "matrices": [shift], "mode": "RELATIVE"})
+    engine.execute_tool("transform_objects", {"names": names[:1], "matrices": [shift], "mode": "RELATIVE"})
+    if bpy.data.objects[0].matrix_world[0][3] != 6.0:
+        print(f"✗ relative matrices not composed: {bpy.data.objects[0].matrix_world}")
+        return False
+    print("✓ matrices compose onto the current world matrix")
+
+    bpy.data.objects.append(make_object("Linked", Locked))
+    result = engine.execute_tool("transform_objects", {
+        "names": ["Post_000", "Missing", "Linked", "Post_001"], "locations": [9, 9, 9],
+    })
+    failed = [f["name"] for f in result.get("failed", [])]
+    if result["status"] != "success" or result["applied"] != 2 or failed != ["Missing", "Linked"] \
+            or bpy.data.objects[1].location != [9.0, 9.0, 9.0]:
+        print(f"✗ failures should be reported without aborting: {result}")
+        return False
+    bad = engine.execute_tool("transform_objects", {"names": names[:3], "locations": [[1, 2, 3], [4, 5, 6]]})
+    if bad["status"] != "error" or "locations" not in bad["message"]:
+        print(f"✗ mismatched rows not rejected: {bad}")
+        return False
+    print("✓ missing and read-only objects reported per object; the rest still moved")
+
+    result = engine.execute_tool("transform_objects", {
+        "names": names[:3], "locations": [[1, 2, 3], [None, 0, 0], [7, 8, 9]], "scales": [[1, 1, 1], [2, 2, 2], "big"],
+    })
+    failed = {f["name"]: f["message"] for f in result.get("failed", [])}
+    if result["applied"] != 1 or set(failed) != {names[1], names[2]} or "locations" not in failed[names[1]] \
+            or "scales" not in failed[names[2]] or bpy.data.objects[0].location != [1.0, 2.0, 3.0]:
+        print(f"✗ non-numeric rows should fail only their objects: {result}")
+        return False
+    none = engine.execute_tool("transform_objects", {"names": names[:2], "rotations": [None, 0, 0]})
+    if none["status"] != "error" or "rotations" not in none["message"]:
+        print(f"✗ a shared non-numeric row should fail the call: {none}")
+        return False
+    print("✓ None and non-numeric rows reported per object")
+    return True
+
+if __name__ == "__main__":
+    if test_transform_objects():
+        print("Transform objects test PASSED")
+    else:
+        sys.exit(1)
@@ -0,0 +1,62 @@
+import sys
+from unittest.mock import MagicMock
+sys.modules['bpy'] = MagicMock()
+from blender_mcp.core.engine import AtomicEngine
+
+def test_argument_validation():
+    engine = AtomicEngine()
+
+    cmd, errors = engine.validate_command({
+        "tool": "create_primitive",
+        "args": {"type": "cube", "location": [1, 2, 3], "scale": 2},
+    })
+    if errors or cmd["args"] != {"type": "CUBE", "location": (1, 2, 3), "scale": (2.0, 2.0, 2.0)}:
+        print(f"✗ coercion failed: {cmd} {errors}")
+        return False
+    print("✓ enums upper-cased, lists turned into tuples, scalar scale broadcast")
+
+    cmd, errors = engine.validate_command({
+        "tool": "add_track_to_constraint",
+        "args": {"obj_name": "Camera", "target_name": "Cube", "track_axis": "track_negative_z"},
+    })
+    if errors or cmd["args"]["track_axis"] != "TRACK_NEGATIVE_Z":
+        print(f"✗ enum default not normalised: {cmd} {errors}")
+        return False
+    print("✓ enum-style defaults normalised")
+
+    _, errors = engine.validate_command({"tool": "transform_object", "args": {"location": [0, 0], "spin": 4}})
+    if len(errors) != 3:
+        print(f"✗ expected 3 errors, got {errors}")
+        return False
+    print("✓ wrong vector size, unknown and missing arguments rejected")
+
+    checked, rejected = engine.validate_commands([
+        {"tool": "assign_material", "args": {"name": "Cube", "color": [1, 0, 0]}},
+        {"tool": "create_primitive", "args": {"type": "TEAPOT"}},
+        {"tool": "no_such_tool", "args": {}},
+    ])
+    if len(checked) != 3 or sorted(rejected) != [1, 2]:
+        print(f"✗ unexpected split {checked} {rejected}")
+        return False
+    if checked[0]["args"]["color"] != (1, 0, 0, 1.0):
+        print(f"✗ RGB color not padded: {checked[0]}")
+        return False
+    print("✓ invalid commands rejected before dispatch, RGB padded with alpha")
+
+    cmd, errors = engine.validate_command({"tool": "add_screw_modifier", "args": {"obj_name": "Cube", "angle": 22.5, "steps": 8.0}})
+    if errors or cmd["args"]["angle"] != 22.5 or type(cmd["args"]["steps"]) is not int:
+        print(f"✗ fractional angle or whole step count not accepted: {cmd} {errors}")
+        return False
+    _, errors = engine.validate_command({"tool": "add_screw_modifier", "args": {"obj_name": "Cube", "steps": 2.5}})
+    _, angle_errors = engine.validate_command({"tool": "edge_split", "args": {"obj_name": "Cube", "angle": 270}})
+    if len(errors) != 1 or len(angle_errors) != 1 or "degrees" not in angle_errors[0]:
+        print(f"✗ fractional count or out-of-range angle accepted: {errors} {angle_errors}")
+        return False
+    print("✓ fractional angles accepted, counts kept whole, degree ranges enforced")
+    return True
+
+if __name__ == "__main__":
+    if test_argument_validation():
+        print("Validation test PASSED")
+    else:
+        sys.exit(1)